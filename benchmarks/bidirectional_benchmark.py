@@ -0,0 +1,55 @@
+# Reports the speedup of the bidirectional solver over the Branch and Bound solver on the test_boards files
+# Usage: python3 -m benchmarks.bidirectional_benchmark [number of runs per board]
+from os import listdir
+from sys import argv
+from time import perf_counter_ns
+
+# Local Dependencies
+from src.input_handler import TEST_DIR
+from src.puzzle import Puzzle, get_moves, solve_puzzle, solve_puzzle_bidirectional
+
+
+# Times a solver on a board, keeping the fastest of several runs
+#  param solver - solver function to time
+#  param puzzle - Puzzle object holding the initial board state
+#  param   runs - number of times to solve the board
+# return        - fastest time taken to solve the board [ns], and the number of moves in the solution
+def time_solver(solver, puzzle: Puzzle, runs: int) -> tuple[int, int]:
+    best_time = None
+
+    for _ in range(runs):
+        start_time = perf_counter_ns()
+        result = solver(puzzle)
+        elapsed = perf_counter_ns() - start_time
+        best_time = elapsed if best_time is None else min(best_time, elapsed)
+
+    return best_time, len(get_moves(result.node))
+
+
+def main():
+    runs = int(argv[1]) if len(argv) > 1 else 1
+
+    print(f"\n{'Board':<16}{'B&B [s]':>10}{'Moves':>7}{'Bidir [s]':>11}{'Moves':>7}{'Speedup':>10}")
+
+    for file_name in sorted(listdir(TEST_DIR)):
+        try:
+            with open(f"{TEST_DIR}{file_name}") as in_file:
+                puzzle = Puzzle(board=[[int(i) for i in line.split()] for line in in_file])
+        except ValueError:
+            print(f"{file_name:<16}skipped (not formatted correctly)")
+            continue
+
+        if not puzzle.is_solvable():
+            print(f"{file_name:<16}skipped (not solvable)")
+            continue
+
+        forward_time, forward_moves = time_solver(solve_puzzle, puzzle, runs)
+        bidirectional_time, bidirectional_moves = time_solver(solve_puzzle_bidirectional, puzzle, runs)
+
+        print(f"{file_name:<16}{forward_time / 1000000000:>10.4f}{forward_moves:>7}"
+              f"{bidirectional_time / 1000000000:>11.4f}{bidirectional_moves:>7}"
+              f"{forward_time / bidirectional_time:>8.3f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+# Standard benchmark corpus: fixed boards stored as JSON lines, with their optimal solution lengths where known
+# Each line holds {"id", "board", "optimal", "source"} and, for scrambled boards, the "scramble" length, which is an
+# upper bound on the optimal solution length. Korf's 100 4x4 instances are not shipped, but can be read from their
+# usual text format with load_korf_file()
+# Usage: python3 -m benchmarks.corpus (regenerates the shipped corpus files, solving each board optimally)
+# Regenerating keeps every optimal length already on file for the same board, as the uniformly random 4x4 and longest
+# 5x5 boards take far longer than SOLVE_SECONDS to solve here; their optima were proven by a longer offline run of an
+# optimal IDA* with an additive pattern database, which reproduced every optimum found by this module first
+from json import dumps, loads
+from os.path import dirname, isfile, join
+from random import Random
+
+# Local Dependencies
+from src.budget import Budget
+from src.puzzle import LINEAR_CONFLICT, OPPOSITE, Puzzle, get_moves, get_neighbors, solve_puzzle_ida
+
+# Constants
+CORPUS_DIR = join(dirname(__file__), "corpus")  # Directory holding the corpus files
+SEED = 15                                       # Seed used to generate the same corpus on every run
+RANDOM_3X3 = 40                                 # Number of uniformly random 3x3 boards in the corpus
+RANDOM_4X4 = 10                                 # Number of uniformly random 4x4 boards in the corpus
+SCRAMBLES_PER_LENGTH = 3                        # Number of boards scrambled to each length
+SCRAMBLE_LENGTHS = {4: (10, 20, 30, 40, 50, 60),                # Random walk lengths of the graded scrambles
+                    5: (10, 20, 30, 40, 50, 60, 80, 100)}
+SOLVE_SECONDS = 120                             # Longest time spent proving a scrambled board's optimal length [s]
+
+# Hardest 3x3 boards, whose optimal solutions are the longest of any 3x3 board
+HARDEST_3X3 = ([[8, 6, 7], [2, 5, 4], [3, 0, 1]],
+               [[6, 4, 7], [8, 5, 0], [3, 2, 1]])
+
+
+# Lists the corpus files that ship with the benchmarks
+# return - dictionary mapping each corpus name (e.g. "3x3") to its file path
+def get_corpora() -> dict[str, str]:
+    return {name: join(CORPUS_DIR, f"{name}.jsonl") for name in ("3x3", "4x4", "5x5")}
+
+
+# Reads a corpus file of JSON lines
+#  param file_name - path to the corpus file
+# return instances - array of dictionaries, one per board
+def load_corpus(file_name: str) -> list[dict]:
+    with open(file_name) as in_file:
+        return [loads(line) for line in in_file if line.strip()]
+
+
+# Converts a 4x4 board from Korf's convention (blank in the top-left corner of the solution, tiles 1 to 15 after it)
+# to this program's (tiles 1 to 15 first, blank in the bottom-right corner)
+# Turning the board half a turn and relabelling tile t as 16 - t maps one solution onto the other, and maps every
+# move onto a move, so optimal solution lengths are unchanged
+#  param tiles - flat row-major sequence of 16 tile values in Korf's convention
+# return board - 2D board in this program's convention
+def convert_korf_tiles(tiles: list[int]) -> list[list[int]]:
+    tiles = [16 - tile if tile else 0 for tile in reversed(tiles)]
+    return [tiles[i * 4:(i + 1) * 4] for i in range(4)]
+
+
+# Splits a line of a Korf instance file into its instance number, tiles, and optimal length
+# A 17 value line holds either the instance number and the tiles, or the tiles and the optimal length, so the line is
+# read as whichever of the two holds each tile exactly once (the first, if both do)
+#  param  values - integers on the line
+# return  number - instance number, or None if the line does not hold one
+# return   tiles - 16 tile values in Korf's convention
+# return optimal - optimal solution length, or None if the line does not hold one
+def split_korf_line(values: list[int]) -> tuple[int | None, list[int], int | None]:
+    tiles = list(range(16))
+    if len(values) == 16:
+        return None, values, None
+    if len(values) == 17 and sorted(values[1:]) == tiles:
+        return values[0], values[1:], None
+    if len(values) == 17 and sorted(values[:16]) == tiles:
+        return None, values[:16], values[16]
+    if len(values) == 17:
+        raise ValueError("neither the first nor the last 16 of the 17 values hold each tile 0 to 15 exactly once")
+    if len(values) == 18:
+        return values[0], values[1:17], values[17]
+
+    raise ValueError(f"expected 16 tiles, optionally preceded by an instance number and followed by an optimal "
+                     f"length, got {len(values)} values")
+
+
+# Reads 4x4 instances in the text format Korf's 100 instances are usually distributed in
+# Each line holds 16 tiles, optionally preceded by the instance number and followed by its optimal solution length,
+# with the blank (0) in the top-left corner of the solution. Blank lines and lines starting with # are skipped
+# Raises ValueError on a line that is not in this format, naming the file and line
+#  param file_name - path to the instance file
+# return instances - array of corpus dictionaries, one per board
+def load_korf_file(file_name: str) -> list[dict]:
+    instances = []
+
+    with open(file_name) as in_file:
+        for line_number, line in enumerate(in_file, 1):
+            if not (line := line.strip()) or line.startswith('#'):
+                continue
+
+            try:
+                number, tiles, optimal = split_korf_line([int(value) for value in line.split()])
+                if sorted(tiles) != list(range(16)):
+                    raise ValueError("the board does not hold each tile 0 to 15 exactly once")
+            except ValueError as error:
+                raise ValueError(f"{file_name}:{line_number}: {error}") from error
+
+            number = len(instances) + 1 if number is None else number
+
+            instances.append({"id": f"korf-{number:03}", "board": convert_korf_tiles(tiles), "optimal": optimal,
+                              "source": "korf"})
+
+    return instances
+
+
+# Scrambles the solution board with a random walk that never undoes its last move
+#  param   size - length/width of the game board
+#  param length - number of moves in the walk
+#  param    rng - Random object the moves are drawn from
+# return        - 2D scrambled board
+def scramble_board(size: int, length: int, rng: Random) -> list[list[int]]:
+    tiles, blank, last = [*range(1, size ** 2), 0], size ** 2 - 1, None
+
+    for _ in range(length):
+        direction, src = rng.choice([move for move in get_neighbors(size)[blank] if move[0] != OPPOSITE.get(last)])
+        tiles[blank], tiles[src] = tiles[src], 0
+        blank, last = src, direction
+
+    return [tiles[i * size:(i + 1) * size] for i in range(size)]
+
+
+# Draws a uniformly random solvable board
+#  param size - length/width of the game board
+#  param  rng - Random object the board is drawn from
+# return      - 2D random board
+def random_board(size: int, rng: Random) -> list[list[int]]:
+    # Draw random boards until a solvable one comes up
+    while True:
+        tiles = list(range(size ** 2))
+        rng.shuffle(tiles)
+        board = [tiles[i * size:(i + 1) * size] for i in range(size)]
+        if Puzzle(board=board).is_solvable():
+            return board
+
+
+# Reads the optimal lengths already on file in the shipped corpus files
+# return - dictionary mapping each board, as a tuple of rows, to its optimal solution length
+def load_known_optima() -> dict[tuple, int]:
+    known = {}
+
+    for file_name in get_corpora().values():
+        if isfile(file_name):
+            for instance in load_corpus(file_name):
+                if instance["optimal"] is not None:
+                    known[tuple(map(tuple, instance["board"]))] = instance["optimal"]
+
+    return known
+
+
+# Finds the optimal solution length of a board with IDA*, giving up after a time limit
+#  param   board - 2D board to solve
+#  param   known - dictionary mapping boards, as tuples of rows, to optimal lengths already on file
+#  param seconds - longest time to spend [s]
+# return         - number of moves in an optimal solution, or None if it was not found in time
+def get_optimal_length(board: list[list[int]], known: dict[tuple, int], seconds: float = None) -> int | None:
+    if (optimal := known.get(tuple(map(tuple, board)))) is not None:
+        return optimal
+
+    result = solve_puzzle_ida(Puzzle(board=board), LINEAR_CONFLICT, Budget(max_seconds=seconds))
+    return len(get_moves(result.node)) if result.is_solved() else None
+
+
+# Builds the 3x3 corpus of uniformly random boards and the hardest boards, each solved optimally
+#  param       rng - Random object the boards are drawn from
+#  param     known - dictionary mapping boards, as tuples of rows, to optimal lengths already on file
+# return instances - array of corpus dictionaries, one per board
+def build_3x3(rng: Random, known: dict[tuple, int]) -> list[dict]:
+    boards = [(f"3x3-hard-{k + 1}", board, "hardest") for k, board in enumerate(HARDEST_3X3)]
+    boards += [(f"3x3-{k + 1:02}", random_board(3, rng), "random") for k in range(RANDOM_3X3)]
+
+    return [{"id": name, "board": board, "optimal": get_optimal_length(board, known), "source": source}
+            for name, board, source in boards]
+
+
+# Builds the uniformly random 4x4 boards, which are as hard as a typical 4x4 board (unlike short scrambles)
+#  param       rng - Random object the boards are drawn from
+#  param     known - dictionary mapping boards, as tuples of rows, to optimal lengths already on file
+# return instances - array of corpus dictionaries, one per board
+def build_random_4x4(rng: Random, known: dict[tuple, int]) -> list[dict]:
+    instances = []
+
+    for k in range(RANDOM_4X4):
+        board = random_board(4, rng)
+        optimal = get_optimal_length(board, known, SOLVE_SECONDS)
+        instances.append({"id": f"4x4-r{k + 1:02}", "board": board, "optimal": optimal, "source": "random"})
+        print(f"{instances[-1]['id']}: optimal {optimal}")
+
+    return instances
+
+
+# Builds the graded corpus of scrambled boards for a board size, solving each optimally where time allows
+#  param      size - length/width of the game board
+#  param       rng - Random object the scrambles are drawn from
+#  param     known - dictionary mapping boards, as tuples of rows, to optimal lengths already on file
+# return instances - array of corpus dictionaries, one per board
+def build_scrambles(size: int, rng: Random, known: dict[tuple, int]) -> list[dict]:
+    instances = []
+
+    for length in SCRAMBLE_LENGTHS[size]:
+        for k in range(SCRAMBLES_PER_LENGTH):
+            board = scramble_board(size, length, rng)
+            optimal = get_optimal_length(board, known, SOLVE_SECONDS)
+            instances.append({"id": f"{size}x{size}-s{length:03}-{k + 1}", "board": board, "optimal": optimal,
+                              "scramble": length, "source": "scramble"})
+            print(f"{instances[-1]['id']}: optimal {optimal}")
+
+    return instances
+
+
+# Writes a corpus file of JSON lines
+#  param file_name - path to the corpus file
+#  param instances - array of corpus dictionaries, one per board
+def save_corpus(file_name: str, instances: list[dict]):
+    with open(file_name, 'w') as out_file:
+        for instance in instances:
+            out_file.write(dumps(instance) + "\n")
+
+
+def main():
+    rng = Random(SEED)
+    corpora = get_corpora()
+    known = load_known_optima()
+
+    instances = {"3x3": build_3x3(rng, known)}
+    for size in SCRAMBLE_LENGTHS:
+        instances[f"{size}x{size}"] = build_scrambles(size, rng, known)
+
+    # Drawn after every other board, so adding them left the earlier boards unchanged
+    instances["4x4"] += build_random_4x4(rng, known)
+
+    for name, boards in instances.items():
+        save_corpus(corpora[name], boards)
+
+
+if __name__ == "__main__":
+    main()
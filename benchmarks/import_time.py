@@ -0,0 +1,123 @@
+# Guards the cold-start time of the program: imports each entry module in fresh interpreters, and starts the program up
+# to its first menu prompt, reports the fastest time, and fails if a guarded one is over budget or pulls in a
+# third-party package
+# Heavy packages (pygame, matplotlib, pandas, numpy, tqdm) must only be imported by the menu option or subcommand that
+# uses them, and src.puzzle must stay importable without any third-party package
+# Usage: python3 -m benchmarks.import_time [number of runs]
+from compileall import compile_dir
+from os.path import dirname
+from subprocess import CalledProcessError, run
+from sys import argv, executable, stdlib_module_names
+
+# Constants
+ROOT = dirname(dirname(__file__)) or "."    # Program's root directory, the imports run from here
+DEFAULT_RUNS = 10                           # Number of fresh interpreters each module is imported in
+
+# Top-level modules of the program itself, including the name multiprocessing gives the main module in its children
+LOCAL_MODULES = {"__main__", "__mp_main__", "benchmarks", "main", "src"}
+
+# Modules that must import quickly and without third-party packages, with their import time budgets [ms]
+# The budgets are a few times the import times on a typical machine, so only a new heavy import exceeds them
+GUARDED = (("src.puzzle", 30), ("main", 75))
+
+# Time budget of starting the program up to its first menu prompt, which must also load no third-party package [ms]
+STARTUP_BUDGET = 75
+STARTUP = "main.main()"
+
+# Runs main.main() with input() replaced, so the first prompt reports the time since the start and the loaded modules
+STARTUP_CODE = """
+import builtins, sys
+from time import perf_counter
+start = perf_counter()
+
+def prompt(*args):
+    print((perf_counter() - start) * 1000, ' '.join(sys.modules))
+    raise SystemExit
+
+builtins.input = prompt
+sys.argv = ["main.py"]
+import main
+main.main()
+"""
+
+# Modules whose import times are only reported, as they exist to load heavy packages
+REPORTED = ("src.gui", "src.timing_plotting")
+
+
+# Imports a module in a fresh interpreter with -X importtime
+#  param module - name of the module to import, or None to start the interpreter without importing anything
+# return   time - cumulative import time of the module [ms], or None if nothing was imported
+# return  names - top-level names of every module loaded by the interpreter
+def time_import(module: str | None) -> tuple[float | None, set[str]]:
+    code = f"import sys{f', {module}' if module else ''}; print(' '.join(sys.modules))"
+    process = run([executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+
+    # Each line of the report is "import time: self [us] | cumulative [us] | name", the module's own line comes last
+    time = None
+    for line in process.stderr.splitlines():
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() == module:
+            time = int(fields[1]) / 1000
+
+    return time, {name.split('.')[0] for name in process.stdout.split()}
+
+
+# Starts the program in a fresh interpreter, running main() up to its first menu prompt
+# return  time - time from the start of the import of main to the first prompt [ms]
+# return names - top-level names of every module loaded by then
+def time_startup() -> tuple[float, set[str]]:
+    process = run([executable, "-c", STARTUP_CODE], cwd=ROOT, capture_output=True, text=True, check=True)
+    time, *names = process.stdout.splitlines()[-1].split()
+
+    return float(time), {name.split('.')[0] for name in names}
+
+
+# Times the import of a module (or the start of the program), keeping the fastest of several fresh interpreters
+#  param  module - name of the module to import, or STARTUP to start the program up to its first menu prompt
+#  param    runs - number of fresh interpreters to import it in
+#  param startup - top-level names of the modules every interpreter loads before importing anything (e.g. from .pth
+#                  files), which are not counted against the module
+# return    time - fastest import time of the module [ms]
+# return   names - sorted array of the third-party packages the module loaded
+def measure(module: str, runs: int, startup: set[str]) -> tuple[float, list[str]]:
+    times, names = [], set()
+    for _ in range(runs):
+        time, loaded = time_startup() if module == STARTUP else time_import(module)
+        times.append(time)
+        names |= loaded
+
+    return min(times), sorted(names - startup - LOCAL_MODULES - stdlib_module_names)
+
+
+def main():
+    runs = int(argv[1]) if len(argv) > 1 else DEFAULT_RUNS
+    failures = 0
+
+    # Compile first, so only the import itself is timed, as it would be on every start after the first
+    compile_dir(ROOT, quiet=1)
+    startup = time_import(None)[1]
+
+    print(f"Fastest import time of {runs} fresh interpreters:")
+    for module, budget in (*GUARDED, (STARTUP, STARTUP_BUDGET)):
+        time, packages = measure(module, runs, startup)
+
+        problems = []
+        if time > budget:
+            problems.append(f"over the {budget} ms budget")
+        if packages:
+            problems.append(f"imports {', '.join(packages)}")
+        failures += bool(problems)
+
+        print(f"  {module:<20} {time:8.2f} ms" + (f"  FAIL: {'; '.join(problems)}" if problems else ""))
+
+    for module in REPORTED:
+        try:
+            print(f"  {module:<20} {measure(module, runs, startup)[0]:8.2f} ms  (not guarded)")
+        except CalledProcessError:
+            print(f"  {module:<20} skipped, its packages are not installed")
+
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# Load generator for the local solver service: sends corpus boards from many concurrent clients and reports the
+# throughput and latency percentiles seen by the clients, along with how many requests were shared or turned away
+# Start the service first with: python3 main.py serve
+# Usage: python3 -m benchmarks.load_generator [--concurrency N] [--requests N] [--corpus 3x3] [--duplicates N]
+#                                             [--solver NAME] [--heuristic NAME] [--timeout SECONDS]
+from __future__ import annotations
+from argparse import ArgumentParser
+from itertools import cycle, islice
+from threading import Lock, Thread
+from time import perf_counter
+
+# Local Dependencies
+from benchmarks.corpus import get_corpora, load_corpus
+from src.client import ServiceError, SolverClient
+from src.server import DEFAULT_HOST, DEFAULT_PORT, get_percentiles
+
+# Constants
+DEFAULT_CONCURRENCY = 8                 # Clients sending requests at once
+DEFAULT_REQUESTS = 200                  # Requests sent in total
+DEFAULT_CORPUS = "3x3"                  # Corpus the boards are taken from
+PERCENTILES = (50, 90, 95, 99)          # Latency percentiles reported
+
+
+# Sends requests until none are left, recording the latency and outcome of each
+#  param    client - SolverClient used by this thread
+#  param      jobs - iterator of boards shared by every thread
+#  param      lock - Lock guarding the jobs and results
+#  param   results - array the (latency [ms], outcome, coalesced) tuple of each request is appended to
+#  param     flags - dictionary of the solver, heuristic, and timeout sent with every request
+def send_requests(client: SolverClient, jobs, lock: Lock, results: list, flags: dict):
+    while True:
+        with lock:
+            board = next(jobs, None)
+        if board is None:
+            return
+
+        start = perf_counter()
+        try:
+            response = client.solve(board, **flags)
+            outcome, coalesced = response["status"], response["coalesced"]
+        except ServiceError as error:
+            outcome, coalesced = f"HTTP {error.status}", False
+        except OSError as error:
+            outcome, coalesced = type(error).__name__, False
+
+        with lock:
+            results.append(((perf_counter() - start) * 1000, outcome, coalesced))
+
+
+def main():
+    parser = ArgumentParser(description="Load generator for the local solver service")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"address of the service (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port of the service (default: {DEFAULT_PORT})")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="clients sending at once")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS, help="requests sent in total")
+    parser.add_argument("--corpus", choices=sorted(get_corpora()), default=DEFAULT_CORPUS, help="corpus of boards")
+    parser.add_argument("--duplicates", type=int, default=1,
+                        help="consecutive requests for each board, to exercise request coalescing")
+    parser.add_argument("--solver", metavar="NAME", help="solver to use (default: the service's)")
+    parser.add_argument("--heuristic", metavar="NAME", help="heuristic to use (default: the service's)")
+    parser.add_argument("--timeout", type=float, help="seconds allowed per search (default: the service's limit)")
+    args = parser.parse_args()
+
+    boards = [instance["board"] for instance in load_corpus(get_corpora()[args.corpus])]
+    jobs = islice(cycle(board for board in boards for _ in range(args.duplicates)), args.requests)
+    flags = {"solver": args.solver, "heuristic": args.heuristic, "timeout": args.timeout}
+    lock, results = Lock(), []
+
+    clients = [SolverClient(args.host, args.port) for _ in range(args.concurrency)]
+    try:
+        before = clients[0].metrics()
+    except OSError as error:
+        raise SystemExit(f"ERROR: Unable to reach the service on {args.host}:{args.port} ({error})")
+
+    threads = [Thread(target=send_requests, args=(client, jobs, lock, results, flags)) for client in clients]
+    start = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = perf_counter() - start
+
+    after = clients[0].metrics()
+    for client in clients:
+        client.close()
+
+    outcomes = {}
+    for _, outcome, _ in results:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    latencies = get_percentiles((latency for latency, _, _ in results), PERCENTILES)
+
+    print(f"{len(results)} requests from {args.concurrency} clients in {elapsed:.2f} s "
+          f"({len(results) / elapsed:.1f} requests/s)")
+    print(f"Outcomes: {', '.join(f'{count} {outcome}' for outcome, count in sorted(outcomes.items()))}")
+    print(f"Shared another request's search: {sum(coalesced for _, _, coalesced in results)}")
+    print("Latency [ms]: " + ", ".join(f"{name} {value:.1f}" for name, value in latencies.items() if value is not None))
+    print("Service: " + ", ".join(f"{after[name] - before[name]} {name}" for name in
+                                  ("searches", "coalesced", "rejected", "invalid", "failed")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Microbenchmark comparing the live node queues on frontiers of millions of nodes
+# Usage: python3 -m benchmarks.queue_benchmark [number of nodes]
+from random import randrange, seed
+from sys import argv
+from time import perf_counter_ns
+
+# Local Dependencies
+from src.bucket_queue import BucketQueue
+from src.minheap import MinHeap
+
+# Constants
+DEFAULT_NODES = 2000000     # Number of nodes pushed through each queue
+MAX_COST = 60               # Largest cost of a generated node (about the largest Manhattan distance on a 4x4 board)
+STRIDE = 106                # Number of tiebreak values per cost (every possible inversion count on a 4x4 board)
+SEED = 15                   # Seed used to generate the same keys for every queue
+
+
+# Generates the (cost, tiebreak) pairs pushed through the queues
+#  param count - number of pairs to generate
+# return       - array of (cost, tiebreak) tuples
+def generate_keys(count: int) -> list[tuple[int, int]]:
+    seed(SEED)
+    return [(randrange(MAX_COST), randrange(STRIDE)) for _ in range(count)]
+
+
+# Times inserting every key and then popping every node
+#  param queue - empty queue to time
+#  param  keys - keys to insert, already in the form the queue expects
+# return       - time to insert all keys and time to pop all nodes [ns]
+def time_fill_and_drain(queue, keys: list) -> tuple[int, int]:
+    start_time = perf_counter_ns()
+    for key in keys:
+        queue.insert(None, key)
+    insert_time = perf_counter_ns() - start_time
+
+    start_time = perf_counter_ns()
+    while queue:
+        queue.pop_root()
+
+    return insert_time, perf_counter_ns() - start_time
+
+
+# Times a search-like workload, where each popped node is replaced by up to three children of similar cost
+#  param     queue - empty queue to time
+#  param      keys - (cost, tiebreak) pairs, each child takes its tiebreak and the sign of its cost change from one
+#  param make_key - function converting a (cost, tiebreak) pair into the key the queue expects
+# return           - total time of the workload [ns]
+def time_search_workload(queue, keys: list, make_key) -> int:
+    start_time = perf_counter_ns()
+    queue.insert(keys[0], make_key(*keys[0]))
+
+    for i in range(1, len(keys), 3):
+        cost = queue.pop_root()[0]
+        for change, tiebreak in keys[i:i + 3]:
+            child = max(0, cost + change % 3 - 1), tiebreak
+            queue.insert(child, make_key(*child))
+
+    return perf_counter_ns() - start_time
+
+
+def main():
+    count = int(argv[1]) if len(argv) > 1 else DEFAULT_NODES
+    pairs = generate_keys(count)
+
+    # The bucket queue takes a flattened integer key, the heap takes the (cost, tiebreak) tuple as is
+    queues = {
+        "BucketQueue": (BucketQueue, lambda cost, tiebreak: cost * STRIDE + tiebreak),
+        "MinHeap": (MinHeap, lambda cost, tiebreak: (cost, tiebreak))
+    }
+
+    print(f"\nPushing {count:,} nodes through each queue")
+    for name, (queue_type, make_key) in queues.items():
+        keys = [make_key(cost, tiebreak) for cost, tiebreak in pairs]
+        insert_time, pop_time = time_fill_and_drain(queue_type(), keys)
+        search_time = time_search_workload(queue_type(), pairs, make_key)
+
+        print(f"\n{name}")
+        print(f"  Insert all:      {insert_time / 1000000000:.3f} s ({insert_time / count:.0f} ns/node)")
+        print(f"  Pop all:         {pop_time / 1000000000:.3f} s ({pop_time / count:.0f} ns/node)")
+        print(f"  Search workload: {search_time / 1000000000:.3f} s ({search_time / count:.0f} ns/node)")
+
+
+if __name__ == "__main__":
+    main()
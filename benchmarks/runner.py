@@ -0,0 +1,267 @@
+# Reproducible benchmark runner over the standard corpus, checking every solution against its known optimal length
+# Usage: python3 main.py bench [--corpus 3x3 4x4 5x5] [--korf FILE] [--solver NAME] [--heuristic NAME] [--warmup N]
+#                              [--repeat N] [--timeout SECONDS] [--limit N] [--json FILE] [--csv FILE] [--list]
+from __future__ import annotations
+from csv import DictWriter
+from json import dump
+from os import cpu_count
+from sys import argv
+from time import perf_counter_ns, process_time_ns
+
+# Local Dependencies
+from benchmarks.corpus import get_corpora, load_corpus, load_korf_file
+from src.budget import Budget
+from src.input_handler import find_option
+from src.puzzle import HEURISTICS, OPTIMAL_SOLVERS, SOLVERS, Puzzle, apply_moves, get_heuristics, get_moves
+from src.search_stats import COLUMNS
+
+# Constants
+DEFAULT_SOLVERS = ("IDA*",)                     # Solvers run when none are chosen
+DEFAULT_HEURISTICS = ("Manhattan Distance",)    # Heuristics run when none are chosen
+DEFAULT_CORPORA = ("3x3",)                      # Corpora run when none are chosen and no Korf file is given
+DEFAULT_TIMEOUT = 60.0                          # Longest time a single run may take [s]
+PACKAGES = ("numpy", "pandas", "matplotlib")    # Packages whose versions are recorded with the results
+
+# Outcomes of checking a solution against the known optimal length
+OPTIMAL = "optimal"             # Solution is as short as the known optimum
+SUBOPTIMAL = "suboptimal"       # Solution is longer than the known optimum
+UNKNOWN = "unknown"             # Solution is valid, but no optimum is known for the board
+INVALID = "invalid"             # Solution does not solve the board, or is shorter than the optimum
+UNSOLVED = "unsolved"           # Solver stopped without a solution (e.g. on reaching the timeout)
+
+
+# Adds the options of the bench command to an argument parser
+#  param parser - ArgumentParser object of the bench command
+def add_bench_arguments(parser):
+    parser.add_argument("--corpus", nargs='+', choices=sorted(get_corpora()), default=None,
+                        help=f"corpora to run (default: {' '.join(DEFAULT_CORPORA)})")
+    parser.add_argument("--korf", metavar="FILE", help="file of 4x4 instances in Korf's format to run")
+    parser.add_argument("--solver", action="append", metavar="NAME", help="solver to run, may be repeated")
+    parser.add_argument("--heuristic", action="append", metavar="NAME", help="heuristic to run, may be repeated")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs on the first board of each corpus")
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs of every board")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds allowed per run")
+    parser.add_argument("--limit", type=int, help="largest number of boards run from each corpus")
+    parser.add_argument("--profile", action="store_true", help="profile move, heuristic, queue times and memory")
+    parser.add_argument("--json", metavar="FILE", help="write the environment and results to a JSON file")
+    parser.add_argument("--csv", metavar="FILE", help="write the results to a CSV file, environment as # comments")
+    parser.add_argument("--list", action="store_true", help="list the available corpora, solvers, and heuristics")
+
+
+# Describes the machine and software the benchmark runs on, so results can be compared across runs
+# The modules used here are slow to import and only needed once results are written, so they are imported here
+# rather than on every start of main.py
+# return - dictionary of environment metadata
+def get_environment() -> dict:
+    from datetime import datetime, timezone
+    from importlib.metadata import PackageNotFoundError, version
+    from platform import machine, node, platform, processor, python_implementation, python_version
+    from subprocess import DEVNULL, CalledProcessError, check_output
+
+    try:
+        commit = check_output(["git", "rev-parse", "HEAD"], stderr=DEVNULL, text=True).strip()
+        dirty = bool(check_output(["git", "status", "--porcelain", "--untracked-files=no"], stderr=DEVNULL,
+                                  text=True).strip())
+    except (CalledProcessError, OSError):
+        commit = dirty = None
+
+    packages = {}
+    for package in PACKAGES:
+        try:
+            packages[package] = version(package)
+        except PackageNotFoundError:
+            packages[package] = None
+
+    return {"timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "command": " ".join(argv),
+            "python": f"{python_implementation()} {python_version()}",
+            "platform": platform(),
+            "machine": machine(),
+            "processor": processor(),
+            "cpu_count": cpu_count(),
+            "hostname": node(),
+            "git_commit": commit,
+            "git_dirty": dirty,
+            "packages": packages}
+
+
+# Collects the boards to run, from the shipped corpora and an optional Korf instance file
+#  param corpora - names of the shipped corpora to run
+#  param    korf - path to a file of instances in Korf's format, or None
+#  param   limit - largest number of boards taken from each corpus, or None for all
+# return         - dictionary mapping each corpus name to its array of instances
+def get_instances(corpora: list[str], korf: str | None, limit: int | None) -> dict[str, list[dict]]:
+    instances = {name: load_corpus(file_name) for name, file_name in get_corpora().items() if name in corpora}
+    if korf is not None:
+        instances["korf"] = load_korf_file(korf)
+
+    return {name: boards[:limit] for name, boards in instances.items()}
+
+
+# Checks the solution a solver returned for a board
+#  param   puzzle - Puzzle object holding the initial board state
+#  param   result - SolveResult returned by the solver
+#  param  optimal - known optimal solution length, or None
+#  param   solver - solver function, to tell whether a longer solution is an error
+# return  outcome - one of OPTIMAL, SUBOPTIMAL, UNKNOWN, INVALID, UNSOLVED
+# return   length - number of moves in the solution, or None if there was none
+def check_solution(puzzle: Puzzle, result, optimal: int | None, solver) -> tuple[str, int | None]:
+    if not result.is_solved():
+        return UNSOLVED, None
+
+    # Replay the moves from the initial board, rather than trusting the final node
+    moves = get_moves(result.node)
+    if not apply_moves(puzzle, moves).is_solution():
+        return INVALID, len(moves)
+
+    if optimal is None:
+        return UNKNOWN, len(moves)
+    if len(moves) < optimal:
+        return INVALID, len(moves)
+    if len(moves) > optimal:
+        return INVALID if solver in OPTIMAL_SOLVERS else SUBOPTIMAL, len(moves)
+
+    return OPTIMAL, len(moves)
+
+
+# Runs one solver and heuristic on one board, timing it and checking its solution
+#  param       corpus - name of the corpus the board belongs to
+#  param     instance - corpus dictionary of the board
+#  param  solver_name - name of the solver
+#  param       solver - solver function
+#  param    heuristic - Heuristic object
+#  param      timeout - longest time the run may take [s]
+#  param      profile - indicates whether the run is profiled
+#  param   repetition - index of the timed run of this board
+# return       record - dictionary holding the outcome, times, and search statistics of the run
+def run_instance(corpus: str, instance: dict, solver_name: str, solver, heuristic, timeout: float, profile: bool,
+                 repetition: int) -> dict:
+    puzzle = Puzzle(board=instance["board"], heuristic=heuristic)
+    budget = Budget(max_seconds=timeout, profile=profile)
+
+    start_time, start_cpu = perf_counter_ns(), process_time_ns()
+    result = solver(puzzle, heuristic, budget)
+    time, cpu_time = perf_counter_ns() - start_time, process_time_ns() - start_cpu
+
+    outcome, length = check_solution(puzzle, result, instance.get("optimal"), solver)
+    return {"corpus": corpus, "id": instance["id"], "size": puzzle.board_size, "solver": solver_name,
+            "heuristic": heuristic.name, "repetition": repetition, "status": result.status, "check": outcome,
+            "length": length, "optimal": instance.get("optimal"), "time": time, "cpu_time": cpu_time,
+            **result.stats.get_row()}
+
+
+# Runs every chosen solver and heuristic on every board, after untimed warmup runs
+# Solvers that need a consistent heuristic are not run with the others
+#  param   instances - dictionary mapping each corpus name to its array of instances
+#  param     solvers - array of (name, solver function) pairs
+#  param  heuristics - array of Heuristic objects
+#  param      warmup - number of untimed runs on the first board of each corpus, which also loads heuristic tables
+#  param      repeat - number of timed runs of every board
+#  param     timeout - longest time a single run may take [s]
+#  param     profile - indicates whether the runs are profiled
+# return     records - array of dictionaries, one per timed run
+def run_benchmark(instances: dict[str, list[dict]], solvers: list[tuple], heuristics: list, warmup: int,
+                  repeat: int, timeout: float, profile: bool) -> list[dict]:
+    records = []
+
+    for solver_name, solver in solvers:
+        for heuristic in heuristics:
+            if heuristic.name not in get_heuristics(solver):
+                print(f"Skipping {solver_name} with {heuristic.name}, as the solver needs a consistent heuristic")
+                continue
+
+            for corpus, boards in instances.items():
+                if not boards:
+                    continue
+
+                for _ in range(warmup):
+                    run_instance(corpus, boards[0], solver_name, solver, heuristic, timeout, profile, -1)
+
+                for instance in boards:
+                    for repetition in range(repeat):
+                        record = run_instance(corpus, instance, solver_name, solver, heuristic, timeout, profile,
+                                              repetition)
+                        records.append(record)
+                        print(f"{solver_name:<20}{heuristic.name:<20}{instance['id']:<18}{record['status']:<14}"
+                              f"{record['check']:<12}{str(record['length']):>6}{str(record['optimal']):>6}"
+                              f"{record['time'] / 1000000000:>10.4f} s")
+
+    return records
+
+
+# Writes the environment, settings, and results to a JSON file
+#  param   file_name - path to the output file
+#  param environment - dictionary of environment metadata
+#  param    settings - dictionary of the benchmark settings
+#  param     records - array of result dictionaries
+def write_json(file_name: str, environment: dict, settings: dict, records: list[dict]):
+    with open(file_name, 'w') as out_file:
+        dump({"environment": environment, "settings": settings, "results": records}, out_file, indent=1)
+
+
+# Writes the results to a CSV file, preceded by the environment and settings as # comment lines
+# (read it back with pandas.read_csv(file_name, comment='#'))
+#  param   file_name - path to the output file
+#  param environment - dictionary of environment metadata
+#  param    settings - dictionary of the benchmark settings
+#  param     records - array of result dictionaries
+def write_csv(file_name: str, environment: dict, settings: dict, records: list[dict]):
+    fields = ["corpus", "id", "size", "solver", "heuristic", "repetition", "status", "check", "length", "optimal",
+              "time", "cpu_time", *COLUMNS]
+
+    with open(file_name, 'w', newline='') as out_file:
+        for key, value in {**environment, **settings}.items():
+            out_file.write(f"# {key}: {value}\n")
+
+        writer = DictWriter(out_file, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(records)
+
+
+# Summarises the checks of every run
+#  param records - array of result dictionaries
+# return         - number of runs whose solution was invalid
+def print_summary(records: list[dict]) -> int:
+    counts = {}
+    for record in records:
+        counts[record["check"]] = counts.get(record["check"], 0) + 1
+
+    print(f"\n{len(records)} runs: " + ", ".join(f"{count} {check}" for check, count in sorted(counts.items())))
+    for record in records:
+        if record["check"] == INVALID:
+            print(f"ERROR: {record['solver']} with {record['heuristic']} returned {record['length']} moves for "
+                  f"{record['id']}, whose optimal solution has {record['optimal']} moves")
+
+    return counts.get(INVALID, 0)
+
+
+# Runs the bench command
+#  param args - parsed command line arguments, see add_bench_arguments()
+# return      - exit status, 1 if any solution was invalid
+def run_bench(args) -> int:
+    if args.list:
+        print(f"Corpora: {', '.join(sorted(get_corpora()))}")
+        print(f"Solvers: {', '.join(SOLVERS)}")
+        print(f"Heuristics: {', '.join(HEURISTICS)}")
+        return 0
+
+    solvers = [find_option(name, SOLVERS) for name in args.solver or DEFAULT_SOLVERS]
+    heuristics = [find_option(name, HEURISTICS)[1] for name in args.heuristic or DEFAULT_HEURISTICS]
+    corpora = args.corpus if args.corpus is not None else [] if args.korf else list(DEFAULT_CORPORA)
+    instances = get_instances(corpora, args.korf, args.limit)
+
+    settings = {"corpora": list(instances), "solvers": [name for name, _ in solvers],
+                "heuristics": [heuristic.name for heuristic in heuristics], "warmup": args.warmup,
+                "repeat": args.repeat, "timeout": args.timeout, "limit": args.limit, "profile": args.profile}
+    environment = get_environment()
+
+    records = run_benchmark(instances, solvers, heuristics, args.warmup, args.repeat, args.timeout, args.profile)
+
+    if args.json:
+        write_json(args.json, environment, settings, records)
+        print(f"\nResults written to {args.json}")
+    if args.csv:
+        write_csv(args.csv, environment, settings, records)
+        print(f"\nResults written to {args.csv}")
+
+    return 1 if print_summary(records) else 0
@@ -1,25 +1,57 @@
+from argparse import ArgumentParser
 from time import perf_counter_ns
 
 # Local dependencies
-from src.gui import GraphicsEngine
-from src.input_handler import get_board_from_file, get_int_from_user
-from src.puzzle import Puzzle, solve_puzzle
-from src.timing_plotting import Plotting
+# Only modules without third-party dependencies are imported here, every other module is imported by the option or
+# subcommand that uses it, so each one only pays for (and only needs) the packages it uses
+from benchmarks.runner import add_bench_arguments, run_bench
+from src.batch import add_batch_arguments, run_batch
+from src.input_handler import get_board_from_file, get_int_from_user, get_option_from_user, get_solver_settings
+from src.plugins import load_plugins
+from src.puzzle import SOLVERS, Puzzle, get_heuristics
+from src.server import add_serve_arguments, run_server
 
 # Enables debug mode when True
 DEBUG = False
 
 
 def main():
-    prompt_choice = get_int_from_user("1. Launch GUI\n2. Plot Timing Data\n3. Import Test Puzzle", 1, 3)
+    # Subcommands run without prompting, anything else starts the interactive menu
+    parser = ArgumentParser(description="Sliding tile puzzle solver")
+    commands = parser.add_subparsers(dest="command")
+    add_bench_arguments(commands.add_parser("bench", help="run the benchmark corpus"))
+    add_batch_arguments(commands.add_parser("batch", help="solve boards from files or stdin, writing JSON lines"))
+    add_serve_arguments(commands.add_parser("serve", help="run the local solver service"))
+    args = parser.parse_args()
+
+    # Solvers and heuristics are only registered by the subcommands and menu options that list or run them, as they
+    # import heavy packages (e.g. NumPy), but all of those register the same ones so they offer the same choices
+    if args.command == "bench":
+        load_plugins()
+        raise SystemExit(run_bench(args))
+    if args.command == "batch":
+        load_plugins()
+        raise SystemExit(run_batch(args))
+    if args.command == "serve":
+        load_plugins()
+        raise SystemExit(run_server(args))
+
+    prompt_choice = get_int_from_user("1. Launch GUI\n2. Plot Timing Data\n3. Import Test Puzzle\n"
+                                      "4. Build Heuristic Tables", 1, 4)
 
     # Launch GUI
     if prompt_choice == 1:
+        from src.gui import GraphicsEngine
+
+        load_plugins()
         engine = GraphicsEngine()
         engine.launch_gui()
 
     # Plot Timing Data
     elif prompt_choice == 2:
+        from src.timing_plotting import Plotting
+
+        load_plugins()
         plots = Plotting(DEBUG)
 
         # Gather new experimental data if the user requests it
@@ -29,20 +61,68 @@ def main():
         plots.read_csv()
         plots.plot_data()
         plots.plot_data(True)
+        plots.plot_stats()
 
     # Import Test Puzzle
-    else:
+    elif prompt_choice == 3:
+        from src.solution_cache import SOLUTION_CACHE
+
+        load_plugins()
         puzzle = Puzzle(board=get_board_from_file())
         num_tests = get_int_from_user("Enter desired number of tests", 1)
+        solver = get_option_from_user("Select a solver", SOLVERS)
+        heuristics = get_heuristics(solver)
+        solver, _ = get_solver_settings(solver)
+        heuristic = get_option_from_user("Select a heuristic", heuristics)
+
+        # Cached solutions are returned instantly, so honest timing runs must bypass the cache
+        SOLUTION_CACHE.enabled = get_int_from_user("1. Solve every run (bypass the solution cache)\n"
+                                                   "2. Reuse cached solutions", 1, 2) == 2
         total_time = 0
+        result = None
 
         # Record time for each individual test run
         for _ in range(num_tests):
             start_time = perf_counter_ns()
-            solve_puzzle(puzzle)
+            result = SOLUTION_CACHE.solve(solver, puzzle, heuristic)
             total_time += perf_counter_ns() - start_time
 
         print(f"\nAverage time to solve the puzzle: {total_time // num_tests / 1000000000:.4f} seconds")
+        print(f"Search statistics of the last run ({result.status}):\n{result.stats}")
+
+        # Anytime solvers report each solution they found on the way to the final one
+        for seconds, cost, bound in result.stats.solutions:
+            print(f"  {seconds:.4f} s: {cost} moves (at most {bound:.3f} x optimal)")
+
+        if SOLUTION_CACHE.enabled:
+            print(f"Solution cache: {SOLUTION_CACHE.hits} hits, {SOLUTION_CACHE.misses} misses")
+        SOLUTION_CACHE.close()
+
+    # Build Heuristic Tables
+    else:
+        from src.pattern_database import LARGE_BUILD, PARTITIONS, PATTERN_DATABASE, build_pattern_database, \
+            get_build_bytes
+        from src.walking_distance import MAX_TABLE_SIZE, WALKING_DISTANCE
+
+        sizes = {f"{size}x{size}": size for size in PARTITIONS}
+        size = get_option_from_user("Select a board size", sizes)
+        partition = get_option_from_user("Select a tile partition", PARTITIONS[size])
+
+        # Large partitions take a long time and a lot of memory to build, so they must be confirmed
+        allow_large = False
+        if (needed := max(get_build_bytes(size, pattern) for pattern in partition)) > LARGE_BUILD:
+            print(f"\nWARNING: This partition needs about {needed / 2 ** 20:.0f} MB to build each of its largest "
+                  f"tables, and its build may take many times longer than the default partition")
+            allow_large = get_int_from_user("1. Cancel\n2. Build anyway", 1, 2) == 2
+            if not allow_large:
+                return
+
+        build_pattern_database(size, partition, allow_large)
+        PATTERN_DATABASE.close()
+
+        # Walking distance tables are small enough to rebuild alongside the pattern database
+        if size <= MAX_TABLE_SIZE:
+            WALKING_DISTANCE.rebuild_table(size)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,233 @@
+from __future__ import annotations
+from math import inf
+from time import perf_counter
+
+# Local Dependencies
+from src.budget import SOLVED, UNSOLVABLE, Budget, SolveResult
+from src.minheap import MinHeap
+from src.puzzle import (CONSISTENT_SOLVERS, MANHATTAN_DISTANCE, SOLVER_BOUNDS, SOLVERS, Heuristic, PackedTiles, Puzzle,
+                        apply_moves, check_consistent, get_neighbors, get_path, pack_board)
+
+# Constants
+DEFAULT_WEIGHT = 2.0        # Weight on the heuristic used by weighted A* unless another is chosen
+INITIAL_WEIGHT = 3.0        # Weight on the heuristic used for the first solution of an anytime search
+WEIGHT_STEP = 0.5           # Amount the weight is lowered by after each solution of an anytime search
+
+
+# Weighted A* search over packed board states, ordering live nodes by g + w * h
+# Boards already expanded under the current weight are never expanded again, instead any cheaper path to them is
+# kept aside (INCONS) until the weight is lowered, which is what lets an anytime search reuse its earlier effort
+# With a consistent heuristic, every solution found costs at most w times the optimal solution
+# attr       puzzle - Puzzle object holding the initial board state
+# attr    heuristic - consistent Heuristic object guiding the search
+# attr       budget - Budget object limiting the search
+# attr         size - length/width of the game board
+# attr         bits - number of bits holding each tile of a packed state
+# attr         goal - integer holding the packed solution board state
+# attr        costs - dictionary mapping each reached state to the fewest moves found to reach it (its g-cost)
+# attr      parents - dictionary mapping each reached state to its (parent state, direction), or None for the start
+# attr        stats - SearchStats object of the search, taken from the budget
+# attr       scorer - heuristic used to score boards, timed if the search is profiled (as is the MinHeap)
+# attr        nodes - dictionary mapping each reached state to its (blank index, heuristic cost)
+# attr   live_nodes - MinHeap of (state, g) entries keyed by (g + w * h, -g), stale entries are skipped when popped
+# attr       closed - set of states expanded under the current weight
+# attr inconsistent - set of closed states reached again through a cheaper path
+# attr   best_state - state with the lowest heuristic cost expanded so far
+# attr    solutions - array of (seconds since the start, cost, suboptimality bound) for each solution found
+class WeightedSearch:
+    def __init__(self, puzzle: Puzzle, heuristic: Heuristic, budget: Budget):
+        self.puzzle = puzzle
+        self.heuristic = heuristic
+        self.budget = budget
+        self.size = puzzle.board_size
+        self.bits = puzzle.tile_bits
+        goal_tiles = [*range(1, self.size ** 2), 0]
+        self.goal = pack_board([goal_tiles[i * self.size:(i + 1) * self.size] for i in range(self.size)])
+
+        tiles = puzzle.get_tiles()
+        self.costs = {puzzle.state: 0}
+        self.parents = {puzzle.state: None}
+        self.stats = budget.stats
+        self.scorer = self.stats.time_heuristic(heuristic)
+        self.nodes = {puzzle.state: (tiles.index(0), self.scorer.evaluate(tiles, self.size))}
+        self.live_nodes = self.stats.time_queue(MinHeap())
+        self.closed = set()
+        self.inconsistent = {puzzle.state}
+        self.best_state = puzzle.state
+        self.solutions = []
+
+    # Rebuilds the live nodes under a new weight, adding back every state reached more cheaply since it was expanded
+    #  param weight - weight on the heuristic cost
+    def reweight(self, weight: float):
+        states = self.inconsistent.union(state for state, g in self.live_nodes.nodes if g == self.costs[state])
+        self.live_nodes.clear()
+        self.inconsistent = set()
+        self.closed.clear()
+
+        for state in states:
+            g = self.costs[state]
+            self.live_nodes.insert((state, g), (g + weight * self.nodes[state][1], -g))
+
+    # Expands boards in order until no live node can lead to a cheaper solution under the given weight
+    #  param weight - weight on the heuristic cost
+    # return   True - if the search finished (whether or not it found a solution)
+    # return  False - if the budget ran out first
+    def improve_path(self, weight: float) -> bool:
+        size, bits, mask = self.size, self.bits, (1 << self.bits) - 1
+        costs, parents, nodes, closed = self.costs, self.parents, self.nodes, self.closed
+        live_nodes, heuristic, scorer, stats = self.live_nodes, self.heuristic, self.scorer, self.stats
+        neighbors = get_neighbors(size)
+        profile = stats.profile
+
+        while live_nodes and live_nodes.peek_key()[0] < costs.get(self.goal, inf):
+            state, g = live_nodes.pop_root()
+            if g != costs[state] or state in closed:
+                continue
+
+            if not self.budget.expand():
+                return False
+
+            closed.add(state)
+            blank, h = nodes[state]
+            if h < nodes[self.best_state][1]:
+                self.best_state = state
+
+            if profile:
+                start = stats.get_clock()
+
+            tiles = PackedTiles(state, size, bits) if heuristic.needs_tiles else None
+            stats.generated += len(neighbors[blank])
+            for direction, src in neighbors[blank]:
+                tile = (state >> (src * bits)) & mask
+                child = state + (tile << (blank * bits)) - (tile << (src * bits))
+
+                if g + 1 >= costs.get(child, inf):
+                    stats.duplicates += 1
+                    continue
+
+                costs[child] = g + 1
+                parents[child] = (state, direction)
+                if child not in nodes:
+                    nodes[child] = (src, scorer.update(h, tiles, size, tile, src, blank))
+
+                if child in closed:
+                    self.inconsistent.add(child)
+                else:
+                    live_nodes.insert((child, g + 1), (g + 1 + weight * nodes[child][1], -g - 1))
+
+            if profile:
+                stats.move_time += stats.get_clock() - start
+            stats.add_sizes(len(live_nodes))
+
+        return True
+
+    # Computes how far the current solution may be from optimal, from the lowest g + h of any board left to expand
+    #  param weight - weight on the heuristic cost the last solution was found with
+    # return  bound - the solution costs at most this many times the optimal solution
+    def get_bound(self, weight: float) -> float:
+        costs, nodes = self.costs, self.nodes
+        states = self.inconsistent.union(state for state, g in self.live_nodes.nodes if g == costs[state])
+        lowest = min((costs[state] + nodes[state][1] for state in states), default=inf)
+
+        # Only the initial board can have a g + h of zero, when it is already the solution
+        return min(weight, costs[self.goal] / lowest) if lowest else 1.0
+
+    # Records the solution found with a weight, if it improves on the last one
+    #  param weight - weight on the heuristic cost the solution was found with
+    # return  bound - the solution costs at most this many times the optimal solution
+    def add_solution(self, weight: float) -> float:
+        bound = max(1.0, self.get_bound(weight))
+        cost = self.costs[self.goal]
+
+        if not self.solutions or cost < self.solutions[-1][1] or bound < self.solutions[-1][2]:
+            self.solutions.append((perf_counter() - self.budget.start_time, cost, bound))
+
+        return bound
+
+    # Packages the outcome of the search
+    #  param status - SOLVED, or the limit that stopped the search
+    # return        - SolveResult holding the best solution, or the lowest cost board expanded if none was found
+    def get_result(self, status: str) -> SolveResult:
+        state = self.goal if self.goal in self.costs else self.best_state
+
+        # Every board reached is kept, both to detect repeats and to repair the search under a lower weight
+        self.stats.max_closed = len(self.costs)
+        stats = self.budget.get_stats()
+        stats.solutions = self.solutions
+        if self.solutions:
+            stats.bound = self.solutions[-1][2]
+
+        return SolveResult(status, apply_moves(self.puzzle, get_path(self.parents, state), self.heuristic), stats)
+
+
+# Weighted A* search, which finds a solution costing at most weight times the optimal solution
+# The bound only holds with a consistent heuristic, so any other heuristic raises a ValueError
+#  param    puzzle - Puzzle object holding the initial board state
+#  param heuristic - consistent Heuristic object guiding the search
+#  param    budget - Budget object limiting the search, defaults to no limits
+#  param    weight - weight on the heuristic cost, at least 1 (1 is plain A*)
+# return           - SolveResult holding the solution, or the lowest cost board expanded if the budget ran out
+def solve_puzzle_weighted(puzzle: Puzzle, heuristic: Heuristic = MANHATTAN_DISTANCE, budget: Budget = None,
+                          weight: float = DEFAULT_WEIGHT) -> SolveResult:
+    check_consistent("Weighted A*", heuristic)
+    budget = budget or Budget()
+    budget.start()
+
+    if not puzzle.is_solvable():
+        print("\nNo solution found! Are you sure the puzzle was solvable?")
+        return SolveResult(UNSOLVABLE, None, budget.get_stats())
+
+    search = WeightedSearch(puzzle, heuristic, budget)
+    search.reweight(weight)
+
+    if not search.improve_path(weight):
+        return search.get_result(budget.status)
+
+    search.add_solution(weight)
+    return search.get_result(SOLVED)
+
+
+# Anytime Repairing A* (ARA*), which finds a first solution quickly with a high weight and then keeps lowering the
+# weight, finding cheaper solutions until the solution is proven optimal or the budget runs out
+# Each pass only re-expands boards whose cost improved in the last pass, rather than starting the search over
+# The bounds only hold with a consistent heuristic, so any other heuristic raises a ValueError
+#  param    puzzle - Puzzle object holding the initial board state
+#  param heuristic - consistent Heuristic object guiding the search
+#  param    budget - Budget object limiting the search (usually by time), defaults to no limits
+#  param    weight - weight on the heuristic cost used for the first solution
+#  param      step - amount the weight is lowered by after each solution
+# return           - SolveResult holding the best solution found, with every solution and its suboptimality bound
+#                    timestamped in stats.solutions, or the lowest cost board expanded if none was found in time
+def solve_puzzle_anytime(puzzle: Puzzle, heuristic: Heuristic = MANHATTAN_DISTANCE, budget: Budget = None,
+                         weight: float = INITIAL_WEIGHT, step: float = WEIGHT_STEP) -> SolveResult:
+    check_consistent("Anytime A* (ARA*)", heuristic)
+    budget = budget or Budget()
+    budget.start()
+
+    if not puzzle.is_solvable():
+        print("\nNo solution found! Are you sure the puzzle was solvable?")
+        return SolveResult(UNSOLVABLE, None, budget.get_stats())
+
+    search = WeightedSearch(puzzle, heuristic, budget)
+    search.reweight(weight)
+
+    while search.improve_path(weight):
+        # Stop once the solution is proven optimal, otherwise tighten the weight and repair the search
+        if search.add_solution(weight) <= 1:
+            return search.get_result(SOLVED)
+
+        weight = max(1.0, min(weight - step, search.get_bound(weight)))
+        search.reweight(weight)
+
+    # A solution found before the budget ran out is still returned, with the bound it was proven within
+    return search.get_result(SOLVED if search.solutions else budget.status)
+
+
+# Make the bounded suboptimal solvers available alongside the other solvers
+SOLVERS["Weighted A*"] = solve_puzzle_weighted
+SOLVERS["Anytime A* (ARA*)"] = solve_puzzle_anytime
+CONSISTENT_SOLVERS.update((solve_puzzle_weighted, solve_puzzle_anytime))
+
+# ARA* may stop at its first solution when its budget runs out, so only its first weight is guaranteed
+SOLVER_BOUNDS[solve_puzzle_weighted] = ("weight", DEFAULT_WEIGHT)
+SOLVER_BOUNDS[solve_puzzle_anytime] = ("weight", INITIAL_WEIGHT)
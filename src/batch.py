@@ -0,0 +1,171 @@
+# Non-interactive batch solver: reads boards from files, directories, or stdin, and writes one JSON line per board
+# Usage: python3 main.py batch [PATH ...] [--solver NAME] [--heuristic NAME] [--workers N] [--timeout SECONDS]
+#                              [--output FILE]
+from __future__ import annotations
+from collections import deque
+from contextlib import redirect_stdout
+from json import dumps
+from os import listdir, path
+from sys import stderr, stdin, stdout
+from time import perf_counter_ns, process_time_ns
+from typing import Iterator
+
+# Local Dependencies
+from src.budget import Budget
+from src.input_handler import find_option, read_boards
+from src.puzzle import DOWN, HEURISTICS, LEFT, RIGHT, SOLVERS, UP, Puzzle, get_heuristics, get_moves
+
+# Constants
+DEFAULT_SOLVER = "IDA*"                     # Solver used when none is chosen
+DEFAULT_HEURISTIC = "Linear Conflict"       # Heuristic used when none is chosen
+JOBS_PER_WORKER = 4                         # Boards queued ahead of each worker process, bounding the boards in memory
+STDIN = '-'                                 # Path standing for the standard input
+INVALID = "invalid"                         # Status of a board that could not be parsed
+
+# Letter of the direction each tile slides in, used to write the moves of a solution as a compact string
+MOVE_LETTERS = {UP: 'U', DOWN: 'D', LEFT: 'L', RIGHT: 'R'}
+
+
+# Adds the command line arguments of the batch subcommand to a parser
+#  param parser - ArgumentParser of the subcommand
+def add_batch_arguments(parser):
+    parser.add_argument("paths", nargs='*', metavar="PATH",
+                        help=f"board files, or directories of them, to solve ('{STDIN}' or none for stdin)")
+    parser.add_argument("--solver", default=DEFAULT_SOLVER, metavar="NAME",
+                        help=f"solver to use (default: {DEFAULT_SOLVER})")
+    parser.add_argument("--heuristic", default=DEFAULT_HEURISTIC, metavar="NAME",
+                        help=f"heuristic to use (default: {DEFAULT_HEURISTIC})")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes solving boards at once")
+    parser.add_argument("--timeout", type=float, help="seconds allowed per board (default: no limit)")
+    parser.add_argument("--output", metavar="FILE", help="write the results to a file instead of stdout")
+
+
+# Lists the files to read, expanding each directory into the files it holds
+#  param paths - paths given on the command line
+# return       - generator of file paths, or STDIN
+def get_files(paths: list[str]) -> Iterator[str]:
+    for name in paths or [STDIN]:
+        if path.isdir(name):
+            yield from (file_name for file_name in (path.join(name, entry) for entry in sorted(listdir(name)))
+                        if path.isfile(file_name))
+        else:
+            yield name
+
+
+# Reads every board of every file, one at a time, so only the boards being solved are held in memory
+#  param paths - paths given on the command line
+# return       - generator of (file name, index of the board in its file, line it starts on, board or None, error)
+def read_jobs(paths: list[str]) -> Iterator[tuple[str, int, int, list[list[int]] | None, str | None]]:
+    for name in get_files(paths):
+        if name == STDIN:
+            for index, board in enumerate(read_boards(stdin)):
+                yield "<stdin>", index, *board
+            continue
+
+        try:
+            in_file = open(name)
+        except OSError as error:
+            raise SystemExit(f"ERROR: Unable to open {name} ({error.strerror})")
+
+        with in_file:
+            for index, board in enumerate(read_boards(in_file)):
+                yield name, index, *board
+
+
+# Solves a single board, timing the solve
+# Anything the solver prints is sent to stderr, so stdout holds nothing but JSON lines
+#  param     board - 2D board to solve
+#  param    solver - function used to solve the board
+#  param heuristic - heuristic used by the solver
+#  param   timeout - longest time the solve may take [s], or None for no limit
+# return    result - dictionary holding the status, moves, length, wall and CPU time [ns], and search statistics
+def solve_board(board: list[list[int]], solver, heuristic, timeout: float | None) -> dict:
+    puzzle = Puzzle(board=board, heuristic=heuristic)
+
+    with redirect_stdout(stderr):
+        start_time, start_cpu = perf_counter_ns(), process_time_ns()
+        result = solver(puzzle, heuristic, Budget(max_seconds=timeout))
+        time, cpu_time = perf_counter_ns() - start_time, process_time_ns() - start_cpu
+
+    moves = "".join(MOVE_LETTERS[move] for move in get_moves(result.node)) if result.is_solved() else None
+    return {"status": result.status, "moves": moves, "length": None if moves is None else len(moves), "time": time,
+            "cpu_time": cpu_time, "stats": result.stats.get_row()}
+
+
+# Solves every board, in this process or across a pool of worker processes
+# Only a few boards per worker are read ahead of the results written, and results are yielded in input order
+#  param      jobs - generator of boards, as yielded by read_jobs()
+#  param    solver - function used to solve each board
+#  param heuristic - heuristic used by the solver
+#  param   timeout - longest time each solve may take [s], or None for no limit
+#  param   workers - number of worker processes
+# return           - generator of result dictionaries, one per board
+def solve_jobs(jobs, solver, heuristic, timeout: float | None, workers: int) -> Iterator[dict]:
+    if workers <= 1:
+        for source, index, line, board, error in jobs:
+            solution = solve_board(board, solver, heuristic, timeout) if board is not None else None
+            yield make_record(source, index, line, board, error, solution)
+        return
+
+    # Imported here, so the serial path does not pay for starting the multiprocessing machinery
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+
+        for source, index, line, board, error in jobs:
+            future = executor.submit(solve_board, board, solver, heuristic, timeout) if board is not None else None
+            pending.append((source, index, line, board, error, future))
+
+            if len(pending) >= workers * JOBS_PER_WORKER:
+                *job, future = pending.popleft()
+                yield make_record(*job, future.result() if future is not None else None)
+
+        while pending:
+            *job, future = pending.popleft()
+            yield make_record(*job, future.result() if future is not None else None)
+
+
+# Builds the JSON record of a board
+#  param   source - name of the file the board was read from
+#  param    index - index of the board within its file
+#  param     line - line of the file the board starts on
+#  param    board - 2D board, or None if it could not be parsed
+#  param    error - message describing why the board could not be parsed, or None
+#  param solution - dictionary returned by solve_board(), or None if the board could not be parsed
+# return          - dictionary written as a single JSON line
+def make_record(source: str, index: int, line: int, board: list[list[int]] | None, error: str | None,
+                solution: dict | None) -> dict:
+    record = {"source": source, "index": index, "line": line}
+
+    if board is None:
+        return {**record, "status": INVALID, "error": error}
+    return {**record, "size": len(board), **solution}
+
+
+# Runs the batch subcommand, writing one JSON line per board as soon as it is solved
+#  param args - parsed command line arguments
+# return      - exit status, non-zero if any board could not be parsed
+def run_batch(args) -> int:
+    solver_name, solver = find_option(args.solver, SOLVERS)
+    heuristic_name, heuristic = find_option(args.heuristic, HEURISTICS)
+    if heuristic_name not in get_heuristics(solver):
+        raise SystemExit(f"ERROR: {solver_name} needs a consistent heuristic, choose from: "
+                         f"{', '.join(get_heuristics(solver))}")
+    out_file = open(args.output, 'w') if args.output else stdout
+    counts = {}
+
+    try:
+        for record in solve_jobs(read_jobs(args.paths), solver, heuristic, args.timeout, args.workers):
+            out_file.write(dumps(record) + "\n")
+            out_file.flush()
+            counts[record["status"]] = counts.get(record["status"], 0) + 1
+    finally:
+        if out_file is not stdout:
+            out_file.close()
+
+    # The summary goes to stderr as well
+    summary = ", ".join(f"{count} {status}" for status, count in counts.items())
+    print(f"{sum(counts.values())} boards: {summary or 'none read'}", file=stderr)
+
+    return 1 if INVALID in counts else 0
@@ -0,0 +1,313 @@
+from __future__ import annotations
+from time import perf_counter
+import numpy as np
+
+# Local Dependencies
+from src.budget import SOLVED, UNSOLVABLE, Budget, SolveResult
+from src.search_stats import SearchStats
+from src.puzzle import (DOWN, LEFT, MANHATTAN_DISTANCE, MISPLACED_TILES, OPTIMAL_SOLVERS, RIGHT, SOLVERS, UP, Heuristic,
+                        Puzzle, apply_moves, get_neighbors, get_tile_bits, solve_puzzle_ida)
+
+# Constants
+MAX_BATCHED_SIZE = 4        # Largest board size whose packed states fit in a 64-bit integer
+DEFAULT_BEAM_WIDTH = 4096   # Number of boards kept in each layer of a beam search
+
+
+# Builds the per-tile lookup table used to score a batch of boards at once
+# Misplaced tiles and Manhattan distance are sums over the tiles, so they are scored exactly, while every other
+# heuristic here dominates Manhattan distance, which is used in its place as an admissible lower bound
+#  param heuristic - Heuristic object the search was asked to use
+#  param      size - length/width of the game board
+# return          - array where table[tile, position] is the cost of the tile sitting at that position
+def get_tile_table(heuristic: Heuristic, size: int) -> np.ndarray:
+    if heuristic is MISPLACED_TILES:
+        return np.array([[int(tile != 0 and tile - 1 != k) for k in range(size ** 2)] for tile in range(size ** 2)],
+                        dtype=np.int32)
+
+    return np.array(MANHATTAN_DISTANCE.get_table(size), dtype=np.int32)
+
+
+# Checks which values appear in a sorted array
+#  param        values - array of values to look for
+#  param sorted_array - sorted array to look in
+# return              - boolean array, True where the value is present
+def in_sorted(values: np.ndarray, sorted_array: np.ndarray) -> np.ndarray:
+    if not len(sorted_array):
+        return np.zeros(len(values), dtype=bool)
+
+    index = np.minimum(np.searchsorted(sorted_array, values), len(sorted_array) - 1)
+    return sorted_array[index] == values
+
+
+# Layer of boards in a batched search, held as parallel arrays rather than one object per board
+# attr   states - uint64 array of packed board states
+# attr   blanks - index of the blank tile on each board
+# attr    costs - heuristic cost of each board
+# attr  parents - index of each board's parent in the previous layer
+# attr    moves - direction of the move that led from each board's parent to it
+class Layer:
+    def __init__(self, states: np.ndarray, blanks: np.ndarray, costs: np.ndarray, parents: np.ndarray,
+                 moves: np.ndarray):
+        self.states = states
+        self.blanks = blanks
+        self.costs = costs
+        self.parents = parents
+        self.moves = moves
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    # Keeps only some of the boards in the layer
+    #  param index - integer or boolean array selecting the boards to keep
+    # return       - new Layer holding the selected boards
+    def select(self, index: np.ndarray) -> Layer:
+        return Layer(self.states[index], self.blanks[index], self.costs[index], self.parents[index],
+                     self.moves[index])
+
+
+# Generates, scores and deduplicates layers of boards with vectorised array arithmetic
+# attr    size - length/width of the game board
+# attr    bits - number of bits holding each tile of a packed state
+# attr   table - per-tile heuristic lookup table, see get_tile_table()
+# attr    goal - packed solution board state
+# attr   moves - (direction, offset from the blank to the sliding tile, boolean array of valid blank positions)
+# attr   stats - SearchStats object the time spent scoring boards is added to, or None
+class BatchedExpander:
+    def __init__(self, size: int, heuristic: Heuristic, stats: SearchStats = None):
+        self.size = size
+        self.stats = stats
+        self.bits = get_tile_bits(size)
+        self.table = get_tile_table(heuristic, size)
+        self.goal = sum(((k + 1) % size ** 2) << (k * self.bits) for k in range(size ** 2))
+
+        valid = {direction: np.zeros(size ** 2, dtype=bool) for direction in (UP, DOWN, LEFT, RIGHT)}
+        for blank, neighbors in enumerate(get_neighbors(size)):
+            for direction, _ in neighbors:
+                valid[direction][blank] = True
+        offsets = {UP: size, DOWN: -size, LEFT: 1, RIGHT: -1}
+        self.moves = [(direction, offsets[direction], valid[direction]) for direction in (UP, DOWN, LEFT, RIGHT)]
+
+    # Creates the first layer of a search, holding only the initial board
+    #  param puzzle - Puzzle object holding the initial board state
+    # return        - Layer holding the initial board
+    def get_root(self, puzzle: Puzzle) -> Layer:
+        tiles = puzzle.get_tiles()
+        cost = sum(int(self.table[tile, k]) for k, tile in enumerate(tiles))
+
+        return Layer(np.array([puzzle.state], dtype=np.uint64), np.array([tiles.index(0)], dtype=np.int64),
+                     np.array([cost], dtype=np.int32), np.array([-1], dtype=np.int64), np.array([0], dtype=np.int8))
+
+    # Generates every child of every board in a layer, scoring each from its parent's cost
+    #  param  layer - Layer of boards to expand
+    # return        - Layer holding every child, duplicates included
+    def expand(self, layer: Layer) -> Layer:
+        bits, mask, table = np.uint64(self.bits), np.uint64((1 << self.bits) - 1), self.table
+        parts = []
+
+        for direction, offset, valid in self.moves:
+            parents = np.nonzero(valid[layer.blanks])[0]
+            states, blanks = layer.states[parents], layer.blanks[parents]
+            sources = blanks + offset
+
+            # Slide the tile at each source into the blank, exactly as Puzzle.move() does for a single board
+            blank_shift, source_shift = blanks.astype(np.uint64) * bits, sources.astype(np.uint64) * bits
+            tiles = (states >> source_shift) & mask
+            children = states + (tiles << blank_shift) - (tiles << source_shift)
+
+            start = perf_counter()
+            tile_index = tiles.astype(np.intp)
+            costs = layer.costs[parents] + table[tile_index, blanks] - table[tile_index, sources]
+            if self.stats is not None:
+                self.stats.heuristic_time += perf_counter() - start
+            parts.append(Layer(children, sources, costs, parents, np.full(len(parents), direction, dtype=np.int8)))
+
+        return Layer(*(np.concatenate([getattr(part, name) for part in parts])
+                       for name in ("states", "blanks", "costs", "parents", "moves")))
+
+    # Removes repeated boards from a layer, and any board already held by one of the given sorted arrays
+    #  param  layer - Layer of boards to deduplicate
+    #  param   seen - sorted uint64 arrays of states reached before
+    # return        - Layer sorted by state, holding each new board once
+    @staticmethod
+    def deduplicate(layer: Layer, seen) -> Layer:
+        _, first = np.unique(layer.states, return_index=True)
+        layer = layer.select(first)
+
+        for states in seen:
+            layer = layer.select(~in_sorted(layer.states, states))
+
+        return layer
+
+    # Finds the goal board within a layer
+    #  param layer - Layer to search
+    # return       - index of the goal board, or None if it is not in the layer
+    def find_goal(self, layer: Layer) -> int | None:
+        found = np.nonzero(layer.states == np.uint64(self.goal))[0]
+        return int(found[0]) if len(found) else None
+
+
+# Follows the parent indexes of a batched search back from a board to the initial board
+#  param layers - every Layer of the search, starting with the initial board
+#  param  index - index of the board within the last layer
+# return  moves - array of directions leading from the initial board to the board
+def get_layer_path(layers: list[Layer], index: int) -> list[int]:
+    moves = []
+    for layer in reversed(layers[1:]):
+        moves.append(int(layer.moves[index]))
+        index = int(layer.parents[index])
+
+    moves.reverse()
+    return moves
+
+
+# Runs a layer by layer search, handling everything the batched modes have in common
+#  param    puzzle - Puzzle object holding the initial board state
+#  param heuristic - Heuristic object scoring the boards
+#  param    budget - Budget object limiting the search
+#  param    select - function choosing which boards of a new layer to keep, given the layer and its depth
+#  param  frontier - indicates whether only the last two layers are checked for repeats (exact for full layers),
+#                    otherwise every layer is merged into one sorted closed set
+# return           - SolveResult holding the solution, or the lowest cost board reached if the search stopped
+# return      None - if the search ran out of boards without a solution
+def search_layers(puzzle: Puzzle, heuristic: Heuristic, budget: Budget, select, frontier: bool) -> SolveResult | None:
+    stats = budget.stats
+    expander = BatchedExpander(puzzle.board_size, heuristic, stats)
+    layers = [expander.get_root(puzzle)]
+    closed = layers[0].states
+    best = (int(layers[0].costs[0]), 0, 0)
+
+    while len(layers[-1]):
+        if (index := expander.find_goal(layers[-1])) is not None:
+            return SolveResult(SOLVED, apply_moves(puzzle, get_layer_path(layers, index), heuristic),
+                               budget.get_stats())
+
+        budget.nodes += len(layers[-1])
+        if not budget.check():
+            _, depth, index = best
+            node = apply_moves(puzzle, get_layer_path(layers[:depth + 1], index), heuristic)
+            return SolveResult(budget.status, node, budget.get_stats())
+
+        # Timing a whole layer costs next to nothing, so it is always measured, choosing which boards of the layer to
+        # keep counts as queueing and everything else but scoring the boards as move generation
+        start = stats.get_clock()
+        seen = [layer.states for layer in layers[-2:]] if frontier else [closed]
+        children = expander.expand(layers[-1])
+        layer = expander.deduplicate(children, seen)
+        stats.generated += len(children)
+        stats.duplicates += len(children) - len(layer)
+
+        selecting = stats.get_clock()
+        layer = select(layer, len(layers))
+        layers.append(layer)
+        stats.queue_time += stats.get_clock() - selecting
+
+        if not frontier:
+            closed = np.sort(np.concatenate([closed, layer.states]), kind="stable")
+        stats.move_time += stats.get_clock() - start
+        stats.add_sizes(len(layer), len(closed) if not frontier else sum(len(held) for held in layers[-3:]))
+
+        # Remember the lowest cost board reached, in case the search is stopped
+        if len(layer) and layer.costs[lowest := int(np.argmin(layer.costs))] < best[0]:
+            best = (int(layer.costs[lowest]), len(layers) - 1, lowest)
+
+    return None
+
+
+# Breadth first search expanding a whole layer of boards at a time, which finds an optimal solution
+# Only the last two layers are checked for repeated boards, as a board can never reappear further back
+#  param    puzzle - Puzzle object holding the initial board state
+#  param heuristic - Heuristic object used only to pick the best board reached if the search is stopped
+#  param    budget - Budget object limiting the search, defaults to no limits
+# return           - SolveResult holding the solution, or the lowest cost board reached if the budget ran out
+def solve_puzzle_bfs(puzzle: Puzzle, heuristic: Heuristic = MANHATTAN_DISTANCE, budget: Budget = None) -> SolveResult:
+    budget = budget or Budget()
+    budget.start()
+
+    if (result := check_batched_puzzle(puzzle, heuristic, budget)) is not None:
+        return result
+
+    return search_layers(puzzle, heuristic, budget, lambda layer, depth: layer, True)
+
+
+# Beam search, keeping only the lowest cost boards of each layer, which finds a solution quickly on large boards
+# The solution is not guaranteed to be optimal, and a narrow beam may miss every solution
+#  param    puzzle - Puzzle object holding the initial board state
+#  param heuristic - Heuristic object ranking the boards of each layer
+#  param    budget - Budget object limiting the search, defaults to no limits
+#  param     width - number of boards kept in each layer
+# return           - SolveResult holding the solution, or the lowest cost board reached if none was found
+def solve_puzzle_beam(puzzle: Puzzle, heuristic: Heuristic = MANHATTAN_DISTANCE, budget: Budget = None,
+                      width: int = DEFAULT_BEAM_WIDTH) -> SolveResult:
+    budget = budget or Budget()
+    budget.start()
+
+    if (result := check_batched_puzzle(puzzle, heuristic, budget)) is not None:
+        return result
+
+    # Keep the lowest cost boards of the layer, without sorting the rest
+    def select(layer: Layer, depth: int) -> Layer:
+        if len(layer) <= width:
+            return layer
+        return layer.select(np.argpartition(layer.costs, width - 1)[:width])
+
+    if (result := search_layers(puzzle, heuristic, budget, select, False)) is not None:
+        return result
+
+    print(f"\nNo solution found with a beam width of {width}! Try a wider beam.")
+    return SolveResult(UNSOLVABLE, None, budget.get_stats())
+
+
+# Breadth first iterative deepening A* (BFIDA*), running bounded breadth first searches with a rising f-cost bound
+# Boards whose depth plus heuristic cost exceeds the bound are dropped from each layer, so it finds an optimal
+# solution while keeping far fewer boards than a plain breadth first search
+#  param    puzzle - Puzzle object holding the initial board state
+#  param heuristic - admissible Heuristic object used to bound each iteration
+#  param    budget - Budget object limiting the search, defaults to no limits
+# return           - SolveResult holding the solution, or the lowest cost board reached if the budget ran out
+def solve_puzzle_bfida(puzzle: Puzzle, heuristic: Heuristic = MANHATTAN_DISTANCE,
+                       budget: Budget = None) -> SolveResult:
+    budget = budget or Budget()
+    budget.start()
+
+    if (result := check_batched_puzzle(puzzle, heuristic, budget)) is not None:
+        return result
+
+    bound = int(BatchedExpander(puzzle.board_size, heuristic).get_root(puzzle).costs[0])
+    exceeded = []
+
+    # Drop the boards over the bound, remembering the smallest f-cost dropped as the next bound
+    def select(layer: Layer, depth: int) -> Layer:
+        over = layer.costs + depth > bound
+        if over.any():
+            exceeded.append(int((layer.costs[over] + depth).min()))
+        return layer.select(~over)
+
+    while (result := search_layers(puzzle, heuristic, budget, select, True)) is None:
+        bound = min(exceeded)
+        exceeded.clear()
+
+    return result
+
+
+# Checks whether a board can be handled by the batched solvers, handing it to another solver if not
+#  param    puzzle - Puzzle object holding the initial board state
+#  param heuristic - Heuristic object guiding the search
+#  param    budget - Budget object limiting the search
+# return           - SolveResult if the board was unsolvable or too large, else None
+def check_batched_puzzle(puzzle: Puzzle, heuristic: Heuristic, budget: Budget) -> SolveResult | None:
+    if not puzzle.is_solvable():
+        print("\nNo solution found! Are you sure the puzzle was solvable?")
+        return SolveResult(UNSOLVABLE, None, budget.get_stats())
+
+    if puzzle.board_size > MAX_BATCHED_SIZE:
+        print(f"\nBatched solvers only support boards up to {MAX_BATCHED_SIZE}x{MAX_BATCHED_SIZE}, using IDA* instead.")
+        return solve_puzzle_ida(puzzle, heuristic, budget)
+
+    return None
+
+
+# Make the batched solvers available alongside the other solvers
+SOLVERS["Batched BFS"] = solve_puzzle_bfs
+SOLVERS["Batched Beam Search"] = solve_puzzle_beam
+SOLVERS["Batched BFIDA*"] = solve_puzzle_bfida
+OPTIMAL_SOLVERS.update((solve_puzzle_bfs, solve_puzzle_bfida))
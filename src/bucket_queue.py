@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+
+# Implementation of a bucket priority queue, for small non-negative integer priorities
+# Nodes with equal priority are popped newest first, which favours deeper nodes during a search
+# attr buckets - array of stacks of nodes, indexed by priority
+# attr min_key - lowest priority that may hold a node
+# attr  length - number of nodes in the queue
+class BucketQueue:
+    def __init__(self):
+        self.buckets = []
+        self.min_key = 0
+        self.length = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __bool__(self) -> bool:
+        return bool(self.length)
+
+    # Inserts a node into the queue
+    # param new_node - the node to be inserted
+    # param      key - non-negative integer priority of the node
+    def insert(self, new_node, key: int):
+        # Grow the bucket array to fit the new priority
+        if key >= len(self.buckets):
+            self.buckets.extend([] for _ in range(key - len(self.buckets) + 1))
+
+        self.buckets[key].append(new_node)
+        self.length += 1
+
+        if key < self.min_key:
+            self.min_key = key
+
+    # Removes and returns a node with the lowest priority
+    # return      None - if the queue is empty
+    # return root_node - node with the lowest priority
+    def pop_root(self):
+        if not self.length:
+            print("ERROR: Queue Empty! Nothing to pop.\n")
+            return None
+
+        # Skip past any buckets that have been emptied
+        while not self.buckets[self.min_key]:
+            self.min_key += 1
+
+        self.length -= 1
+        return self.buckets[self.min_key].pop()
+
+    # Returns the lowest priority in the queue without removing a node
+    # return None - if the queue is empty
+    # return  key - lowest priority held by a node
+    def peek_key(self) -> int | None:
+        if not self.length:
+            return None
+
+        while not self.buckets[self.min_key]:
+            self.min_key += 1
+
+        return self.min_key
+
+    # Clears the queue
+    def clear(self):
+        self.buckets.clear()
+        self.min_key = 0
+        self.length = 0
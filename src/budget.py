@@ -0,0 +1,204 @@
+from __future__ import annotations
+from sys import platform
+from threading import Event
+from time import perf_counter
+
+try:
+    from resource import RUSAGE_SELF, getrusage
+except ImportError:
+    getrusage = None
+
+# Local Dependencies
+from src.search_stats import SearchStats
+
+# Constants
+CHECK_INTERVAL = 1024       # Number of nodes expanded between checks of the cancellation token, clock, and memory
+PAGE_SIZE = 4096            # Size of a memory page reported by /proc [bytes]
+
+# Size of the unit ru_maxrss is reported in [bytes]
+MAXRSS_UNIT = 1 if platform == "darwin" else 1024
+
+# Outcomes of a search
+SOLVED = "solved"
+UNSOLVABLE = "unsolvable"
+CANCELLED = "cancelled"
+NODE_LIMIT = "node limit"
+TIME_LIMIT = "time limit"
+MEMORY_LIMIT = "memory limit"
+
+
+# Flag shared between a solver and the thread that started it, used to stop the solver early
+# attr event - Event that is set once the search has been cancelled
+class CancelToken:
+    def __init__(self):
+        self.event = Event()
+
+    # Requests that the search using this token stops as soon as possible
+    def cancel(self):
+        self.event.set()
+
+    def is_cancelled(self) -> bool:
+        return self.event.is_set()
+
+
+# Measures the memory held by this process and, on Linux, by a group of its child processes
+# Child processes that have already exited hold no memory, so they are skipped
+#  param   pids - process IDs of child processes to include
+# return memory - resident memory [bytes], or None if it cannot be measured on this platform
+def get_memory_usage(pids=()) -> int | None:
+    try:
+        with open("/proc/self/statm") as in_file:
+            memory = int(in_file.read().split()[1]) * PAGE_SIZE
+    except FileNotFoundError:
+        # Elsewhere fall back to the peak memory of this process, reported in kilobytes on Linux and bytes on macOS
+        if getrusage is None:
+            return None
+        return getrusage(RUSAGE_SELF).ru_maxrss * MAXRSS_UNIT
+
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/statm") as in_file:
+                memory += int(in_file.read().split()[1]) * PAGE_SIZE
+        except (FileNotFoundError, ProcessLookupError):
+            pass
+
+    return memory
+
+
+# Limits on the work a single search may do before giving up, and the statistics the search collects on the way
+# Solvers call expand() once per node, which only looks at the token, clock, and memory every CHECK_INTERVAL nodes
+# attr        token - CancelToken checked during the search, or None if the search cannot be cancelled
+# attr    max_nodes - largest number of nodes that may be expanded, or None for no limit
+# attr  max_seconds - longest time the search may run for [s], or None for no limit
+# attr   max_memory - most memory the search may add to the process [bytes], or None for no limit
+# attr        nodes - number of nodes expanded since the search started
+# attr   next_check - node count at which the limits are next checked
+# attr   start_time - perf_counter() value when the search started
+# attr start_memory - memory held by the process when the search started [bytes]
+# attr       status - limit that stopped the search, or None while within budget
+# attr         pids - process IDs of worker processes whose memory counts against the budget
+# attr      profile - indicates whether the search is profiled, see SearchStats
+# attr        stats - SearchStats object filled in by the current search
+# attr      tracing - indicates whether this budget started tracing memory allocations, and must stop it
+# attr     progress - function called with the budget every time the limits are checked, or None
+# attr    best_cost - f-cost bound of an optimal search, or lowest cost reached by a greedy one, or None if the solver
+#                     does not report one
+class Budget:
+    def __init__(self, token: CancelToken = None, max_nodes: int = None, max_seconds: float = None,
+                 max_memory: int = None, profile: bool = False):
+        self.token = token
+        self.max_nodes = max_nodes
+        self.max_seconds = max_seconds
+        self.max_memory = max_memory
+        self.profile = profile
+        self.stats = SearchStats(profile)
+        self.tracing = False
+        self.nodes = 0
+        self.next_check = self.get_next_check()
+        self.start_time = perf_counter()
+        self.start_memory = get_memory_usage() if max_memory is not None else None
+        self.status = None
+        self.pids = ()
+        self.progress = None
+        self.best_cost = None
+
+    # Budgets are handed to worker processes between searches, never while tracing memory, and without the progress
+    # function, which only reports from the process that started the search
+    def __getstate__(self) -> dict:
+        return {**self.__dict__, "tracing": False, "progress": None}
+
+    # Restarts the budget, so the same limits can be applied to another search
+    def start(self):
+        self.nodes = 0
+        self.status = None
+        self.pids = ()
+        self.best_cost = None
+        self.stats = SearchStats(self.profile)
+
+        # Peak memory is measured from the start of the search, even if something else is already tracing
+        # tracemalloc is only imported when profiling, as it pulls in several modules every other search does without
+        if self.profile:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                self.tracing = True
+
+        self.start_time = perf_counter()
+        self.start_memory = get_memory_usage() if self.max_memory is not None else None
+        self.next_check = self.get_next_check()
+
+    # Computes the node count at which the limits are next checked
+    def get_next_check(self) -> int:
+        next_check = self.nodes + CHECK_INTERVAL
+        return next_check if self.max_nodes is None else min(next_check, self.max_nodes + 1)
+
+    # Counts one expanded node
+    # return  True - if the search is still within budget
+    # return False - if the search should stop, with the reason held in status
+    def expand(self) -> bool:
+        self.nodes += 1
+        if self.nodes < self.next_check:
+            return True
+
+        return self.check()
+
+    # Checks every limit of the budget
+    # return  True - if the search is still within budget
+    # return False - if the search should stop, with the reason held in status
+    def check(self) -> bool:
+        self.next_check = self.get_next_check()
+
+        # Progress is reported first, so a progress function may cancel the search through the token
+        if self.progress is not None:
+            self.progress(self)
+
+        if self.token is not None and self.token.is_cancelled():
+            self.status = CANCELLED
+        elif self.max_nodes is not None and self.nodes > self.max_nodes:
+            self.status = NODE_LIMIT
+        elif self.max_seconds is not None and perf_counter() - self.start_time > self.max_seconds:
+            self.status = TIME_LIMIT
+        elif self.start_memory is not None and get_memory_usage(self.pids) - self.start_memory > self.max_memory:
+            self.status = MEMORY_LIMIT
+
+        return self.status is None
+
+    # Finishes the statistics of the search, called once the search is over
+    # return - SearchStats object of the search
+    def get_stats(self) -> SearchStats:
+        stats = self.stats
+        stats.expanded = self.nodes
+        stats.seconds = perf_counter() - self.start_time
+
+        if self.profile:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                stats.peak_memory = tracemalloc.get_traced_memory()[1]
+                if self.tracing:
+                    tracemalloc.stop()
+                    self.tracing = False
+
+        return stats
+
+
+# Outcome of a search, returned by every solver
+# attr status - SOLVED, UNSOLVABLE, or the limit that stopped the search
+# attr   node - Puzzle object holding the solution, or the most promising board reached if the search was stopped,
+#               linked to the initial board through its parents (None if the board was unsolvable)
+# attr  stats - SearchStats object of the search
+class SolveResult:
+    def __init__(self, status: str, node=None, stats: SearchStats = None):
+        self.status = status
+        self.node = node
+        self.stats = stats or SearchStats()
+
+        if self.is_solved() and node is not None:
+            self.stats.set_solution(node)
+
+    def __repr__(self) -> str:
+        return f"SolveResult({self.status!r}, {self.stats!r})"
+
+    def is_solved(self) -> bool:
+        return self.status == SOLVED
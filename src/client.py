@@ -0,0 +1,73 @@
+from __future__ import annotations
+from http.client import HTTPConnection, HTTPException
+from json import dumps, loads
+
+# Local Dependencies
+from src.server import DEFAULT_HOST, DEFAULT_PORT
+
+
+# Raised when the solver service answers a request with an error
+# attr status - HTTP status code of the response (400 invalid request, 503 too busy, 500 search failed)
+class ServiceError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+
+# Client of the local solver service, keeping a single connection open between requests
+# Each thread must use its own client, as a connection only carries one request at a time
+# attr connection - HTTPConnection to the service
+class SolverClient:
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, timeout: float | None = None):
+        self.connection = HTTPConnection(host, port, timeout=timeout)
+
+    def __enter__(self) -> SolverClient:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    # Sends a request, reconnecting once if the service closed the connection since the last request
+    #  param method - HTTP method
+    #  param   path - path of the endpoint
+    #  param   body - dictionary sent as JSON, or None
+    # return        - dictionary decoded from the response
+    def request(self, method: str, path: str, body: dict | None = None) -> dict:
+        data = None if body is None else dumps(body).encode()
+        headers = {} if body is None else {"Content-Type": "application/json"}
+
+        for attempt in range(2):
+            try:
+                self.connection.request(method, path, data, headers)
+                response = self.connection.getresponse()
+                break
+            except (HTTPException, ConnectionError):
+                self.connection.close()
+                if attempt:
+                    raise
+
+        result = loads(response.read())
+        if response.status != 200:
+            raise ServiceError(response.status, result.get("error", response.reason))
+        return result
+
+    # Solves a board
+    #  param     board - 2D board to solve
+    #  param    solver - name of the solver, or None for the service's default
+    #  param heuristic - name of the heuristic, or None for the service's default
+    #  param   timeout - longest time the search may take [s], or None for the service's limit
+    # return           - dictionary holding the status, moves, length, times, search statistics, and whether the
+    #                    search was shared with another request ("coalesced")
+    def solve(self, board: list[list[int]], solver: str | None = None, heuristic: str | None = None,
+              timeout: float | None = None) -> dict:
+        request = {"board": board, "solver": solver, "heuristic": heuristic, "timeout": timeout}
+        return self.request("POST", "/solve", {key: value for key, value in request.items() if value is not None})
+
+    def health(self) -> dict:
+        return self.request("GET", "/health")
+
+    def metrics(self) -> dict:
+        return self.request("GET", "/metrics")
@@ -3,6 +3,8 @@
 # http://inventwithpython.com/pygame/chapter4.html
 from __future__ import annotations
 
+from functools import partial
+
 # Do this before importing pygame to prevent the support prompt from being printed to the terminal
 from os import environ
 environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "True"
@@ -11,9 +13,13 @@ import pygame as pg
 from pygame.locals import *
 
 # Local Dependencies
+from src.anytime import solve_puzzle_anytime, solve_puzzle_weighted
 from src.button import Button, TextBox
+from src.parallel import solve_puzzle_parallel_ida
 from src.puzzle import *
-from src.thread import ThreadWithReturn
+from src.solution_cache import SOLUTION_CACHE
+from src.solve_process import STOP_TIMEOUT, SolveProcess
+from src.walking_distance import WALKING_DISTANCE
 
 # Constants
 FPS = 60                            # Target FPS for the game
@@ -35,11 +41,27 @@ INITIAL_GRID_SIZE = 4               # Grid size to use for puzzle when the game
 MIN_GRID_SIZE = 2                   # Minimum grid size allowed for puzzles
 MAX_GRID_SIZE = 128                 # Maximum grid size allowed for puzzles
 
+# Solver modes cycled through by the "Solver" button (button label, solver function, heuristic, time limit [s])
+SOLVER_MODES = (
+    ("Branch & Bound", solve_puzzle, MISPLACED_TILES, None),
+    ("IDA* (Optimal)", solve_puzzle_ida, LINEAR_CONFLICT, None),
+    ("IDA* + WD", solve_puzzle_ida, WALKING_DISTANCE, None),
+    ("Parallel IDA*", solve_puzzle_parallel_ida, WALKING_DISTANCE, None),
+    ("Weighted A* x2", partial(solve_puzzle_weighted, weight=2), MANHATTAN_DISTANCE, None),
+    ("Anytime A* 10s", solve_puzzle_anytime, MANHATTAN_DISTANCE, 10)
+)
+
 # In-Game Messages
 MSG_INSTRUCTIONS = "Click tiles next to empty space or press arrow keys to slide tiles."
 MSG_SEARCHING = "Finding Solution (this may take a while)"
+MSG_PROGRESS = "Finding Solution: {:,} nodes expanded{}, {:.1f} s"
+MSG_BEST_COST = ", best f = {}"
 MSG_SOLVED = "Solved! (Esc to close)"
 MSG_SOLVING = "Solving the game board"
+MSG_STOPPED = "Solver stopped early ({})"
+
+# Offset (x, y) of the step each tile takes when sliding in a direction
+SLIDE_OFFSETS = {UP: (0, -1), DOWN: (0, 1), LEFT: (-1, 0), RIGHT: (1, 0)}
 
 # Color mapping (R, G, B)
 COLORS = {
@@ -71,21 +93,24 @@ KEY_MAP = {
 # attr          display - Surface object of the entire screen
 # attr        fps_clock - Clock object used to help game run at desired FPS
 # attr           puzzle - Puzzle object used to hold the the puzzle information
-# attr    initial_board - 2D array representing the initial state of the game board before any input movements
+# attr    initial_state - packed initial state of the game board before any input movements
 # attr       board_size - length/width of the game board
 # attr        tile_size - size of the sliding game tiles
 # attr tile_slide_speed - number of pixels the tiles will slide each frame when animating their movement
 # attr        tile_font - Font object used to render the font on top of the sliding tiles
+# attr     tile_sprites - array of Surface objects of each numbered tile, indexed by its number, drawn with one blit
 # attr         x_margin - space between the sides of the screen and the game board in pixels
 # attr         y_margin - space between the top/bottom of the screen and the game board in pixels
 # attr       basic_font - Font object used to render text not on the tiles
 # attr      top_message - Rect object that is the size of the currently displayed message at the top of the screen
 # attr     move_counter - Rect object that is the size of the "number of moves" counter
 # attr      total_moves - number of moves used since the initial board state
-# attr     THREAD_solve - Thread object used to solve the puzzle concurrently
+# attr    solve_process - SolveProcess object solving the puzzle in a separate process, or None
 # attr          buttons - array of Button objects representing the in-game menu buttons
 # attr  active_text_box - current active text box that is handling user input
 # attr  next_board_size - user requested next board size that will be applied when "New Board" button is pressed
+# attr      solver_mode - index of the SOLVER_MODES entry used by the "Solve" button
+# attr      dirty_rects - array of Rect objects of the areas drawn since the screen was last updated
 class GraphicsEngine:
     def __init__(self):
         pg.init()
@@ -94,21 +119,24 @@ class GraphicsEngine:
         self.display = pg.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), RESIZABLE)
         self.fps_clock = pg.time.Clock()
         self.puzzle = Puzzle(size=INITIAL_GRID_SIZE)
-        self.initial_board = self.puzzle.board
+        self.initial_state = self.puzzle.state
         self.board_size = self.puzzle.board_size
         self.tile_size = 0
         self.tile_slide_speed = 0
         self.tile_font = None
+        self.tile_sprites = []
         self.x_margin = 0
         self.y_margin = 0
         self.basic_font = None
         self.top_message = None
         self.move_counter = None
         self.total_moves = 0
-        self.THREAD_solve = None
+        self.solve_process = None
         self.buttons = []
         self.active_text_box = None
         self.next_board_size = None
+        self.solver_mode = 0
+        self.dirty_rects = []
 
         self.prepare_grid()
         self.draw_display()
@@ -124,12 +152,40 @@ class GraphicsEngine:
         self.x_margin = (width - self.tile_size * self.board_size) // 2 - 1
         self.y_margin = (height - self.tile_size * self.board_size) // 2 - 1
 
+        self.build_tile_sprites()
         pg.display.set_caption(f"{self.board_size ** 2 - 1} Puzzle")
+
+    # Renders every numbered tile once for the current tile size, so drawing a tile is a single blit
+    # Called whenever the tile size can change, i.e. when the window is resized or the board size changes
+    def build_tile_sprites(self):
+        self.tile_sprites = [None]
+        center = (self.tile_size // 2, self.tile_size // 2)
+
+        for num in range(1, self.board_size ** 2):
+            sprite = pg.Surface((self.tile_size, self.tile_size))
+            sprite.fill(TILE_COLOR)
+            text_surf = self.tile_font.render(str(num), True, TEXT_COLOR)
+            sprite.blit(text_surf, text_surf.get_rect(center=center))
+            self.tile_sprites.append(sprite)
     
+    # Marks an area of the screen as changed, so it is pushed to the screen by the next update_display()
+    #  param rect - Rect object of the changed area
+    # return      - the same Rect object
+    def mark_dirty(self, rect: Rect) -> Rect:
+        self.dirty_rects.append(rect)
+        return rect
+
+    # Pushes the areas changed since the last update to the screen, doing nothing on frames where nothing changed
+    def update_display(self):
+        if self.dirty_rects:
+            pg.display.update(self.dirty_rects)
+            self.dirty_rects = []
+
     # Draws the base screen
     def draw_display(self):
         # Draw starting condition of the game
         self.display.fill(BG_COLOR)
+        self.mark_dirty(self.display.get_rect())
         self.draw_menu()
         self.draw_message(MSG_INSTRUCTIONS)
         self.draw_move_count()
@@ -171,8 +227,23 @@ class GraphicsEngine:
         text_box.args = (text_box,)
         self.draw_button(text_box)
 
-        # Flip screen here to prevent blank buttons while generating large puzzles
-        pg.display.flip()
+        top_edge += button_spacing + textbox_size[1]
+
+        # Draw label for the Solver button
+        rect = Rect(left_edge, top_edge, *button_size)
+        text = self.basic_font.render("Solver", True, TEXT_COLOR)
+        self.display.blit(text, text.get_rect(topleft=rect.topleft))
+
+        top_edge += button_spacing
+
+        # Draw the Solver button, which cycles through the available solver modes
+        rect = Rect(left_edge, top_edge, *button_size)
+        solver_button = Button(rect, BUTTON_COLOR, SOLVER_MODES[self.solver_mode][0], self.next_solver_mode)
+        solver_button.args = (solver_button,)
+        self.draw_button(solver_button)
+
+        # Update the screen here to prevent blank buttons while generating large puzzles
+        self.update_display()
 
     # Draws a given button to the screen
     # param button - Button object to be drawn
@@ -182,7 +253,7 @@ class GraphicsEngine:
         fill_color = color if color is not None else button.color
 
         self.display.fill(fill_color, button.rect)
-        pg.display.update(button.rect)
+        self.mark_dirty(button.rect)
 
         text = self.basic_font.render(button.text, True, BUTTON_TEXT_COLOR)
         self.display.blit(text, text.get_rect(center=button.rect.center))
@@ -190,20 +261,46 @@ class GraphicsEngine:
         if append:
             self.buttons.append(button)
 
-    # Called by the "Solve" button. Starts a new thread to solve the puzzle
+    # Called by the "Solve" button. Starts a new process to solve the puzzle, answered at once if the board is cached
     def find_solution(self):
-        if self.THREAD_solve is not None or self.puzzle.is_solution():
+        if self.solve_process is not None or self.puzzle.is_solution():
+            return
+
+        # Solve a copy of the board, so the user's moves cannot change it mid-search
+        _, solver, heuristic, seconds = SOLVER_MODES[self.solver_mode]
+        puzzle = Puzzle(state=self.puzzle.state, size=self.puzzle.board_size, heuristic=heuristic)
+
+        if (moves := SOLUTION_CACHE.lookup(puzzle, get_solver_bound(solver))[0]) is not None:
+            self.finish_solve(puzzle, SOLVED, moves)
             return
 
-        self.THREAD_solve = ThreadWithReturn(target=solve_puzzle, args=(self.puzzle,))
-        self.THREAD_solve.start()
+        self.solve_process = SolveProcess(solver, puzzle, heuristic, seconds)
         self.draw_message(MSG_SEARCHING)
 
+    # Plays back the solution of a finished solve, or reports why it stopped
+    #  param puzzle - Puzzle object holding the board the solve started from
+    #  param status - outcome of the solve
+    #  param  moves - array of moves solving the board, or None if the solve stopped without a solution
+    def finish_solve(self, puzzle: Puzzle, status: str, moves: list[int] | None):
+        if status != SOLVED:
+            self.draw_message(MSG_STOPPED.format(status))
+            return
+
+        self.solve_animation(puzzle, moves)
+        self.draw_message(MSG_SOLVED)
+
+    # Stops the solve in progress, if any
+    #  param timeout - time to wait for the solving process to exit before killing it [s], or None to not wait
+    def cancel_solve(self, timeout: float = None):
+        if self.solve_process is not None:
+            self.solve_process.cancel(timeout)
+            self.solve_process = None
+
     # Called by the "Reset" button. Resets the board back to its initial state
     def reset_puzzle(self):
-        self.THREAD_solve = None
+        self.cancel_solve()
 
-        self.puzzle.set_board(self.initial_board)
+        self.puzzle.set_state(self.initial_state)
         self.draw_board(self.puzzle.board)
 
         self.total_moves = 0
@@ -212,7 +309,7 @@ class GraphicsEngine:
 
     # Called by the "New Board" button. Generates and draws a new puzzle
     def new_puzzle(self):
-        self.THREAD_solve = None
+        self.cancel_solve()
 
         # If the user has requested a new board size, update the board size and redraw the display
         if self.next_board_size is not None and self.board_size != self.next_board_size:
@@ -222,13 +319,20 @@ class GraphicsEngine:
             self.prepare_grid()
 
         self.puzzle.generate(self.board_size)
-        self.initial_board = self.puzzle.board
+        self.initial_state = self.puzzle.state
         self.draw_board(self.puzzle.board)
 
         self.total_moves = 0
         self.draw_move_count()
         self.draw_message(MSG_INSTRUCTIONS)
 
+    # Called by the "Solver" button. Switches to the next solver mode
+    # param button - Button object that was clicked
+    def next_solver_mode(self, button: Button):
+        self.solver_mode = (self.solver_mode + 1) % len(SOLVER_MODES)
+        button.text = SOLVER_MODES[self.solver_mode][0]
+        self.draw_button(button, append=False)
+
     # Called when a text box is clicked, allows user input to be handled by the text box
     # param text_box - TextBox object that was clicked
     def set_active_text_box(self, text_box: TextBox):
@@ -252,34 +356,38 @@ class GraphicsEngine:
 
         # Redraw the text box in its inactive state
         self.draw_button(text_box, append=False)
-        pg.display.update(text_box.rect)
 
     # Main execution loop of the GUI
     def launch_gui(self):
         while True:
-            # Check if a solving Thread has been created and completed execution
-            if self.THREAD_solve is not None and not self.THREAD_solve.is_alive():
-                solved_puzzle = self.THREAD_solve.join()
-                self.solve_animation(solved_puzzle)
-                self.puzzle.set_board(solved_puzzle.board)
-                self.draw_message(MSG_SOLVED)
-                self.THREAD_solve = None
+            # Check if the solving process has reported progress or finished
+            if self.solve_process is not None:
+                solve, progress = self.solve_process, self.solve_process.progress
+
+                if solve.poll():
+                    self.solve_process = None
+                    status, moves = solve.result
+                    if status == SOLVED:
+                        SOLUTION_CACHE.put(solve.puzzle, moves, get_solver_bound(solve.solver))
+                    self.finish_solve(solve.puzzle, status, moves)
+                elif solve.progress is not progress:
+                    self.draw_progress(*solve.progress)
 
             # Call the event handler and check if user wants to make a valid move
             if (slide_to := self.event_handler()) and self.puzzle.is_valid_move(slide_to):
                 # Animate the tile slide and update our game board
                 self.slide_animation(slide_to)
-                self.puzzle.set_board(self.puzzle.move(slide_to))
+                self.puzzle.set_state(self.puzzle.move(slide_to))
 
                 if self.puzzle.is_solution():
                     self.draw_message(MSG_SOLVED)
-                elif self.THREAD_solve is None:
+                elif self.solve_process is None:
                     self.draw_message(MSG_INSTRUCTIONS)
 
                 self.total_moves += 1
                 self.draw_move_count()
 
-            pg.display.flip()
+            self.update_display()
             self.fps_clock.tick(FPS)
 
     # Handles and clears the event queue
@@ -292,6 +400,7 @@ class GraphicsEngine:
         # Look through each event in the queue
         for event in pg.event.get():
             if event.type == QUIT:
+                self.cancel_solve(STOP_TIMEOUT)
                 terminate()
 
             # User resized the screen
@@ -341,6 +450,7 @@ class GraphicsEngine:
             # User pressed a keyboard button
             elif event.type == KEYUP:
                 if event.key == K_ESCAPE:
+                    self.cancel_solve(STOP_TIMEOUT)
                     terminate()
 
                 # If no text box is active, get the slide_to direction for the keypress
@@ -360,37 +470,29 @@ class GraphicsEngine:
     # Animates a tile slide when the user requests a tile movement
     # param move - integer representing the direction the user wishes to move in
     def slide_animation(self, move: int):
-        if move == UP:
-            coord_mod = [0, -1]
-        elif move == DOWN:
-            coord_mod = [0, 1]
-        elif move == LEFT:
-            coord_mod = [-1, 0]
-        elif move == RIGHT:
-            coord_mod = [1, 0]
-        else:
+        if (coord_mod := SLIDE_OFFSETS.get(move)) is None:
             raise ValueError
 
         blank_y, blank_x = self.puzzle.blank_pos
         move_x, move_y = blank_x - coord_mod[0], blank_y - coord_mod[1]
+        num = self.puzzle.board[move_y][move_x]
 
-        # Prepare base surface used to erase tile as it is moving
-        base_surf = self.display.copy()
-        pg.draw.rect(base_surf, BG_COLOR, (*self.get_left_top(move_x, move_y), self.tile_size, self.tile_size))
+        # Only the spots the tile slides between change, so only they are erased and pushed to the screen
+        area = self.get_tile_rect(move_x, move_y).union(self.get_tile_rect(blank_x, blank_y))
 
         # Animate the tile slide
         for i in range(self.tile_slide_speed, self.tile_size, self.tile_slide_speed):
-            self.display.blit(base_surf, (0, 0))
-            self.draw_tile(move_x, move_y, self.puzzle.board[move_y][move_x], coord_mod[0] * i, coord_mod[1] * i)
+            self.display.fill(BG_COLOR, self.mark_dirty(area))
+            self.draw_tile(move_x, move_y, num, coord_mod[0] * i, coord_mod[1] * i)
 
-            pg.display.flip()
+            self.update_display()
             self.fps_clock.tick(FPS)
 
-        self.display.blit(base_surf, (0, 0))
-        self.draw_tile(blank_x, blank_y, self.puzzle.board[move_y][move_x])
-        pg.display.flip()
+        self.display.fill(BG_COLOR, self.mark_dirty(area))
+        self.draw_tile(blank_x, blank_y, num)
+        self.update_display()
 
-    # Draws a game board to the window
+    # Draws a game board to the window, marking the whole board as changed
     # param board - 2D array of integers representing the game board
     def draw_board(self, board: list):
         # Clear previous game board and draw the border
@@ -407,7 +509,7 @@ class GraphicsEngine:
     def clear_board(self) -> Rect:
         size = self.board_size * (self.tile_size + 1) + 2 * BORDER_WIDTH
         rect = Rect(self.x_margin - BORDER_WIDTH, self.y_margin - BORDER_WIDTH, size, size)
-        pg.draw.rect(self.display, BG_COLOR, rect)
+        pg.draw.rect(self.display, BG_COLOR, self.mark_dirty(rect))
 
         return rect
 
@@ -420,7 +522,7 @@ class GraphicsEngine:
         # Check if the Rect of any tile collides with the spot clicked
         for tile_y in range(self.board_size):
             for tile_x in range(self.board_size):
-                if pg.Rect(*self.get_left_top(tile_x, tile_y), self.tile_size, self.tile_size).collidepoint(x, y):
+                if self.get_tile_rect(tile_x, tile_y).collidepoint(x, y):
                     return tile_x, tile_y
 
         return None
@@ -431,6 +533,12 @@ class GraphicsEngine:
     def get_left_top(self, x: int, y: int) -> tuple[int, int]:
         return self.x_margin + (x * self.tile_size) + x, self.y_margin + (y * self.tile_size) + y
 
+    # Returns the Rect object of the spot a tile is drawn in
+    # param x - horizontal grid coordinate of the tile
+    # param y - vertical grid coordinate of the tile
+    def get_tile_rect(self, x: int, y: int) -> Rect:
+        return Rect(*self.get_left_top(x, y), self.tile_size, self.tile_size)
+
     # Draws a given tile onto the screen
     # param     x - horizontal grid coordinate of the tile
     # param     y - vertical grid coordinate of the tile
@@ -439,35 +547,38 @@ class GraphicsEngine:
     # param adj_y - number of pixels to offset the vertical position of the tile
     def draw_tile(self, x: int, y: int, num: int, adj_x: int = 0, adj_y: int = 0):
         left, top = self.get_left_top(x, y)
-
-        pg.draw.rect(self.display, TILE_COLOR, (left + adj_x, top + adj_y, self.tile_size, self.tile_size))
-        text_surf = self.tile_font.render(str(num), True, TEXT_COLOR)
-        text_rect = text_surf.get_rect(center=(left + self.tile_size // 2 + adj_x, top + self.tile_size // 2 + adj_y))
-
-        self.display.blit(text_surf, text_rect)
+        self.display.blit(self.tile_sprites[num], (left + adj_x, top + adj_y))
 
     # Draws a given message at the top of the screen
     # param msg - string of text to display
     def draw_message(self, msg: str):
         if self.top_message is not None:
-            pg.draw.rect(self.display, BG_COLOR, self.top_message)
+            pg.draw.rect(self.display, BG_COLOR, self.mark_dirty(self.top_message))
 
         text_surf, text_rect = self.make_text(msg, TEXT_COLOR, BG_COLOR, *TOP_MESSAGE_OFFSET)
         self.display.blit(text_surf, text_rect)
 
-        self.top_message = text_rect
+        self.top_message = self.mark_dirty(text_rect)
+
+    # Draws the progress of the solve in progress as the top message
+    #  param     nodes - number of nodes expanded so far
+    #  param best_cost - f-cost bound or lowest cost reached by the search, or None if the solver does not report one
+    #  param   seconds - time since the search started [s]
+    def draw_progress(self, nodes: int, best_cost: int | None, seconds: float):
+        best_cost = MSG_BEST_COST.format(best_cost) if best_cost is not None else ""
+        self.draw_message(MSG_PROGRESS.format(nodes, best_cost, seconds))
 
     # Draws the "Total Moves" counter
     def draw_move_count(self):
         if self.move_counter is not None:
-            pg.draw.rect(self.display, BG_COLOR, self.move_counter)
+            pg.draw.rect(self.display, BG_COLOR, self.mark_dirty(self.move_counter))
 
         message_str = f"Total Moves: {str(self.total_moves)}"
         top_left = TOP_MESSAGE_OFFSET[0], self.basic_font.get_height() + TOP_MESSAGE_OFFSET[1] + TOTAL_MOVES_OFFSET
         text_surf, text_rect = self.make_text(message_str, TEXT_COLOR, BG_COLOR, *top_left)
         self.display.blit(text_surf, text_rect)
 
-        self.move_counter = text_rect
+        self.move_counter = self.mark_dirty(text_rect)
 
     # Creates Surface and Rect objects for a given string
     #  param                 text - string to render
@@ -483,29 +594,42 @@ class GraphicsEngine:
 
         return text_surf, text_rect
 
-    # Animates the solution path of a puzzle
-    # param node - Puzzle object holding the solved puzzle
-    def solve_animation(self, node: Puzzle):
+    # Animates the solution path of a puzzle, leaving the game board solved
+    # param puzzle - Puzzle object holding the board the solution starts from
+    # param  moves - array of moves solving the board
+    def solve_animation(self, puzzle: Puzzle, moves: list[int]):
+        board = [row.copy() for row in puzzle.board]
+        blank_y, blank_x = puzzle.blank_pos
+        self.draw_message(MSG_SOLVING)
+        self.draw_board(board)
 
-        # Build the path from solution to initial board state
-        path = [node]
-        while node.parent:
-            node = node.parent
-            path.append(node)
+        # Each move only changes the spots the tile leaves and enters, so only they are drawn and pushed to the screen
+        # The moves are played on a plain board, as updating the Puzzle object recomputes its cost and inversions
+        for direction in moves:
+            move_x, move_y = blank_x - SLIDE_OFFSETS[direction][0], blank_y - SLIDE_OFFSETS[direction][1]
+            board[blank_y][blank_x], board[move_y][move_x] = board[move_y][move_x], 0
 
-        self.draw_message(MSG_SOLVING)
+            self.display.fill(BG_COLOR, self.mark_dirty(self.get_tile_rect(move_x, move_y)))
+            self.draw_tile(blank_x, blank_y, board[blank_y][blank_x])
+            self.mark_dirty(self.get_tile_rect(blank_x, blank_y))
+            blank_x, blank_y = move_x, move_y
 
-        # Draw each board in the solution path in reverse order
-        for i in range(len(path) - 1, -1, -1):
-            self.draw_board(path[i].board)
             self.total_moves += 1
             self.draw_move_count()
-            pg.display.flip()
+            self.update_display()
             self.fps_clock.tick(FPS)
+
+            # Redraw the whole board if the window was resized, as the resize draws the board from before the solve
+            grid = self.tile_size, self.x_margin, self.y_margin
             self.event_handler(False)
+            if (self.tile_size, self.x_margin, self.y_margin) != grid:
+                self.draw_board(board)
+
+        self.puzzle.set_board(board)
 
 
 # Terminates the GUI
 def terminate():
+    SOLUTION_CACHE.close()
     pg.quit()
     exit('\nProgram Quit... Good Bye!')
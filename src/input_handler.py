@@ -1,6 +1,11 @@
+from __future__ import annotations
+from functools import partial
 from os import getcwd
 from sys import platform
-from typing import TextIO
+from typing import Iterator, TextIO
+
+# Local Dependencies
+from src.budget import Budget
 
 if platform == "win32":
     TEST_DIR = f"{getcwd()}\\test_boards\\"
@@ -30,6 +35,86 @@ def get_int_from_user(prompt: str, min_val: int = None, max_val: int = None) ->
             return usr_inp
 
 
+# Retrieves a valid number from the user
+#   param prompt - string used to prompt the user for input
+#  param min_val - minimum value of the number
+# return usr_inp - a valid number no less than the minimum
+def get_float_from_user(prompt: str, min_val: float = None) -> float:
+    # Repeatedly prompt user for input until they input a valid number within the required range
+    while True:
+        try:
+            usr_inp = float(input(f"\n{prompt}\n$ "))
+        except ValueError:
+            print("\nERROR: Please enter a valid number.")
+            continue
+
+        if min_val is not None and usr_inp < min_val:
+            print(f"Please enter a value of at least {min_val}")
+        else:
+            return usr_inp
+
+
+# Retrieves one of several named options from the user
+#   param prompt - string used to prompt the user for input
+#  param options - dictionary mapping the name of each option to its value
+# return         - value of the option selected by the user
+def get_option_from_user(prompt: str, options: dict):
+    return get_named_option_from_user(prompt, options)[1]
+
+
+# Retrieves one of several named options from the user, along with its name
+#   param prompt - string used to prompt the user for input
+#  param options - dictionary mapping the name of each option to its value
+# return         - (name, value) of the option selected by the user
+def get_named_option_from_user(prompt: str, options: dict) -> tuple[str, object]:
+    names = list(options)
+    menu = '\n'.join(f"{i}. {name}" for i, name in enumerate(names, 1))
+    name = names[get_int_from_user(f"{prompt}\n{menu}", 1, len(names)) - 1]
+
+    return name, options[name]
+
+
+# Asks the user for the settings of a solver that has any, e.g. the weight of weighted A*, and whether to profile it
+#   param solver - solver function selected by the user
+# return  solver - solver function with the chosen settings applied
+# return settings - name of the chosen settings, e.g. "weight 1.5, profiled", or "default" when there are none
+def get_solver_settings(solver) -> tuple[object, str]:
+    # Imported here, so the solver modules are only loaded by the options that solve boards
+    from src.anytime import solve_puzzle_anytime, solve_puzzle_weighted
+
+    seconds = None
+    settings = []
+
+    if solver is solve_puzzle_weighted:
+        weight = get_float_from_user("Enter a weight (solutions cost at most weight x optimal)", 1)
+        solver = partial(solver, weight=weight)
+        settings.append(f"weight {weight:g}")
+    elif solver is solve_puzzle_anytime:
+        seconds = get_float_from_user("Enter a time limit in seconds (0 for no limit)", 0) or None
+        settings.append("no limit" if seconds is None else f"{seconds:g} s limit")
+
+    profile = get_int_from_user("1. Count nodes only\n2. Also profile time spent on moves, heuristic, queue, "
+                                "and peak memory (slower)", 1, 2) == 2
+    if profile:
+        settings.append("profiled")
+
+    if seconds is not None or profile:
+        solver = partial(solver, budget=Budget(max_seconds=seconds, profile=profile))
+    return solver, ", ".join(settings) or "default"
+
+
+# Finds one of several named options from a name given on the command line, ignoring case
+#  param    name - name given on the command line
+#  param options - dictionary mapping the name of each option to its value
+# return         - (name, value) of the match
+def find_option(name: str, options: dict) -> tuple[str, object]:
+    for key, value in options.items():
+        if key.lower() == name.lower():
+            return key, value
+
+    raise SystemExit(f"ERROR: Unknown name '{name}', choose from: {', '.join(options)}")
+
+
 # Builds a game board from an input file
 # return - 2D array of integers representing the input board state
 def get_board_from_file() -> list:
@@ -58,3 +143,55 @@ def open_board_file() -> TextIO:
             return open(f"{TEST_DIR}{usr_inp}")
         except FileNotFoundError:
             print(f"\nERROR: Unable to open {TEST_DIR}{usr_inp}")
+
+
+# Reads every board of a file in the test_boards format, extended to hold several boards separated by blank lines
+# The file is read a line at a time and each board is yielded as soon as it ends, so files of any length can be read
+# Lines starting with # are comments and are skipped
+#  param in_file - text file (or stream) to read
+# return         - generator of (line number the board starts on, 2D board or None, error message or None)
+def read_boards(in_file: TextIO) -> Iterator[tuple[int, list[list[int]] | None, str | None]]:
+    lines, start = [], 0
+
+    for number, line in enumerate(in_file, 1):
+        if line.lstrip().startswith('#'):
+            continue
+
+        if line.strip():
+            if not lines:
+                start = number
+            lines.append(line)
+        elif lines:
+            yield start, *parse_board(lines)
+            lines = []
+
+    if lines:
+        yield start, *parse_board(lines)
+
+
+# Parses the lines of a single board, checking that it is square and holds each tile exactly once
+#  param lines - lines of whitespace separated integers, one per row of the board
+# return board - 2D board, or None if the lines do not hold a valid board
+# return error - message describing why the board is not valid, or None if it is
+def parse_board(lines: list[str]) -> tuple[list[list[int]] | None, str | None]:
+    try:
+        board = [[int(tile) for tile in line.split()] for line in lines]
+    except ValueError:
+        return None, "board is not a grid of integers"
+
+    if (error := check_board(board)) is not None:
+        return None, error
+    return board, None
+
+
+# Checks that a board is square and holds each tile exactly once
+#  param board - 2D array of integers
+# return       - message describing why the board is not valid, or None if it is
+def check_board(board: list[list[int]]) -> str | None:
+    size = len(board)
+    if not size or any(len(row) != size for row in board):
+        return f"board has {size} rows, but not {size} tiles in every row"
+    if sorted(tile for row in board for tile in row) != list(range(size ** 2)):
+        return f"board does not hold each tile 0 to {size ** 2 - 1} exactly once"
+
+    return None
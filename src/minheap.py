@@ -14,10 +14,13 @@ def get_right(i) -> int:
 
 
 # Implementation of a Min Heap data structure
+# Each node is stored alongside a precomputed key (e.g. a tuple), so ordering never calls back into the node objects
 # attr nodes - underlying array that holds each node in the heap
+# attr  keys - array holding the key of each node, at the same index as the node
 class MinHeap:
     def __init__(self):
         self.nodes = []
+        self.keys = []
 
     def __len__(self) -> int:
         return len(self.nodes)
@@ -30,37 +33,46 @@ class MinHeap:
     # param b - second index
     def swap(self, a, b):
         self.nodes[a], self.nodes[b] = self.nodes[b], self.nodes[a]
+        self.keys[a], self.keys[b] = self.keys[b], self.keys[a]
 
-    # Recursive function that ensures the order property of our min heap
+    # Ensures the order property of our min heap by moving a node down the tree
+    # The node is held aside while smaller children are shifted up into its place, so each level costs one copy
     # param index - index of the element that is potentially in the wrong place
     def heapify(self, index: int):
-        left = get_left(index)
-        right = get_right(index)
-        smallest = index
+        nodes, keys = self.nodes, self.keys
+        node, key = nodes[index], keys[index]
+        length = len(keys)
 
-        # Determine which of the three nodes has the smallest frequency
-        if left < len(self.nodes) and self.nodes[left] < self.nodes[smallest]:
-            smallest = left
-        if right < len(self.nodes) and self.nodes[right] < self.nodes[smallest]:
-            smallest = right
+        while (smallest := get_left(index)) < length:
+            # Determine which of the two children has the smallest key
+            right = smallest + 1
+            if right < length and keys[right] < keys[smallest]:
+                smallest = right
 
-        # Swap node at index with the smallest node, and make a recursive call
-        if smallest != index:
-            self.swap(index, smallest)
-            self.heapify(smallest)
+            if not keys[smallest] < key:
+                break
+
+            nodes[index], keys[index] = nodes[smallest], keys[smallest]
+            index = smallest
+
+        nodes[index], keys[index] = node, key
 
     # Inserts a node into the min heap
     # param new_node - the node to be inserted
-    def insert(self, new_node):
-        i = len(self.nodes)
-        j = get_parent(i)
-        self.nodes.append(new_node)
+    # param      key - priority of the node, defaults to comparing the nodes themselves
+    def insert(self, new_node, key=None):
+        nodes, keys = self.nodes, self.keys
+        key = new_node if key is None else key
+        i = len(nodes)
+        nodes.append(new_node)
+        keys.append(key)
 
         # Move the new node up the tree ensuring the heap satisfies the order property
-        while i and self.nodes[i] < self.nodes[j]:
-            self.swap(i, j)
+        while i and key < keys[j := get_parent(i)]:
+            nodes[i], keys[i] = nodes[j], keys[j]
             i = j
-            j = get_parent(i)
+
+        nodes[i], keys[i] = new_node, key
 
     # Removes and returns the root node of the heap
     # return      None - if the heap is empty
@@ -70,15 +82,25 @@ class MinHeap:
             print("ERROR: Heap Empty! Nothing to pop.\n")
             return None
 
-        if len(self.nodes) == 1:
-            return self.nodes.pop(0)
+        root_node = self.nodes[0]
 
-        root_node = self.nodes.pop(0)
-        self.nodes.insert(0, self.nodes.pop())
-        self.heapify(0)
+        # Move the last node to the root, then let it sink back down the tree
+        last_node = self.nodes.pop()
+        last_key = self.keys.pop()
+        if self.nodes:
+            self.nodes[0] = last_node
+            self.keys[0] = last_key
+            self.heapify(0)
 
         return root_node
 
+    # Returns the key of the root node without removing it
+    # return  None - if the heap is empty
+    # return   key - priority of the root node
+    def peek_key(self):
+        return self.keys[0] if self.keys else None
+
     # Clears the heap
     def clear(self):
         self.nodes.clear()
+        self.keys.clear()
@@ -0,0 +1,482 @@
+from __future__ import annotations
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from math import inf
+from multiprocessing import Array, Event, Process, Queue, Value
+from os import cpu_count
+from queue import Empty
+from time import sleep
+
+# Local Dependencies
+from src.budget import SOLVED, UNSOLVABLE, Budget, SolveResult
+from src.bucket_queue import BucketQueue
+from src.puzzle import (MANHATTAN_DISTANCE, OPPOSITE, OPTIMAL_SOLVERS, SOLVERS, Heuristic, PackedTiles, Puzzle,
+                        apply_moves, get_neighbors, pack_board)
+from src.state_table import HASH_MASK, HASH_MULTIPLIER
+
+# Constants
+TASKS_PER_WORKER = 16       # Number of subtrees handed out per worker, so idle workers can pick up remaining work
+MAX_SPLIT_DEPTH = 12        # Deepest ply the initial frontier is expanded to before the subtrees are handed out
+STOP_CHECK_NODES = 4096     # Number of nodes a worker expands between checks for a solution found by another worker
+BATCH_SIZE = 256            # Number of nodes collected for another worker before they are sent as one message
+POLL_NODES = 32             # Number of nodes a worker expands between checks of its inbox
+POLL_INTERVAL = 0.01        # Time between the coordinator's checks for termination and of its budget [s]
+NO_COST = 0xFFFF            # Shared incumbent cost until a solution is found
+
+# Kinds of message sent to a hash distributed A* worker
+NODES = 0                   # Batch of (state, blank, g, h, parent state, direction) nodes owned by the worker
+PARENT = 1                  # Request for the (parent state, direction) of a state owned by the worker
+STOP = 2                    # Request for the worker to exit
+CLOSEST = 3                 # Request for the (h, state) of the lowest h state the worker has reached
+
+# Statistics each hash distributed A* worker publishes, as offsets into its slice of the shared counts
+EXPANDED = 0                # Number of nodes expanded
+GENERATED = 1               # Number of children generated
+DUPLICATES = 2              # Number of nodes dropped as repeats of a state already reached at least as cheaply
+FRONTIER = 3                # Number of nodes in the worker's frontier
+CLOSED = 4                  # Number of states the worker holds g-costs for
+COUNTS = 5                  # Number of statistics published by each worker
+
+# Per-process state of a worker, set once when the worker starts
+worker_heuristic = None
+worker_stop = None
+
+
+# Stores the state shared by every task a worker runs
+#  param heuristic - admissible Heuristic object used to bound each iteration
+#  param      stop - Event set once any worker has found a solution
+def init_worker(heuristic: Heuristic, stop):
+    global worker_heuristic, worker_stop
+    worker_heuristic, worker_stop = heuristic, stop
+
+
+# Depth first search of a single subtree, bounded by an f-cost, for one iteration of a parallel IDA* search
+#  param   tiles - flat row-major tuple of tile values at the root of the subtree
+#  param    size - length/width of the game board
+#  param   blank - index of the blank tile at the root of the subtree
+#  param       g - number of moves taken to reach the root of the subtree
+#  param       h - heuristic cost of the root of the subtree
+#  param    last - direction of the move that led to the root of the subtree
+#  param   bound - largest f-cost searched in this iteration
+# return minimum - smallest f-cost that exceeded the bound, or inf if the subtree was solved or abandoned
+# return    path - directions leading from the root of the subtree to the solution, or None if none was found
+# return   nodes - number of nodes expanded, used to split the largest subtrees for the next iteration
+# return generated - number of children generated
+def search_subtree(tiles: tuple, size: int, blank: int, g: int, h: int, last: int | None,
+                   bound: int) -> tuple[int | float, list[int] | None, int, int]:
+    heuristic, stop = worker_heuristic, worker_stop
+    tiles = list(tiles)
+    neighbors = get_neighbors(size)
+    path = []
+    nodes = generated = 0
+    stopped = False
+
+    # Returns -1 once solved (or once another worker has solved the puzzle), else the smallest f-cost over the bound
+    def search(blank: int, g: int, h: int, last: int | None) -> int:
+        nonlocal nodes, generated, stopped
+        if (f := g + h) > bound:
+            return f
+
+        if not h:
+            return -1
+
+        # Poll the shared event only occasionally, as checking it is far slower than expanding a node
+        nodes += 1
+        if not nodes % STOP_CHECK_NODES and stop.is_set():
+            stopped = True
+            return -1
+
+        generated += len(neighbors[blank]) - (last is not None)
+
+        minimum = inf
+        for direction, src in neighbors[blank]:
+            if direction == OPPOSITE.get(last):
+                continue
+
+            tile = tiles[src]
+            child_h = heuristic.update(h, tiles, size, tile, src, blank)
+
+            tiles[blank], tiles[src] = tile, 0
+            path.append(direction)
+            result = search(src, g + 1, child_h, direction)
+            if result == -1:
+                return result
+            path.pop()
+            tiles[src], tiles[blank] = tile, 0
+
+            minimum = min(minimum, result)
+
+        return minimum
+
+    if (result := search(blank, g, h, last)) != -1:
+        return result, None, nodes, generated
+
+    return inf, None if stopped else path, nodes, generated
+
+
+# Expands a frontier node by one ply, skipping the move that undoes the one leading to it
+#  param      node - (tiles, blank, g, h, last direction, moves from the initial board) of the frontier node
+#  param      size - length/width of the game board
+#  param heuristic - Heuristic object used to score the children
+# return  children - frontier nodes one move deeper than the given node
+def expand_node(node: tuple, size: int, heuristic: Heuristic) -> list[tuple]:
+    tiles, blank, g, h, last, moves = node
+    children = []
+
+    for direction, src in get_neighbors(size)[blank]:
+        if direction == OPPOSITE.get(last):
+            continue
+
+        tile = tiles[src]
+        child_h = heuristic.update(h, tiles, size, tile, src, blank)
+        child_tiles = list(tiles)
+        child_tiles[blank], child_tiles[src] = tile, 0
+        children.append((tuple(child_tiles), src, g + 1, child_h, direction, moves + (direction,)))
+
+    return children
+
+
+# Iterative deepening A* search, with the subtrees below the first few plies searched across a pool of processes
+# Each iteration hands out many more subtrees than there are workers, largest first, so a worker that finishes early
+# picks up the remaining subtrees. Subtrees that took a large share of the previous iteration are split into their
+# children before the next one, and every worker stops once any of them finds a solution within the bound
+# Statistics count the work of every worker, with the subtrees handed out in an iteration as the frontier, but only
+# the work of this process is profiled
+#  param    puzzle - Puzzle object holding the initial board state
+#  param heuristic - admissible Heuristic object used to bound each iteration
+#  param    budget - Budget object limiting the search, with nodes counted as each subtree finishes
+#  param   workers - number of worker processes, defaults to the number of CPUs
+# return           - SolveResult holding the solution, or the lowest cost subtree root if the budget ran out
+def solve_puzzle_parallel_ida(puzzle: Puzzle, heuristic: Heuristic = MANHATTAN_DISTANCE, budget: Budget = None,
+                              workers: int = None) -> SolveResult:
+    budget = budget or Budget()
+    budget.start()
+
+    if not puzzle.is_solvable():
+        print("\nNo solution found! Are you sure the puzzle was solvable?")
+        return SolveResult(UNSOLVABLE, None, budget.get_stats())
+
+    size = puzzle.board_size
+    workers = workers or cpu_count() or 1
+    target = workers * TASKS_PER_WORKER
+    tiles = tuple(puzzle.get_tiles())
+    frontier = [(tiles, tiles.index(0), 0, heuristic.evaluate(tiles, size), None, ())]
+
+    # Expand the first plies breadth first, so the first solution met is also the shortest
+    for _ in range(MAX_SPLIT_DEPTH):
+        for node in frontier:
+            if not node[3]:
+                return SolveResult(SOLVED, apply_moves(puzzle, node[5], heuristic), budget.get_stats())
+
+        if len(frontier) >= target:
+            break
+        frontier = [child for node in frontier for child in expand_node(node, size, heuristic)]
+
+    bound = frontier[0][3] if len(frontier) == 1 else min(node[2] + node[3] for node in frontier)
+    budget.best_cost = bound
+    work = {node: 0 for node in frontier}
+    stop = Event()
+    stats = budget.stats
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(heuristic, stop)) as executor:
+        while True:
+            # Subtrees that already exceed the bound at their root need not be handed out
+            minimum = inf
+            jobs = {}
+            for node in sorted(work, key=work.get, reverse=True):
+                if (f := node[2] + node[3]) > bound:
+                    minimum = min(minimum, f)
+                    work[node] = 0
+                else:
+                    tiles, blank, g, h, last, _ = node
+                    jobs[executor.submit(search_subtree, tiles, size, blank, g, h, last, bound)] = node
+
+            stats.add_sizes(len(jobs))
+            pending = set(jobs)
+            while pending:
+                done, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+
+                for job in done:
+                    result, path, nodes, generated = job.result()
+                    node = jobs[job]
+                    budget.nodes += nodes
+                    stats.generated += generated
+
+                    if path is not None:
+                        stop.set()
+                        for other in pending:
+                            other.cancel()
+                        return SolveResult(SOLVED, apply_moves(puzzle, node[5] + tuple(path), heuristic),
+                                           budget.get_stats())
+
+                    work[node] = nodes
+                    minimum = min(minimum, result)
+
+                if not budget.check():
+                    stop.set()
+                    for other in pending:
+                        other.cancel()
+                    best = min(work, key=lambda node: node[3])
+                    return SolveResult(budget.status, apply_moves(puzzle, best[5], heuristic), budget.get_stats())
+
+            # Split the subtrees that did more than their share of the work, as they will grow the most next time
+            share = sum(work.values()) / target
+            split = {}
+            for node, nodes in work.items():
+                if nodes > share:
+                    split.update((child, nodes // 3) for child in expand_node(node, size, heuristic))
+                else:
+                    split[node] = nodes
+            work = split
+
+            bound = budget.best_cost = minimum
+
+
+# Finds the worker that owns a board state, spreading states evenly over the workers by their hash
+# The hash of an int depends on every bit of it (it is the int modulo 2^61 - 1) and is the same in every process, so
+# states wider than 64 bits (5x5 boards) are spread by all of their tiles
+#  param   state - integer holding a packed board state
+#  param workers - number of worker processes
+# return         - index of the worker owning the state
+def get_owner(state: int, workers: int) -> int:
+    return ((hash(state) * HASH_MULTIPLIER) & HASH_MASK) * workers >> 64
+
+
+# Runs one worker of a hash distributed A* search, expanding only the states it owns
+# Children owned by other workers are sent to them in batches, and every batch sent or received is counted so that
+# the coordinator can tell when no work is left anywhere
+#  param     index - index of this worker
+#  param   inboxes - message queue of each worker
+#  param   replies - queue the coordinator receives parent links on
+#  param      sent - shared count of batches sent by each worker (and, in the last slot, by the coordinator)
+#  param  received - shared count of batches received by each worker
+#  param    counts - shared statistics of each worker, COUNTS values per worker, published as it checks its inbox
+#  param      idle - shared flag of each worker, set while the worker has nothing to expand
+#  param      best - shared cost of the best solution found so far
+#  param heuristic - admissible Heuristic object guiding the search
+#  param      size - length/width of the game board
+#  param      bits - number of bits holding each tile of a packed state
+def run_hda_worker(index: int, inboxes: list, replies, sent, received, counts, idle, best, heuristic: Heuristic,
+                   size: int, bits: int):
+    workers = len(inboxes)
+    mask = (1 << bits) - 1
+    neighbors = get_neighbors(size)
+    live_nodes = BucketQueue()
+    costs = {}
+    parents = {}
+    outboxes = [[] for _ in range(workers)]
+    expanded = generated = duplicates = 0
+    closest = None
+
+    # Publishes this worker's statistics to the coordinator
+    def publish():
+        base = index * COUNTS
+        counts[base + EXPANDED], counts[base + GENERATED], counts[base + DUPLICATES] = expanded, generated, duplicates
+        counts[base + FRONTIER], counts[base + CLOSED] = len(live_nodes), len(costs)
+
+    # Sends the nodes collected for another worker
+    def flush(owner: int):
+        sent[index] += 1
+        inboxes[owner].put((NODES, outboxes[owner]))
+        outboxes[owner] = []
+
+    # Adds a node to this worker's frontier if it reaches its state more cheaply than before
+    def add_node(state: int, blank: int, g: int, h: int, parent: int | None, direction: int | None):
+        nonlocal duplicates, closest
+        if g >= costs.get(state, inf):
+            duplicates += 1
+            return
+
+        costs[state] = g
+        parents[state] = None if parent is None else (parent, direction)
+        if closest is None or h < closest[0]:
+            closest = (h, state)
+
+        # Every heuristic is zero only on the solution board
+        if not h:
+            with best.get_lock():
+                best.value = min(best.value, g)
+        elif g + h < best.value:
+            live_nodes.insert((state, blank, g, h), g + h)
+
+    # Handles one message, returning False once the worker should exit
+    def handle(message: tuple) -> bool:
+        if message[0] == NODES:
+            idle[index] = 0
+            received[index] += 1
+            for node in message[1]:
+                add_node(*node)
+        elif message[0] == PARENT:
+            replies.put(parents[message[1]])
+        elif message[0] == CLOSEST:
+            replies.put(closest)
+        else:
+            # Batches still queued for stopped workers are dropped, rather than blocking this process from exiting
+            for inbox in inboxes:
+                inbox.cancel_join_thread()
+            return False
+
+        return True
+
+    popped = 0
+    while True:
+        # Only block on the inbox once every remaining node is too costly to improve on the best solution
+        if not live_nodes or live_nodes.peek_key() >= best.value:
+            for owner in range(workers):
+                if outboxes[owner]:
+                    flush(owner)
+
+            publish()
+            idle[index] = 1
+            if not handle(inboxes[index].get()):
+                return
+            continue
+
+        popped += 1
+        if not popped % POLL_NODES:
+            publish()
+            try:
+                while True:
+                    if not handle(inboxes[index].get_nowait()):
+                        return
+            except Empty:
+                pass
+
+        state, blank, g, h = live_nodes.pop_root()
+        if g > costs[state] or g + h >= best.value:
+            continue
+
+        expanded += 1
+        generated += len(neighbors[blank])
+        tiles = PackedTiles(state, size, bits) if heuristic.needs_tiles else None
+        for direction, src in neighbors[blank]:
+            tile = (state >> (src * bits)) & mask
+            child = state + (tile << (blank * bits)) - (tile << (src * bits))
+            node = (child, src, g + 1, heuristic.update(h, tiles, size, tile, src, blank), state, direction)
+
+            if (owner := get_owner(child, workers)) == index:
+                add_node(*node)
+            else:
+                outboxes[owner].append(node)
+                if len(outboxes[owner]) >= BATCH_SIZE:
+                    flush(owner)
+
+
+# Hash distributed A* search (HDA*), which finds an optimal solution using the memory of several processes
+# Each worker owns the states that hash to it, keeping their frontier and best g-costs, and sends every child it
+# generates to the child's owner. The search ends once every worker is idle and no batch is still in flight, which
+# the coordinator confirms with two matching snapshots of the shared counters, then the solution path is rebuilt by
+# asking the owner of each state for its parent. If the budget runs out first, the path to the lowest h state any
+# worker has reached is rebuilt the same way
+#  param    puzzle - Puzzle object holding the initial board state
+#  param heuristic - admissible Heuristic object guiding the search
+#  param    budget - Budget object limiting the search, with nodes, memory, and statistics summed over every worker,
+#                    though only the work of this process is profiled
+#  param   workers - number of worker processes, defaults to the number of CPUs
+# return           - SolveResult holding the solution, or the board closest to it if the budget ran out
+def solve_puzzle_hda(puzzle: Puzzle, heuristic: Heuristic = MANHATTAN_DISTANCE, budget: Budget = None,
+                     workers: int = None) -> SolveResult:
+    budget = budget or Budget()
+    budget.start()
+
+    if not puzzle.is_solvable():
+        print("\nNo solution found! Are you sure the puzzle was solvable?")
+        return SolveResult(UNSOLVABLE, None, budget.get_stats())
+
+    size = puzzle.board_size
+    workers = workers or cpu_count() or 1
+    goal_tiles = [*range(1, size ** 2), 0]
+    goal = pack_board([goal_tiles[i * size:(i + 1) * size] for i in range(size)])
+
+    inboxes = [Queue() for _ in range(workers)]
+    replies = Queue()
+    sent = Array('q', workers + 1, lock=False)
+    received = Array('q', workers, lock=False)
+    counts = Array('q', workers * COUNTS, lock=False)
+    idle = Array('b', workers, lock=False)
+    best = Value('i', NO_COST)
+
+    processes = [Process(target=run_hda_worker, daemon=True,
+                         args=(i, inboxes, replies, sent, received, counts, idle, best, heuristic, size,
+                               puzzle.tile_bits))
+                 for i in range(workers)]
+    for process in processes:
+        process.start()
+    budget.pids = tuple(process.pid for process in processes)
+
+    # Hand the initial board to its owner
+    tiles = puzzle.get_tiles()
+    root = (puzzle.state, tiles.index(0), 0, heuristic.evaluate(tiles, size), None, None)
+    sent[workers] += 1
+    inboxes[get_owner(puzzle.state, workers)].put((NODES, [root]))
+
+    # Sums one of the statistics published by the workers
+    def get_count(field: int) -> int:
+        return sum(counts[i * COUNTS + field] for i in range(workers))
+
+    # Finishes the statistics of the search from the counts last published by the workers
+    def get_stats():
+        budget.nodes = get_count(EXPANDED)
+        stats.generated, stats.duplicates = get_count(GENERATED), get_count(DUPLICATES)
+        stats.add_sizes(get_count(FRONTIER), get_count(CLOSED))
+        return budget.get_stats()
+
+    # Follows the parent links back from a state to the initial board, each held by the owner of its state
+    # Each link leads to a state with a lower g-cost, even while the workers keep updating them, so the walk ends
+    def get_path(state: int) -> list[int]:
+        path = []
+        while True:
+            inboxes[get_owner(state, workers)].put((PARENT, state))
+            if (link := replies.get()) is None:
+                break
+            state, direction = link
+            path.append(direction)
+
+        path.reverse()
+        return path
+
+    # Wait until two snapshots in a row find every worker idle and every batch received
+    stats = budget.stats
+    previous = None
+    while True:
+        sleep(POLL_INTERVAL)
+        snapshot = (all(idle), sum(sent), sum(received))
+        if snapshot[0] and snapshot[1] == snapshot[2] and snapshot == previous:
+            break
+        previous = snapshot
+
+        budget.nodes = get_count(EXPANDED)
+        stats.add_sizes(get_count(FRONTIER), get_count(CLOSED))
+        if not budget.check():
+            # Report the lowest h state reached by any worker, as the single process solvers report their best node
+            for inbox in inboxes:
+                inbox.put((CLOSEST,))
+            closest = min(reply for reply in (replies.get() for _ in range(workers)) if reply is not None)
+            moves = get_path(closest[1])
+
+            stop_workers(inboxes, processes)
+            return SolveResult(budget.status, apply_moves(puzzle, moves, heuristic), get_stats())
+
+    moves = get_path(goal) if best.value != NO_COST else []
+    stop_workers(inboxes, processes)
+
+    if best.value == NO_COST:
+        print("\nNo solution found! Are you sure the puzzle was solvable?")
+        return SolveResult(UNSOLVABLE, None, get_stats())
+
+    return SolveResult(SOLVED, apply_moves(puzzle, moves, heuristic), get_stats())
+
+
+# Asks every hash distributed A* worker to exit, and waits for them to do so
+#  param   inboxes - message queue of each worker
+#  param processes - Process object of each worker
+def stop_workers(inboxes: list, processes: list):
+    for inbox in inboxes:
+        inbox.put((STOP,))
+    for process in processes:
+        process.join()
+
+
+# Make the parallel solvers available alongside the single process solvers
+SOLVERS["Parallel IDA*"] = solve_puzzle_parallel_ida
+SOLVERS["Hash Distributed A*"] = solve_puzzle_hda
+OPTIMAL_SOLVERS.update((solve_puzzle_parallel_ida, solve_puzzle_hda))
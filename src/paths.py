@@ -0,0 +1,2 @@
+# Constants shared by every module that reads or writes files of its own
+TABLES = "./tables/"        # Directory for cached heuristic tables
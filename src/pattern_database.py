@@ -0,0 +1,268 @@
+from __future__ import annotations
+from json import dump, load
+from mmap import mmap, ACCESS_READ
+from os import makedirs, path, replace
+from sys import stderr
+
+# Local Dependencies
+from src.paths import TABLES
+from src.puzzle import HEURISTICS, MANHATTAN_DISTANCE, Heuristic, get_neighbors
+
+# Constants
+MAX_DISTANCE = 255          # Largest distance that fits in a table entry
+LARGE_BUILD = 32 * 2 ** 20  # Memory needed to build a table above which the build must be asked for explicitly [bytes]
+
+# Disjoint tile partitions available for each board size, the first of each is used until another is built
+# The 6-6-3 partition gives the strongest 4x4 heuristic, but each 6 tile table needs over 90 MB to build and holds 11
+# times the placements of a 5 tile table, so its pure Python build takes many times longer than 5-5-5 and is only run
+# when asked for explicitly (see get_build_bytes())
+PARTITIONS = {
+    2: {"3": ((1, 2, 3),)},
+    3: {"4-4": ((1, 2, 4, 5), (3, 6, 7, 8))},
+    4: {"5-5-5": ((1, 5, 6, 9, 13), (2, 3, 4, 7, 8), (10, 11, 12, 14, 15)),
+        "6-6-3": ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4))},
+    5: {"4-4-4-4-4-4": ((1, 2, 6, 7), (3, 4, 5, 8), (9, 10, 14, 15),
+                        (11, 12, 16, 17), (13, 18, 19, 20), (21, 22, 23, 24))}
+}
+
+
+# Computes the dense index of a set of tile positions, ranking them as a partial permutation
+#  param positions - board positions of each tile in the pattern, in pattern order
+#  param     cells - number of positions on the board
+# return     index - integer in range [0, cells! / (cells - len(positions))!)
+def rank_positions(positions, cells: int) -> int:
+    index = 0
+
+    # Each position is counted among the positions not yet taken by earlier tiles of the pattern
+    for i, pos in enumerate(positions):
+        smaller = 0
+        for j in range(i):
+            if positions[j] < pos:
+                smaller += 1
+        index = index * (cells - i) + pos - smaller
+
+    return index
+
+
+# Computes the number of entries in the table for a pattern
+#  param  cells - number of positions on the board
+#  param length - number of tiles in the pattern
+# return  count - number of ways to place the pattern's tiles on the board
+def get_table_length(cells: int, length: int) -> int:
+    count = 1
+    for i in range(length):
+        count *= cells - i
+
+    return count
+
+
+# Estimates the memory needed to build the table of a pattern: one byte per placement for the table, and one per
+# placement and position of the blank for the visited flags of the search (the queue of the search comes on top)
+#  param    size - length/width of the game board
+#  param pattern - tiles in the pattern
+# return         - estimated memory [bytes]
+def get_build_bytes(size: int, pattern: tuple) -> int:
+    return get_table_length(size ** 2, len(pattern)) * (size ** 2 + 1)
+
+
+# Builds the file name of a cached pattern table
+#  param    size - length/width of the game board
+#  param pattern - tiles in the pattern
+# return         - path to the table file
+def get_table_path(size: int, pattern: tuple) -> str:
+    return f"{TABLES}pdb_{size}_{'-'.join(map(str, pattern))}.bin"
+
+
+# Builds the file name holding the partition in use for a board size
+#  param size - length/width of the game board
+# return      - path to the partition file
+def get_partition_path(size: int) -> str:
+    return f"{TABLES}pdb_{size}.json"
+
+
+# Computes the number of moves of the pattern's tiles needed to solve every placement of the pattern
+# Runs a breadth first search backwards from the solution, where moving a tile outside the pattern is free
+# Each placement keeps its fewest moves over every position of the blank, which is admissible but not consistent
+#  param    size - length/width of the game board
+#  param pattern - tiles in the pattern
+# return   table - bytearray indexed by rank_positions() holding the distance of each placement
+def build_pattern_table(size: int, pattern: tuple) -> bytearray:
+    cells = size ** 2
+    length = len(pattern)
+    neighbors = [[src for _, src in moves] for moves in get_neighbors(size)]
+    table = bytearray([MAX_DISTANCE]) * get_table_length(cells, length)
+    visited = bytearray(len(table) * cells)
+
+    # Start from the solution, with the blank in the bottom-right corner
+    level = [(tuple(tile - 1 for tile in pattern), cells - 1)]
+    distance = 0
+
+    while level:
+        next_level = []
+
+        for positions, start in level:
+            index = rank_positions(positions, cells)
+            if visited[index * cells + start]:
+                continue
+
+            occupied = {pos: i for i, pos in enumerate(positions)}
+            if table[index] > distance:
+                table[index] = distance
+
+            # Flood the blank through every cell it can reach by moving tiles outside the pattern
+            visited[index * cells + start] = 1
+            region = [start]
+            for blank in region:
+                for src in neighbors[blank]:
+                    if (i := occupied.get(src)) is not None:
+                        # Sliding a pattern tile into the blank costs one move
+                        moved = positions[:i] + (blank,) + positions[i + 1:]
+                        if not visited[rank_positions(moved, cells) * cells + src]:
+                            next_level.append((moved, src))
+                    elif not visited[index * cells + src]:
+                        visited[index * cells + src] = 1
+                        region.append(src)
+
+        level = next_level
+        distance = min(distance + 1, MAX_DISTANCE)
+
+    return table
+
+
+# Builds and saves the tables for every pattern of a partition, and marks it as the partition in use for its size
+# Partitions needing more than LARGE_BUILD memory to build any table are refused unless allowed explicitly
+#  param        size - length/width of the game board
+#  param   partition - disjoint patterns of tiles that together cover every tile on the board
+#  param allow_large - indicates whether partitions that are slow and memory hungry to build may be built
+def build_pattern_database(size: int, partition: tuple, allow_large: bool = False):
+    if not allow_large and (needed := max(get_build_bytes(size, pattern) for pattern in partition)) > LARGE_BUILD:
+        raise ValueError(f"Building this partition needs about {needed / 2 ** 20:.0f} MB per table and a long build, "
+                         f"pass allow_large=True to build it anyway")
+
+    makedirs(TABLES, exist_ok=True)
+
+    for pattern in partition:
+        print(f"\nBuilding pattern table for tiles {', '.join(map(str, pattern))}...")
+        table = build_pattern_table(size, pattern)
+
+        # Write to a temporary file first, so a running solver never maps a partially written table
+        file_name = get_table_path(size, pattern)
+        with open(f"{file_name}.tmp", "wb") as out_file:
+            out_file.write(table)
+        replace(f"{file_name}.tmp", file_name)
+
+        print(f"Pattern table exported to {file_name}")
+
+    with open(get_partition_path(size), 'w') as out_file:
+        dump([list(pattern) for pattern in partition], out_file)
+
+
+# Loads the partition in use for a board size
+#  param      size - length/width of the game board
+# return partition - disjoint patterns of tiles that together cover every tile on the board, or None if no partition
+#                    is defined for the board size
+def load_partition(size: int) -> tuple | None:
+    try:
+        with open(get_partition_path(size)) as in_file:
+            return tuple(tuple(pattern) for pattern in load(in_file))
+    except FileNotFoundError:
+        if size not in PARTITIONS:
+            return None
+
+        return next(iter(PARTITIONS[size].values()))
+
+
+# Additive pattern database heuristic, summing the exact solution cost of each disjoint pattern of tiles
+# Tables are memory mapped, so they load instantly and their pages are shared by every process using them
+# Tables are only built by build_pattern_database() (option 4 of main.py), never in the middle of a search, so boards
+# without built tables, or too large for any partition, fall back to Manhattan distance
+# attr   tables - dictionary mapping board sizes to (patterns, mapped tables, pattern index of each tile), or to None if
+#                 the board size has no tables and falls back to Manhattan distance
+class PatternDatabase(Heuristic):
+    name = "Pattern Database"
+    needs_tiles = True
+    consistent = False
+
+    def __init__(self):
+        self.tables = {}
+
+    # Maps the tables of the partition in use for a board size
+    #  param  size - length/width of the game board
+    # return       - patterns, their mapped tables, and the index of the pattern holding each tile, or None if the
+    #                board size has no partition or its tables have not been built
+    def get_tables(self, size: int) -> tuple[tuple, list, list[int]] | None:
+        if size in self.tables:
+            return self.tables[size]
+
+        if (partition := load_partition(size)) is None:
+            print(f"WARNING: No pattern database is defined for {size}x{size} boards, using Manhattan distance",
+                  file=stderr)
+            self.tables[size] = None
+            return None
+
+        if not all(path.isfile(get_table_path(size, pattern)) for pattern in partition):
+            print(f"WARNING: Pattern database tables for {size}x{size} boards have not been built (option 4 of "
+                  "main.py), using Manhattan distance", file=stderr)
+            self.tables[size] = None
+            return None
+
+        maps = []
+        for pattern in partition:
+            with open(get_table_path(size, pattern), "rb") as in_file:
+                maps.append(mmap(in_file.fileno(), 0, access=ACCESS_READ))
+
+        owners = [-1] * size ** 2
+        for i, pattern in enumerate(partition):
+            for tile in pattern:
+                owners[tile] = i
+
+        tables = self.tables[size] = (partition, maps, owners)
+        return tables
+
+    # Mapped tables cannot be pickled, so worker processes receive an empty instance and map the tables themselves
+    def __getstate__(self) -> dict:
+        return {"tables": {}}
+
+    # Drops any mapped tables so they will be remapped on next use, e.g. after they are (re)built
+    def close(self):
+        for tables in self.tables.values():
+            for table in tables[1] if tables is not None else ():
+                table.close()
+
+        self.tables.clear()
+
+    def evaluate(self, tiles, size: int) -> int:
+        if (tables := self.get_tables(size)) is None:
+            return MANHATTAN_DISTANCE.evaluate(tiles, size)
+
+        partition, maps, _ = tables
+        positions = [0] * size ** 2
+        for k, tile in enumerate(tiles):
+            positions[tile] = k
+
+        return sum(table[rank_positions([positions[tile] for tile in pattern], size ** 2)]
+                   for pattern, table in zip(partition, maps))
+
+    def update(self, h: int, tiles, size: int, tile: int, src: int, dst: int) -> int:
+        if (tables := self.get_tables(size)) is None:
+            return MANHATTAN_DISTANCE.update(h, tiles, size, tile, src, dst)
+
+        partition, maps, owners = tables
+        pattern = partition[owners[tile]]
+        table = maps[owners[tile]]
+
+        # Only the pattern holding the sliding tile changes, so only its few tiles are looked up
+        before = [src if other == tile else tiles.index(other) for other in pattern]
+        after = [dst if other == tile else pos for other, pos in zip(pattern, before)]
+
+        return h + table[rank_positions(after, size ** 2)] - table[rank_positions(before, size ** 2)]
+
+
+# Shared pattern database instance, available to the solvers alongside the built-in heuristics
+# Each table entry is the fewest moves over every position of the blank, as the blank is not part of the pattern. That
+# keeps the heuristic admissible but not consistent: the blank cannot cross the pattern's tiles, so the best position
+# of the blank may be out of its reach, and a single move can lower the heuristic by several moves. The solvers in
+# CONSISTENT_SOLVERS reject it, while IDA* and the other optimal solvers, which reopen boards reached more cheaply,
+# still find optimal solutions with it
+PATTERN_DATABASE = PatternDatabase()
+HEURISTICS[PATTERN_DATABASE.name] = PATTERN_DATABASE
@@ -0,0 +1,13 @@
+# Imports the modules that add solvers to SOLVERS and heuristics to HEURISTICS
+# The batched solvers are left out when NumPy is not installed
+def load_plugins():
+    import src.anytime
+
+    try:
+        import src.batched
+    except ImportError:
+        pass
+
+    import src.parallel
+    import src.pattern_database
+    import src.walking_distance
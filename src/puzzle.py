@@ -1,9 +1,14 @@
 from __future__ import annotations
-from copy import deepcopy
+from functools import partial
+from math import inf
 from random import shuffle
+from collections.abc import Callable
 
 # Local Dependencies
+from src.budget import SOLVED, UNSOLVABLE, Budget, SolveResult
+from src.bucket_queue import BucketQueue
 from src.minheap import MinHeap
+from src.state_table import make_state_table
 
 # Used to indicate direction of travel when sliding tiles
 UP = 1
@@ -11,28 +16,257 @@ DOWN = 2
 LEFT = 3
 RIGHT = 4
 
+# Direction that undoes each move
+OPPOSITE = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
+
+# Largest board size that holds its live nodes in a bucket queue, larger boards have too many distinct priorities
+MAX_BUCKET_SIZE = 5
+
+
+# Computes the number of bits used to hold a single tile in a packed board state
+#  param size - length/width of the game board
+# return      - number of bits needed to represent the largest tile value on the board
+def get_tile_bits(size: int) -> int:
+    return max(1, (size ** 2 - 1).bit_length())
+
+
+# Packs a 2D board into a single integer, storing each tile in a fixed-width bit field in row-major order
+#  param board - 2D array of integers representing the board state
+# return       - integer holding the packed board state, with the top-left tile in the lowest bits
+def pack_board(board: list[list[int]]) -> int:
+    bits = get_tile_bits(len(board))
+    return int("".join(format(tile, f"0{bits}b") for row in reversed(board) for tile in reversed(row)), 2)
+
+
+# Unpacks an integer board state back into a 2D board
+#  param state - integer holding the packed board state
+#  param  size - length/width of the game board
+# return       - 2D array of integers representing the board state
+def unpack_state(state: int, size: int) -> list[list[int]]:
+    bits = get_tile_bits(size)
+    width = size * bits
+    digits = format(state, f"0{size * width}b")[::-1]
+
+    # Each tile is stored least significant bit first in the reversed digit string
+    return [[int(digits[i * width + j * bits:i * width + (j + 1) * bits][::-1], 2) for j in range(size)]
+            for i in range(size)]
+
+
+# Read-only sequence view over the tiles of a packed board state, in row-major order
+# attr state - integer holding the packed board state
+# attr  size - number of tiles on the board
+# attr  bits - number of bits used to hold each tile
+# attr  mask - bit mask covering a single tile
+class PackedTiles:
+    def __init__(self, state: int, board_size: int, bits: int):
+        self.state = state
+        self.size = board_size ** 2
+        self.bits = bits
+        self.mask = (1 << bits) - 1
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> int:
+        if not 0 <= index < self.size:
+            raise IndexError("tile index out of range")
+
+        return (self.state >> (index * self.bits)) & self.mask
+
+    def __iter__(self):
+        return iter(self[i] for i in range(self.size))
+
+    # Finds the position of a tile, like list.index()
+    #  param tile - value of the tile to find
+    # return      - row-major index of the tile on the board
+    def index(self, tile: int) -> int:
+        for i in range(self.size):
+            if (self.state >> (i * self.bits)) & self.mask == tile:
+                return i
+
+        raise ValueError(f"tile {tile} is not on the board")
+
+
+# Base class for heuristics that estimate the number of moves needed to solve a board
+# Boards are passed as flat row-major sequences of tiles, so the same heuristic can score packed and mutable boards
+# attr        name - human readable name of the heuristic
+# attr needs_tiles - indicates whether update() reads the tiles, so callers may skip building them when False
+# attr  consistent - indicates whether a single move never lowers the heuristic by more than one, which the solvers in
+#                    CONSISTENT_SOLVERS need for their guarantees (every heuristic is admissible)
+class Heuristic:
+    name = "Heuristic"
+    needs_tiles = True
+    consistent = True
+
+    # Computes the heuristic value of a full board
+    #  param tiles - flat row-major sequence of tile values
+    #  param  size - length/width of the game board
+    # return       - estimated number of moves required to solve the board
+    def evaluate(self, tiles, size: int) -> int:
+        raise NotImplementedError
+
+    # Computes the heuristic value of a board after a single tile slide from the value before the slide
+    #  param     h - heuristic value of the board before the slide
+    #  param tiles - flat row-major sequence of tile values before the slide
+    #  param  size - length/width of the game board
+    #  param  tile - value of the sliding tile
+    #  param   src - flat index the tile slides out of
+    #  param   dst - flat index the tile slides into (the blank space)
+    # return       - heuristic value of the board after the slide
+    def update(self, h: int, tiles, size: int, tile: int, src: int, dst: int) -> int:
+        after = list(tiles)
+        after[dst], after[src] = tile, 0
+        return self.evaluate(after, size)
+
+
+# Counts the number of non-blank tiles that are not in their solution spot
+class MisplacedTiles(Heuristic):
+    name = "Misplaced Tiles"
+    needs_tiles = False
+
+    def evaluate(self, tiles, size: int) -> int:
+        return sum(1 for k, tile in enumerate(tiles) if tile and tile != k + 1)
+
+    def update(self, h: int, tiles, size: int, tile: int, src: int, dst: int) -> int:
+        # Only the sliding tile can become misplaced or correctly placed (tile k belongs at index k - 1)
+        return h + (tile - 1 != dst) - (tile - 1 != src)
+
+
+# Sums the horizontal and vertical distance of each non-blank tile from its solution spot
+# attr tables - dictionary mapping board sizes to their distance lookup tables, indexed by [tile][position]
+class ManhattanDistance(Heuristic):
+    name = "Manhattan Distance"
+    needs_tiles = False
+
+    def __init__(self):
+        self.tables = {}
+
+    # Builds (or fetches) the distance lookup table for a given board size
+    #  param  size - length/width of the game board
+    # return table - 2D array where table[tile][position] is the distance of tile from its solution spot
+    def get_table(self, size: int) -> list[list[int]]:
+        if (table := self.tables.get(size)) is None:
+            table = [[0] * size ** 2]
+            for tile in range(1, size ** 2):
+                goal_i, goal_j = divmod(tile - 1, size)
+                table.append([abs(goal_i - i) + abs(goal_j - j) for i in range(size) for j in range(size)])
+            self.tables[size] = table
+
+        return table
+
+    def evaluate(self, tiles, size: int) -> int:
+        table = self.get_table(size)
+        return sum(table[tile][k] for k, tile in enumerate(tiles))
+
+    def update(self, h: int, tiles, size: int, tile: int, src: int, dst: int) -> int:
+        table = self.get_table(size)
+        return h + table[tile][dst] - table[tile][src]
+
+
+# Manhattan distance plus two moves for every tile that must leave its row or column to pass another tile
+# For each line, the tiles that belong to it are ordered by their solution spot, and every tile outside the longest
+# increasing run of that ordering is in conflict
+class LinearConflict(ManhattanDistance):
+    name = "Linear Conflict"
+    needs_tiles = True
+
+    def evaluate(self, tiles, size: int) -> int:
+        conflicts = 0
+
+        for line in range(size):
+            conflicts += get_line_conflicts([tiles[line * size + k] for k in range(size)], size, line, True)
+            conflicts += get_line_conflicts([tiles[k * size + line] for k in range(size)], size, line, False)
+
+        return super().evaluate(tiles, size) + 2 * conflicts
+
+    def update(self, h: int, tiles, size: int, tile: int, src: int, dst: int) -> int:
+        h = super().update(h, tiles, size, tile, src, dst)
+
+        # A horizontal slide keeps the order of its row but changes two columns, and a vertical slide the reverse
+        is_row = abs(src - dst) == size
+        for index in src, dst:
+            line = index // size if is_row else index % size
+            indices = range(line * size, line * size + size) if is_row else range(line, size ** 2, size)
+
+            before = [tiles[k] for k in indices]
+            after = [tile if k == dst else 0 if k == src else before[n] for n, k in enumerate(indices)]
+            h += 2 * (get_line_conflicts(after, size, line, is_row) - get_line_conflicts(before, size, line, is_row))
+
+        return h
+
+
+# Counts the tiles of a row or column that must leave the line to let the other tiles in it pass
+#  param   line - tile values along the row or column, in order
+#  param   size - length/width of the game board
+#  param  index - index of the row or column
+#  param is_row - indicates whether the line is a row or a column
+# return        - number of tiles that belong in the line but are not part of its longest correctly ordered run
+def get_line_conflicts(line: list[int], size: int, index: int, is_row: bool) -> int:
+    goals = []
+
+    # Collect the solution spots (along the line) of the tiles that belong in this line
+    for tile in line:
+        if tile:
+            goal_i, goal_j = divmod(tile - 1, size)
+            if is_row and goal_i == index:
+                goals.append(goal_j)
+            elif not is_row and goal_j == index:
+                goals.append(goal_i)
+
+    if len(goals) < 2:
+        return 0
+
+    # Length of the longest increasing subsequence of solution spots
+    longest = [1] * len(goals)
+    for i in range(1, len(goals)):
+        for j in range(i):
+            if goals[j] < goals[i] and longest[j] >= longest[i]:
+                longest[i] = longest[j] + 1
+
+    return len(goals) - max(longest)
+
+
+# Shared heuristic instances, which cache their lookup tables between searches
+MISPLACED_TILES = MisplacedTiles()
+MANHATTAN_DISTANCE = ManhattanDistance()
+LINEAR_CONFLICT = LinearConflict()
+
+# Heuristics that may be selected for the solvers, by name
+HEURISTICS = {heuristic.name: heuristic for heuristic in (MISPLACED_TILES, MANHATTAN_DISTANCE, LINEAR_CONFLICT)}
+
 
 # Holds all attributes and methods necessary to represent a game board state as a node
 # attr     parent - parent node of this board state
+# attr  heuristic - Heuristic object used to compute the cost of this node
 # attr       cost - estimated cost of exploring this node
 # attr  blank_pos - grid coordinates of the blank tile space
 # attr inversions - number of inversions in this board state
 # attr board_size - length/width of the game board
-# attr      board - 2D array of integers representing the board state
+# attr  tile_bits - number of bits used to hold each tile in the packed board state
+# attr      state - integer holding the packed board state, also used as the board's hash key
+# attr      board - 2D array of integers representing the board state (unpacked from state on demand)
 class Puzzle:
-    # param  board - 2D array of integers representing the board state
-    # param   size - length/width of the game board
-    # param parent - parent node of this board state
-    def __init__(self, board: list = None, size: int = 4, parent: Puzzle = None):
+    # param     board - 2D array of integers representing the board state
+    # param      size - length/width of the game board
+    # param    parent - parent node of this board state
+    # param     state - integer holding a packed board state, used instead of board when provided
+    # param heuristic - Heuristic object used to compute the cost, defaults to counting misplaced tiles
+    def __init__(self, board: list = None, size: int = 4, parent: Puzzle = None, state: int = None,
+                 heuristic: Heuristic = None):
         self.parent = parent
+        self.heuristic = heuristic if heuristic is not None else MISPLACED_TILES
         self.cost = -1
         self.blank_pos = (-1, -1)
         self.inversions = -1
         self.board_size = -1
-        self.board = []
+        self.tile_bits = -1
+        self.state = 0
+        self._board = None
 
         # Generate a new solvable board if one was not provided, else set the given board
-        if board is None:
+        if state is not None:
+            self.set_state(state, size)
+        elif board is None:
             self.generate(size)
         else:
             self.set_board(board)
@@ -43,15 +277,50 @@ class Puzzle:
     def __lt__(self, other: Puzzle) -> bool:
         return self.cost < other.cost if self.cost != other.cost else self.inversions < other.inversions
 
+    @property
+    def board(self) -> list[list[int]]:
+        # Only unpack the board when it is requested, as search nodes rarely need it
+        if self._board is None:
+            self._board = unpack_state(self.state, self.board_size)
+
+        return self._board
+
+    @board.setter
+    def board(self, board: list[list[int]]):
+        self.set_board(board)
+
     # Updates the board state of this object and all related attributes
     # param board - 2D array of integers representing the new board state
     def set_board(self, board: list):
-        self.board = board
-        self.board_size = len(self.board)
-        self.cost = self.count_bad_tiles()
+        self.board_size = len(board)
+        self.tile_bits = get_tile_bits(self.board_size)
+        self.state = pack_board(board)
+        self._board = [list(row) for row in board]
+        self.update_attributes()
+
+    # Updates the packed board state of this object and all related attributes
+    # param state - integer holding the new packed board state
+    # param  size - length/width of the game board, defaults to the current size
+    def set_state(self, state: int, size: int = None):
+        if size is not None and size != self.board_size:
+            self.board_size = size
+            self.tile_bits = get_tile_bits(size)
+
+        self.state = state
+        self._board = None
+        self.update_attributes()
+
+    # Recomputes the cost, blank position, and inversions of the current board state
+    def update_attributes(self):
+        self.cost = self.heuristic.evaluate(self.get_tiles(), self.board_size)
         self.blank_pos = self.find_blank_pos()
         self.inversions = self.count_inversions()
 
+    # Flattens the board into a list of tiles in row-major order
+    # return - array of integers holding each tile of the board
+    def get_tiles(self) -> list[int]:
+        return [tile for row in self.board for tile in row]
+
     # Checks if the current board is the solution board
     def is_solution(self) -> bool:
         return self.cost == 0
@@ -75,26 +344,18 @@ class Puzzle:
 
     # Generate a new solvable board state
     def generate(self, new_size: int = None):
-        # Resize the board if necessary
-        if new_size is not None and new_size != self.board_size:
-            self.board_size = new_size
-            self.board = [[-1 for _ in range(new_size)] for _ in range(new_size)]
+        size = new_size if new_size is not None else self.board_size
 
-        sequence = list(range(self.board_size ** 2))
-        shuffle(sequence)
+        # Keep shuffling until a solvable board is found
+        while True:
+            sequence = list(range(size ** 2))
+            shuffle(sequence)
 
-        # Set each grid position to a random value in range [0, n^2)
-        for i in range(self.board_size):
-            for j in range(self.board_size):
-                self.board[i][j] = sequence.pop()
+            # Set each grid position to a random value in range [0, n^2)
+            self.set_board([[sequence.pop() for _ in range(size)] for _ in range(size)])
 
-        self.blank_pos = self.find_blank_pos()
-        self.inversions = self.count_inversions()
-        
-        if not self.is_solvable():
-            self.generate()
-        else:
-            self.cost = self.count_bad_tiles()
+            if self.is_solvable():
+                return
 
     # Checks if a move is valid for the current board state
     # param move - integer representing the intended direction to move the blank tile
@@ -104,55 +365,89 @@ class Puzzle:
                (move == LEFT and self.blank_pos[1] < self.board_size - 1) or \
                (move == RIGHT and self.blank_pos[1] > 0)
 
-    # Generates a new board by moving the blank tile in the desired direction
+    # Finds the grid coordinates of the tile that would slide into the blank space for a given direction
     #  param direction - integer representing the direction to move the blank tile
-    # return new_board - 2D array of integers representing the board state after moving the blank tile by the direction
+    # return      i, j - grid coordinates of the tile that would slide
     # return      None - if the move was not valid
-    def move(self, direction: int) -> list[list[int]] | None:
+    def get_slide_source(self, direction: int) -> tuple[int, int] | None:
         i, j = self.blank_pos
 
-        # If the move is valid, deep copy the board and swap the values of the new board. Else, do nothing.
         if direction == DOWN:
             if i > 0:
-                new_board = deepcopy(self.board)
-                new_board[i][j] = new_board[i - 1][j]
-                new_board[i - 1][j] = 0
-                return new_board
+                return i - 1, j
         elif direction == UP:
             if i < self.board_size - 1:
-                new_board = deepcopy(self.board)
-                new_board[i][j] = new_board[i + 1][j]
-                new_board[i + 1][j] = 0
-                return new_board
+                return i + 1, j
         elif direction == RIGHT:
             if j > 0:
-                new_board = deepcopy(self.board)
-                new_board[i][j] = new_board[i][j - 1]
-                new_board[i][j - 1] = 0
-                return new_board
+                return i, j - 1
         elif direction == LEFT:
             if j < self.board_size - 1:
-                new_board = deepcopy(self.board)
-                new_board[i][j] = new_board[i][j + 1]
-                new_board[i][j + 1] = 0
-                return new_board
+                return i, j + 1
 
         return None
 
+    # Generates a new board state by moving the blank tile in the desired direction
+    #  param direction - integer representing the direction to move the blank tile
+    # return new_state - packed board state after moving the blank tile by the direction
+    # return      None - if the move was not valid
+    def move(self, direction: int) -> int | None:
+        if (source := self.get_slide_source(direction)) is None:
+            return None
+
+        # Bit offsets of the blank space and the tile sliding into it
+        blank_shift = (self.blank_pos[0] * self.board_size + self.blank_pos[1]) * self.tile_bits
+        tile_shift = (source[0] * self.board_size + source[1]) * self.tile_bits
+        tile = (self.state >> tile_shift) & ((1 << self.tile_bits) - 1)
+
+        # The blank's bit field is zero, so the slide is a single add and subtract of the tile value
+        return self.state + (tile << blank_shift) - (tile << tile_shift)
+
+    # Creates the child node reached by moving the blank tile in the desired direction
+    # The child's cost, blank position, and inversions are derived from this node's values, as a slide changes one tile
+    #  param direction - integer representing the direction to move the blank tile
+    # return     child - Puzzle object holding the new board state, with this node as its parent
+    # return      None - if the move was not valid
+    def make_child(self, direction: int) -> Puzzle | None:
+        if (source := self.get_slide_source(direction)) is None:
+            return None
+
+        size = self.board_size
+        bits = self.tile_bits
+        mask = (1 << bits) - 1
+        blank = self.blank_pos[0] * size + self.blank_pos[1]
+        src = source[0] * size + source[1]
+        tile = (self.state >> (src * bits)) & mask
+
+        # Bypass __init__, since every attribute is filled in directly from the parent
+        child = Puzzle.__new__(Puzzle)
+        child.parent = self
+        child.heuristic = self.heuristic
+        child.board_size = size
+        child.tile_bits = bits
+        child.state = self.state + (tile << (blank * bits)) - (tile << (src * bits))
+        child._board = None
+        child.blank_pos = source
+
+        tiles = PackedTiles(self.state, size, bits) if self.heuristic.needs_tiles else None
+        child.cost = self.heuristic.update(self.cost, tiles, size, tile, src, blank)
+
+        # Horizontal slides keep the row-major tile order, vertical slides move the tile past the n - 1 tiles between
+        child.inversions = self.inversions
+        if abs(src - blank) == size:
+            for k in range(min(src, blank) + 1, max(src, blank)):
+                other = (self.state >> (k * bits)) & mask
+                if (other < tile) == (src > blank):
+                    child.inversions += 1
+                else:
+                    child.inversions -= 1
+
+        return child
+
     # Computes the number of non-blank tiles that are out of place
     # return count - number of non-blank tiles not in their solution spot
     def count_bad_tiles(self) -> int:
-        count = 0
-        k = 1
-
-        # For each tile in the board, check if it's in the solution spot
-        for i in range(self.board_size):
-            for j in range(self.board_size):
-                if self.board[i][j] and self.board[i][j] != k:
-                    count += 1
-                k += 1
-        
-        return count
+        return MISPLACED_TILES.evaluate(self.get_tiles(), self.board_size)
 
     # Computes the number of inversions on the board
     # return inversions - number of inversions that exist in the current board state
@@ -171,35 +466,443 @@ class Puzzle:
     # Find position of the blank tile
     # return i, j - grid coordinates of the blank tile on the board
     def find_blank_pos(self) -> tuple[int, int]:
+        board = self.board
+
         for i in range(self.board_size):
             for j in range(self.board_size):
-                if self.board[i][j] == 0:
+                if board[i][j] == 0:
                     return i, j
 
 
+# Builds the moves available for each blank position of a board, ordered the same as the solvers' move order
+#  param      size - length/width of the game board
+# return neighbors - array indexed by flat blank position of (direction, flat position of the sliding tile) pairs
+def get_neighbors(size: int) -> list[list[tuple[int, int]]]:
+    if (neighbors := NEIGHBORS.get(size)) is None:
+        neighbors = []
+        for i in range(size):
+            for j in range(size):
+                moves = []
+                if i < size - 1:
+                    moves.append((UP, (i + 1) * size + j))
+                if i > 0:
+                    moves.append((DOWN, (i - 1) * size + j))
+                if j < size - 1:
+                    moves.append((LEFT, i * size + j + 1))
+                if j > 0:
+                    moves.append((RIGHT, i * size + j - 1))
+                neighbors.append(moves)
+        NEIGHBORS[size] = neighbors
+
+    return neighbors
+
+
+# Cache of the moves available from each blank position, by board size
+NEIGHBORS = {}
+
+
+# Rebuilds a chain of Puzzle nodes by applying a sequence of moves to an initial board
+#  param    puzzle - Puzzle object holding the initial board state
+#  param     moves - sequence of directions to move the blank tile
+#  param heuristic - Heuristic object used to score the nodes, defaults to the puzzle's own heuristic
+# return      node - Puzzle object holding the final board state, linked to the initial board through its parents
+def apply_moves(puzzle: Puzzle, moves, heuristic: Heuristic = None) -> Puzzle:
+    node = Puzzle(state=puzzle.state, size=puzzle.board_size, heuristic=heuristic or puzzle.heuristic)
+
+    for direction in moves:
+        node = node.make_child(direction)
+
+    return node
+
+
+# Extracts the sequence of moves that leads from the initial board to a given node
+#  param  node - Puzzle object at the end of a chain of parent nodes
+# return moves - array of directions the blank tile was moved in, starting from the initial board
+def get_moves(node: Puzzle) -> list[int]:
+    moves = []
+
+    # Each node's blank sits where the tile that slid into its parent's blank used to be
+    while node.parent is not None:
+        (i, j), (parent_i, parent_j) = node.blank_pos, node.parent.blank_pos
+        if i != parent_i:
+            moves.append(UP if i > parent_i else DOWN)
+        else:
+            moves.append(LEFT if j > parent_j else RIGHT)
+        node = node.parent
+
+    moves.reverse()
+    return moves
+
+
+# Creates the priority queue used to hold live nodes, ordered by cost with fewer inversions breaking ties
+#  param       size - length/width of the game board
+# return live_nodes - BucketQueue for small boards, else MinHeap
+# return   priority - function computing the key of a node within the returned queue
+def make_live_nodes(size: int) -> tuple[BucketQueue | MinHeap, Callable[[Puzzle], int | tuple]]:
+    if size > MAX_BUCKET_SIZE:
+        def priority(node: Puzzle) -> tuple[int, int]:
+            return node.cost, node.inversions
+
+        return MinHeap(), priority
+
+    # Each cost gets a run of buckets wide enough to hold every possible number of inversions
+    stride = (size ** 2 - 1) * (size ** 2 - 2) // 2 + 1
+
+    def priority(node: Puzzle) -> int:
+        return node.cost * stride + node.inversions
+
+    return BucketQueue(), priority
+
+
 # Main algorithm for solving a puzzle utilizing the Branch and Bound strategy
-#  param       puzzle - Puzzle object holding the initial board state
-# return current_node - Puzzle object holding the solution board state
-# return         None - if no solution existed for the initial board state
-def solve_puzzle(puzzle: Puzzle) -> Puzzle | None:
-    live_nodes = MinHeap()
-    live_nodes.insert(puzzle)
-    checked_boards = {str(puzzle.board): True}
+#  param    puzzle - Puzzle object holding the initial board state
+#  param heuristic - Heuristic object used to rank the live nodes, defaults to the puzzle's own heuristic
+#  param    budget - Budget object limiting the search, defaults to no limits
+# return           - SolveResult holding the solution, or the lowest cost board reached if the budget ran out
+def solve_puzzle(puzzle: Puzzle, heuristic: Heuristic = None, budget: Budget = None) -> SolveResult:
+    budget = budget or Budget()
+    budget.start()
+
+    stats = budget.stats
+    profile = stats.profile
+
+    # Re-score the initial board if a different heuristic was requested, children inherit it from their parent
+    if profile or (heuristic is not None and heuristic is not puzzle.heuristic):
+        heuristic = stats.time_heuristic(heuristic or puzzle.heuristic)
+        puzzle = Puzzle(state=puzzle.state, size=puzzle.board_size, heuristic=heuristic)
+
+    live_nodes, priority = make_live_nodes(puzzle.board_size)
+    live_nodes = stats.time_queue(live_nodes)
+    live_nodes.insert(puzzle, priority(puzzle))
+    checked_boards = make_state_table(puzzle.board_size)
+    checked_boards.add(puzzle.state)
+    best_node = puzzle
+    budget.best_cost = puzzle.cost
 
     # Loop so long as there are puzzle nodes in the heap
     while live_nodes:
         current_node = live_nodes.pop_root()
 
         if current_node.is_solution():
-            return current_node
+            stats.max_closed = len(checked_boards)
+            return SolveResult(SOLVED, current_node, budget.get_stats())
+
+        if not budget.expand():
+            stats.max_closed = len(checked_boards)
+            return SolveResult(budget.status, best_node, budget.get_stats())
+
+        if current_node.cost < best_node.cost:
+            best_node = current_node
+            budget.best_cost = current_node.cost
+
+        if profile:
+            start = stats.get_clock()
 
         # For each direction check if the move is valid and not an already checked board
         # Inserts a new Puzzle object into the heap if True
         for direction in UP, DOWN, LEFT, RIGHT:
-            new_board = current_node.move(direction)
-            if new_board and (board_str := str(new_board)) not in checked_boards:
-                live_nodes.insert(Puzzle(board=new_board, parent=current_node))
-                checked_boards[board_str] = True
+            if (new_state := current_node.move(direction)) is None:
+                continue
+
+            stats.generated += 1
+            if new_state in checked_boards:
+                stats.duplicates += 1
+            else:
+                child = current_node.make_child(direction)
+                live_nodes.insert(child, priority(child))
+                checked_boards.add(new_state)
+
+        if profile:
+            stats.move_time += stats.get_clock() - start
+        stats.add_sizes(len(live_nodes))
 
     print("\nNo solution found! Are you sure the puzzle was solvable?")
-    return None
+    stats.max_closed = len(checked_boards)
+    return SolveResult(UNSOLVABLE, None, budget.get_stats())
+
+
+# Iterative deepening A* search, which finds an optimal solution using memory proportional to the solution depth
+# A single board is modified in place, with each move undone when its subtree has been searched
+#  param    puzzle - Puzzle object holding the initial board state
+#  param heuristic - admissible Heuristic object used to bound each iteration
+#  param    budget - Budget object limiting the search, defaults to no limits
+# return           - SolveResult holding the solution, or the lowest cost board reached if the budget ran out
+def solve_puzzle_ida(puzzle: Puzzle, heuristic: Heuristic = MANHATTAN_DISTANCE, budget: Budget = None) -> SolveResult:
+    budget = budget or Budget()
+    budget.start()
+
+    if not puzzle.is_solvable():
+        print("\nNo solution found! Are you sure the puzzle was solvable?")
+        return SolveResult(UNSOLVABLE, None, budget.get_stats())
+
+    size = puzzle.board_size
+    tiles = puzzle.get_tiles()
+    neighbors = get_neighbors(size)
+    path = []
+    expand = budget.expand
+    stats = budget.stats
+    scorer = stats.time_heuristic(heuristic)
+    update = scorer.update
+
+    # Depth first search that returns -1 once solved, -2 once out of budget, else the smallest f-cost over the bound
+    def search(blank: int, g: int, h: int, last: int | None) -> int:
+        nonlocal best, generated, deepest
+        if (f := g + h) > bound:
+            return f
+
+        # Every heuristic is zero only on the solution board
+        if not h:
+            return -1
+
+        if not expand():
+            return -2
+
+        if h < best[0]:
+            best = (h, path.copy())
+
+        generated += len(neighbors[blank]) - (last is not None)
+        if g > deepest:
+            deepest = g
+
+        minimum = inf
+        for direction, src in neighbors[blank]:
+            # Never undo the move that led to this board
+            if direction == OPPOSITE.get(last):
+                continue
+
+            tile = tiles[src]
+            child_h = update(h, tiles, size, tile, src, blank)
+
+            # Make the move, search its subtree, then unmake the move
+            tiles[blank], tiles[src] = tile, 0
+            path.append(direction)
+            result = search(src, g + 1, child_h, direction)
+            if result < 0:
+                return result
+            path.pop()
+            tiles[src], tiles[blank] = tile, 0
+
+            minimum = min(minimum, result)
+
+        return minimum
+
+    blank = puzzle.blank_pos[0] * size + puzzle.blank_pos[1]
+    root_h = bound = scorer.evaluate(tiles, size)
+    best = (inf, [])
+    generated = deepest = 0
+    start = stats.get_clock()
+
+    # Raise the bound to the smallest f-cost that exceeded it until the solution is within the bound
+    budget.best_cost = bound
+    while (result := search(blank, 0, root_h, None)) >= 0:
+        bound = budget.best_cost = result
+
+    # The only boards held are those on the current path, and all but the heuristic is spent making moves
+    stats.generated = generated
+    stats.max_frontier = deepest + 1
+    if stats.profile:
+        stats.move_time = stats.get_clock() - start
+
+    if result == -2:
+        return SolveResult(budget.status, apply_moves(puzzle, best[1], heuristic), budget.get_stats())
+
+    return SolveResult(SOLVED, apply_moves(puzzle, path, heuristic), budget.get_stats())
+
+
+# Bidirectional A* search, running alternating searches from the initial board and from the solution board
+# The backward search is guided by the Manhattan distance to the initial board (front-to-end), and the search stops
+# once neither frontier can lead to a shorter path than the best meeting point found so far
+# The stopping rule only holds with a consistent heuristic, so any other heuristic raises a ValueError
+#  param    puzzle - Puzzle object holding the initial board state
+#  param heuristic - consistent Heuristic object guiding the forward search, None for a uniform cost search
+#  param    budget - Budget object limiting the search, defaults to no limits
+# return           - SolveResult holding the solution, or the lowest cost board the forward search reached if the
+#                    budget ran out
+def solve_puzzle_bidirectional(puzzle: Puzzle, heuristic: Heuristic = MANHATTAN_DISTANCE,
+                               budget: Budget = None) -> SolveResult:
+    check_consistent("Bidirectional A*", heuristic)
+    budget = budget or Budget()
+    budget.start()
+
+    if not puzzle.is_solvable():
+        print("\nNo solution found! Are you sure the puzzle was solvable?")
+        return SolveResult(UNSOLVABLE, None, budget.get_stats())
+
+    size = puzzle.board_size
+    bits = puzzle.tile_bits
+    mask = (1 << bits) - 1
+    neighbors = get_neighbors(size)
+    goal_tiles = [*range(1, size ** 2), 0]
+    goal = pack_board([goal_tiles[i * size:(i + 1) * size] for i in range(size)])
+
+    # Distance of each tile from its spot on the initial board, guiding the backward search
+    start_spot = {tile: k for k, tile in enumerate(puzzle.get_tiles())}
+    to_start = [[abs(k // size - start_spot[tile] // size) + abs(k % size - start_spot[tile] % size) if tile else 0
+                 for k in range(size ** 2)] for tile in range(size ** 2)]
+
+    stats = budget.stats
+    scorer = stats.time_heuristic(heuristic)
+
+    # Scores a full board for one side of the search (0 = forward, 1 = backward)
+    def evaluate(side: int, tiles: list[int]) -> int:
+        if heuristic is None:
+            return 0
+        if side == 0:
+            return scorer.evaluate(tiles, size)
+        return sum(to_start[tile][k] for k, tile in enumerate(tiles))
+
+    # Rescores a board for one side of the search after a tile slides from src into the blank at dst
+    def update(side: int, h: int, state: int, tile: int, src: int, dst: int) -> int:
+        if heuristic is None:
+            return 0
+        if side == 0:
+            tiles = PackedTiles(state, size, bits) if heuristic.needs_tiles else None
+            return scorer.update(h, tiles, size, tile, src, dst)
+        return h + to_start[tile][dst] - to_start[tile][src]
+
+    # Finishes the statistics of the search, every state reached by either side being held to detect repeats
+    def get_stats():
+        stats.generated, stats.duplicates, stats.max_frontier = generated, duplicates, max_frontier
+        stats.max_closed = len(sides[0][1]) + len(sides[1][1])
+        return budget.get_stats()
+
+    # Per side: live nodes keyed by f-cost, best g-cost of each reached state, and the (parent, move) of each state
+    sides = []
+    start_blank = puzzle.blank_pos[0] * size + puzzle.blank_pos[1]
+    for tiles, blank in (puzzle.get_tiles(), start_blank), (goal_tiles, size ** 2 - 1):
+        h = evaluate(len(sides), tiles)
+        state = pack_board([tiles[i * size:(i + 1) * size] for i in range(size)])
+        live_nodes = stats.time_queue(BucketQueue())
+        live_nodes.insert((state, blank, 0, h), h)
+        sides.append((live_nodes, {state: 0}, {state: None}))
+
+    best_cost, meeting_state = (0, goal) if puzzle.state == goal else (inf, None)
+    best_h, best_state = inf, puzzle.state
+
+    # Alternate between the forward (0) and backward (1) searches
+    side = 1
+    generated = duplicates = max_frontier = 0
+    profile = stats.profile
+    while sides[0][0] and sides[1][0]:
+        # No path through either frontier can beat the best meeting point once either frontier's f-cost reaches it
+        if max(sides[0][0].peek_key(), sides[1][0].peek_key()) >= best_cost:
+            break
+
+        side = 1 - side
+        live_nodes, costs, parents = sides[side]
+        other_costs = sides[1 - side][1]
+
+        state, blank, g, h = live_nodes.pop_root()
+        if g > costs[state]:
+            continue
+
+        if not budget.expand():
+            return SolveResult(budget.status, apply_moves(puzzle, get_path(sides[0][2], best_state), heuristic),
+                               get_stats())
+
+        if side == 0 and h < best_h:
+            best_h, best_state = h, state
+
+        if profile:
+            start = stats.get_clock()
+
+        generated += len(neighbors[blank])
+        for direction, src in neighbors[blank]:
+            tile = (state >> (src * bits)) & mask
+            child = state + (tile << (blank * bits)) - (tile << (src * bits))
+
+            # Re-open states reached through a cheaper path
+            if g + 1 >= costs.get(child, inf):
+                duplicates += 1
+                continue
+
+            costs[child] = g + 1
+            parents[child] = (state, direction)
+            child_h = update(side, h, state, tile, src, blank)
+            live_nodes.insert((child, src, g + 1, child_h), g + 1 + child_h)
+
+            # Check whether the two searches have met at this board
+            if (other := other_costs.get(child)) is not None and g + 1 + other < best_cost:
+                best_cost, meeting_state = g + 1 + other, child
+
+        if profile:
+            stats.move_time += stats.get_clock() - start
+        if (frontier := len(sides[0][0]) + len(sides[1][0])) > max_frontier:
+            max_frontier = frontier
+
+    if meeting_state is None:
+        print("\nNo solution found! Are you sure the puzzle was solvable?")
+        return SolveResult(UNSOLVABLE, None, get_stats())
+
+    # Stitch the forward half-path (initial board to meeting point) to the reversed backward half-path
+    moves = get_path(sides[0][2], meeting_state)
+    state = meeting_state
+    while (link := sides[1][2][state]) is not None:
+        state, direction = link
+        moves.append(OPPOSITE[direction])
+
+    return SolveResult(SOLVED, apply_moves(puzzle, moves, heuristic), get_stats())
+
+
+# Follows the parent links of a search back from a board state to the board the search started from
+#  param parents - dictionary mapping each reached state to its (parent state, direction), or None for the start
+#  param   state - integer holding the packed board state to trace back from
+# return   moves - array of directions leading from the start of the search to the state
+def get_path(parents: dict, state: int) -> list[int]:
+    moves = []
+    while (link := parents[state]) is not None:
+        state, direction = link
+        moves.append(direction)
+
+    moves.reverse()
+    return moves
+
+
+# Solvers that may be selected by the user, by name
+SOLVERS = {"Branch and Bound": solve_puzzle, "IDA*": solve_puzzle_ida, "Bidirectional A*": solve_puzzle_bidirectional}
+
+# Solvers that always return an optimal solution, extended alongside SOLVERS
+OPTIMAL_SOLVERS = {solve_puzzle_ida, solve_puzzle_bidirectional}
+
+# Bounded suboptimal solvers, each mapped to the keyword argument holding the bound on its solutions (as a multiple of
+# the optimal solution) and the bound's default, extended alongside SOLVERS
+SOLVER_BOUNDS = {}
+
+# Solvers whose guarantees only hold with a consistent heuristic, extended alongside SOLVERS
+# (e.g. bidirectional A* stops once neither frontier can improve on its best meeting point)
+CONSISTENT_SOLVERS = {solve_puzzle_bidirectional}
+
+
+# Finds the bound a solver guarantees on the cost of its solutions
+#  param solver - solver function, as registered in SOLVERS or with settings applied by functools.partial
+# return        - every solution costs at most this many times the optimal solution (1 for optimal solvers, inf for
+#                 solvers without a bound)
+def get_solver_bound(solver) -> float:
+    keywords = {}
+    while isinstance(solver, partial):
+        keywords = {**solver.keywords, **keywords}
+        solver = solver.func
+
+    if solver in OPTIMAL_SOLVERS:
+        return 1.0
+    if solver in SOLVER_BOUNDS:
+        name, default = SOLVER_BOUNDS[solver]
+        return keywords.get(name, default)
+    return inf
+
+
+# Finds the heuristics a solver may be used with
+#  param solver - solver function, as registered in SOLVERS
+# return        - dictionary mapping the name of each heuristic the solver may use to the heuristic
+def get_heuristics(solver) -> dict[str, Heuristic]:
+    if solver in CONSISTENT_SOLVERS:
+        return {name: heuristic for name, heuristic in HEURISTICS.items() if heuristic.consistent}
+    return HEURISTICS
+
+
+# Checks that a heuristic keeps the guarantees of a solver that needs a consistent one
+#  param    solver - name of the solver, used in the error message
+#  param heuristic - Heuristic object, or None for a uniform cost search
+def check_consistent(solver: str, heuristic: Heuristic | None):
+    if heuristic is not None and not heuristic.consistent:
+        raise ValueError(f"{solver} needs a consistent heuristic, and {heuristic.name} is not consistent")
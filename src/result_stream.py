@@ -0,0 +1,86 @@
+from __future__ import annotations
+from json import JSONDecodeError, dumps, loads
+from os import makedirs, path
+
+
+# Append-only file of timing results, one JSON line per trial, written as soon as each trial finishes
+# Every line holds the seed, configuration (solver, heuristic, and settings names), n, and trial of its trial, so an
+# interrupted sweep can be resumed by skipping the trials already on file for the same seed and configuration.
+# The file is read once, when the stream is opened, and every row written after that is kept in memory alongside
+# the rows read, so the stream must be the only writer of its file
+# attr file_name - path to the JSON lines file
+# attr  out_file - file object appended to, opened on the first write
+# attr      rows - array of every row on file, in the order they finished, or None until the stream is opened
+class ResultStream:
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.out_file = None
+        self.rows = None
+
+    def __enter__(self) -> ResultStream:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # Closes the file, keeping the rows in memory as every row on file was read or written by this stream
+    def close(self):
+        if self.out_file is not None:
+            self.out_file.close()
+            self.out_file = None
+
+    # Opens the stream to resume the file: cuts off a trailing line left partial by an interruption, so later rows
+    # append cleanly, and reads every complete row into memory. Does nothing once the stream is open
+    def open(self):
+        if self.rows is not None:
+            return
+
+        self.rows = []
+        if not path.exists(self.file_name):
+            return
+
+        with open(self.file_name, "rb+") as in_file:
+            data = in_file.read()
+            complete = data.rfind(b"\n") + 1
+            if complete < len(data):
+                in_file.truncate(complete)
+
+        for line in data[:complete].splitlines():
+            try:
+                self.rows.append(loads(line))
+            except JSONDecodeError:
+                continue
+
+    # Lists every complete row on file, opening the stream if needed
+    # return rows - array of dictionaries, one per trial, in the order they finished
+    def read(self) -> list[dict]:
+        self.open()
+        return self.rows
+
+    # Finds the rows of a sweep on file
+    #  param seed_str - seed of the sweep
+    #  param   config - dictionary holding the "solver", "heuristic", and "settings" names of the sweep
+    # return          - array of the rows with the same seed and configuration
+    def get_rows(self, seed_str: str, config: dict) -> list[dict]:
+        return [row for row in self.read()
+                if row["seed"] == seed_str and all(row.get(key) == value for key, value in config.items())]
+
+    # Finds the trials of a sweep that are already on file
+    #  param seed_str - seed of the sweep
+    #  param   config - dictionary holding the "solver", "heuristic", and "settings" names of the sweep
+    # return          - set of (n, trial) pairs already completed
+    def get_completed(self, seed_str: str, config: dict) -> set[tuple[int, int]]:
+        return {(row['n'], row["trial"]) for row in self.get_rows(seed_str, config)}
+
+    # Appends a row and flushes it to the file straight away
+    #  param row - dictionary holding the seed, configuration, n, and trial of the trial, and its results
+    def write(self, row: dict):
+        if self.out_file is None:
+            self.open()
+            if directory := path.dirname(self.file_name):
+                makedirs(directory, exist_ok=True)
+            self.out_file = open(self.file_name, 'a')
+
+        self.out_file.write(dumps(row) + "\n")
+        self.out_file.flush()
+        self.rows.append(row)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+from time import perf_counter
+
+# Constants
+NS_PER_SECOND = 1000000000  # Number of nanoseconds in a second, the unit of every time saved with the timing data
+
+# Columns each search adds to the timing data, in the order they are saved
+COLUMNS = ("expanded", "generated", "duplicates", "max_frontier", "max_closed", "solution_length",
+           "branching_factor", "move_time", "heuristic_time", "queue_time", "peak_memory")
+
+
+# Statistics about a single search, filled in by every solver through its Budget
+# Times spent on moves, the heuristic, and the queue, and the peak memory, are only measured when profiling, as
+# measuring them slows the search down. Work done in other processes is counted, but never profiled
+# attr         profile - indicates whether the times and the peak memory are measured
+# attr        expanded - number of nodes expanded
+# attr       generated - number of children generated
+# attr      duplicates - number of children dropped as repeats of a board already reached at least as cheaply
+# attr    max_frontier - largest number of boards waiting to be expanded at once (the deepest path for IDA*)
+# attr      max_closed - largest number of boards held at once to detect repeats
+# attr solution_length - number of moves in the solution, or None if no solution was found
+# attr       move_time - time spent generating and applying moves, and checking children for repeats [s]
+# attr  heuristic_time - time spent scoring boards with the heuristic [s]
+# attr      queue_time - time spent adding to and taking from the queue of live nodes [s]
+# attr     peak_memory - most memory allocated by Python during the search [bytes], or None if not profiled
+# attr         seconds - time taken by the search [s]
+# attr       solutions - array of (seconds since the start, cost, suboptimality bound) for each solution an anytime
+#                        (or weighted) solver found
+# attr           bound - the solution costs at most this many times the optimal solution, or None if not known
+# attr          cached - indicates whether the solution was read from the solution cache instead of searched for
+class SearchStats:
+    def __init__(self, profile: bool = False):
+        self.profile = profile
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.max_frontier = 0
+        self.max_closed = 0
+        self.solution_length = None
+        self.move_time = 0.0
+        self.heuristic_time = 0.0
+        self.queue_time = 0.0
+        self.peak_memory = None
+        self.seconds = 0.0
+        self.solutions = []
+        self.bound = None
+        self.cached = False
+
+    def __repr__(self) -> str:
+        return f"SearchStats(expanded={self.expanded}, generated={self.generated}, seconds={self.seconds:.4f})"
+
+    def __str__(self) -> str:
+        lines = ["Solution read from the solution cache"] if self.cached else []
+        lines += [f"Nodes expanded: {self.expanded}",
+                  f"Nodes generated: {self.generated}",
+                  f"Duplicates pruned: {self.duplicates}",
+                  f"Peak frontier size: {self.max_frontier}",
+                  f"Peak closed set size: {self.max_closed}"]
+
+        if self.solution_length is not None:
+            lines.append(f"Solution length: {self.solution_length} moves")
+        if (branching := self.get_branching_factor()) is not None:
+            lines.append(f"Effective branching factor: {branching:.4f}")
+
+        if self.profile:
+            lines.append(f"Time generating moves: {self.move_time:.4f} seconds")
+            lines.append(f"Time in the heuristic: {self.heuristic_time:.4f} seconds")
+            lines.append(f"Time in the queue: {self.queue_time:.4f} seconds")
+            if self.peak_memory is not None:
+                lines.append(f"Peak traced memory: {self.peak_memory / 1048576:.2f} MiB")
+
+        return "\n".join(lines)
+
+    # Raises the peak frontier and closed set sizes, if the given sizes exceed them
+    #  param frontier - number of boards waiting to be expanded
+    #  param   closed - number of boards held to detect repeats
+    def add_sizes(self, frontier: int, closed: int = 0):
+        if frontier > self.max_frontier:
+            self.max_frontier = frontier
+        if closed > self.max_closed:
+            self.max_closed = closed
+
+    # Records the length of a solution from its chain of parent nodes
+    #  param node - Puzzle object holding the solution, linked to the initial board through its parents
+    def set_solution(self, node):
+        length = 0
+        while node.parent is not None:
+            node = node.parent
+            length += 1
+
+        self.solution_length = length
+
+    # Computes the effective branching factor b, the branching of a uniform tree as deep as the solution that holds
+    # as many nodes as were generated: generated = b + b^2 + ... + b^d
+    # return branching - effective branching factor, or None if there was no solution to measure it against
+    def get_branching_factor(self) -> float | None:
+        depth, generated = self.solution_length, self.generated
+        if not depth or not generated:
+            return None
+
+        low, high = 0.0, max(1.0, float(generated))
+        for _ in range(64):
+            branching = (low + high) / 2
+            if sum(branching ** k for k in range(1, depth + 1)) < generated:
+                low = branching
+            else:
+                high = branching
+
+        return (low + high) / 2
+
+    # Reads a clock that stops while the heuristic or the queue is being timed, so that time spent in them can be
+    # left out of the time spent on moves
+    # return - current time, less the time measured in the heuristic and the queue [s]
+    def get_clock(self) -> float:
+        return perf_counter() - self.heuristic_time - self.queue_time
+
+    # Wraps a heuristic so the time spent scoring boards is measured, if profiling
+    #  param heuristic - Heuristic object used by the search
+    # return           - TimedHeuristic if profiling, else the same heuristic
+    def time_heuristic(self, heuristic):
+        return TimedHeuristic(heuristic, self) if self.profile and heuristic is not None else heuristic
+
+    # Wraps a queue of live nodes so the time spent adding to it and taking from it is measured, if profiling
+    #  param queue - BucketQueue or MinHeap used by the search
+    # return       - TimedQueue if profiling, else the same queue
+    def time_queue(self, queue):
+        return TimedQueue(queue, self) if self.profile else queue
+
+    # Collects the statistics saved with the timing data, with times in nanoseconds
+    # return - dictionary mapping each of COLUMNS to its value
+    def get_row(self) -> dict:
+        return {"expanded": self.expanded,
+                "generated": self.generated,
+                "duplicates": self.duplicates,
+                "max_frontier": self.max_frontier,
+                "max_closed": self.max_closed,
+                "solution_length": self.solution_length,
+                "branching_factor": self.get_branching_factor(),
+                "move_time": int(self.move_time * NS_PER_SECOND) if self.profile else None,
+                "heuristic_time": int(self.heuristic_time * NS_PER_SECOND) if self.profile else None,
+                "queue_time": int(self.queue_time * NS_PER_SECOND) if self.profile else None,
+                "peak_memory": self.peak_memory}
+
+
+# Heuristic that passes every call on to another heuristic, adding the time each call takes to a SearchStats object
+# attr heuristic - Heuristic object being timed
+# attr     stats - SearchStats object the time is added to
+class TimedHeuristic:
+    def __init__(self, heuristic, stats: SearchStats):
+        self.heuristic = heuristic
+        self.stats = stats
+        self.name = heuristic.name
+        self.needs_tiles = heuristic.needs_tiles
+
+    def evaluate(self, tiles, size: int) -> int:
+        start = perf_counter()
+        h = self.heuristic.evaluate(tiles, size)
+        self.stats.heuristic_time += perf_counter() - start
+        return h
+
+    def update(self, h: int, tiles, size: int, tile: int, src: int, dst: int) -> int:
+        start = perf_counter()
+        h = self.heuristic.update(h, tiles, size, tile, src, dst)
+        self.stats.heuristic_time += perf_counter() - start
+        return h
+
+
+# Queue of live nodes that passes every call on to another queue, timing each insert and pop in a SearchStats object
+# attr queue - BucketQueue or MinHeap being timed
+# attr stats - SearchStats object the time is added to
+class TimedQueue:
+    def __init__(self, queue, stats: SearchStats):
+        self.queue = queue
+        self.stats = stats
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def __bool__(self) -> bool:
+        return bool(self.queue)
+
+    # Any other attribute is read straight from the queue being timed
+    def __getattr__(self, name: str):
+        return getattr(self.queue, name)
+
+    def insert(self, new_node, key=None):
+        start = perf_counter()
+        self.queue.insert(new_node, key)
+        self.stats.queue_time += perf_counter() - start
+
+    def pop_root(self):
+        start = perf_counter()
+        node = self.queue.pop_root()
+        self.stats.queue_time += perf_counter() - start
+        return node
@@ -0,0 +1,301 @@
+# Local solver service: an HTTP server on localhost in front of a persistent pool of worker processes
+# Usage: python3 main.py serve [--port N] [--workers N] [--queue N] [--timeout SECONDS] [--preload NAME]
+#   POST /solve    {"board": [[...]], "solver": NAME, "heuristic": NAME, "timeout": SECONDS} -> solution of the board
+#   GET  /health   -> {"status": "ok", ...}
+#   GET  /metrics  -> request counters and latency percentiles
+from __future__ import annotations
+from collections import deque
+from functools import partial
+from json import JSONDecodeError, dumps, loads
+from os import cpu_count
+from threading import RLock
+from time import perf_counter
+
+# Local Dependencies
+from src.batch import DEFAULT_HEURISTIC, DEFAULT_SOLVER, JOBS_PER_WORKER, solve_board
+from src.input_handler import check_board
+from src.plugins import load_plugins
+from src.puzzle import HEURISTICS, SOLVERS, Puzzle, get_heuristics
+
+# Constants
+DEFAULT_HOST = "127.0.0.1"      # Address the service listens on, only reachable from this machine
+DEFAULT_PORT = 8615             # Port the service listens on
+DEFAULT_TIMEOUT = 60.0          # Longest time a single search may take, requests may only lower it [s]
+LATENCY_WINDOW = 10000          # Number of most recent request latencies the percentiles are computed over
+PERCENTILES = (50, 90, 99)      # Latency percentiles reported by /metrics
+PRELOAD_SIZES = (3, 4)          # Board sizes whose heuristic tables each worker loads when it starts
+
+
+# Adds the command line arguments of the serve subcommand to a parser
+#  param parser - ArgumentParser of the subcommand
+def add_serve_arguments(parser):
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"address to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--workers", type=int, default=cpu_count() or 1, help="worker processes solving boards")
+    parser.add_argument("--queue", type=int, help="searches queued or running before requests are turned away "
+                                                  f"(default: {JOBS_PER_WORKER} per worker)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="longest time a search may take [s]")
+    parser.add_argument("--preload", action="append", metavar="NAME",
+                        help=f"heuristic whose tables each worker loads at start (default: {DEFAULT_HEURISTIC})")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+
+
+# Prepares a worker process: registers every solver and heuristic, and loads the tables of the preloaded heuristics
+# Heuristics keep their tables between searches, so each worker only loads them once
+#  param preload - names of the heuristics to load
+#  param   sizes - board sizes to load their tables for
+def init_worker(preload: tuple[str, ...], sizes: tuple[int, ...]):
+    load_plugins()
+
+    for name in preload:
+        for size in sizes:
+            HEURISTICS[name].evaluate([*range(1, size ** 2), 0], size)
+
+
+# Solves a board in a worker process, looking the solver and heuristic up by name so the worker's own heuristic
+# objects (and the tables they hold) are used, rather than copies sent with every request
+#  param          board - 2D board to solve
+#  param    solver_name - name of the solver in SOLVERS
+#  param heuristic_name - name of the heuristic in HEURISTICS
+#  param        timeout - longest time the search may take [s]
+# return                - dictionary returned by solve_board()
+def solve_named(board: list[list[int]], solver_name: str, heuristic_name: str, timeout: float) -> dict:
+    return solve_board(board, SOLVERS[solver_name], HEURISTICS[heuristic_name], timeout)
+
+
+# Finds a named option, ignoring case
+#  param    name - name given in a request
+#  param options - dictionary mapping the name of each option to its value
+# return         - name of the option as registered, or None if there is no such option
+def find_name(name, options: dict) -> str | None:
+    if not isinstance(name, str):
+        return None
+
+    return next((key for key in options if key.lower() == name.lower()), None)
+
+
+# Computes percentiles of a set of values with the nearest rank method
+#  param       values - values to summarise
+#  param  percentiles - percentiles to compute, in range (0, 100]
+# return              - dictionary mapping "p50" style names to the percentiles, and "max" to the largest value
+def get_percentiles(values, percentiles=PERCENTILES) -> dict[str, float | None]:
+    ordered = sorted(values)
+    if not ordered:
+        return {**{f"p{percentile}": None for percentile in percentiles}, "max": None}
+
+    # The nearest rank of percentile p is the ceiling of p% of the number of values
+    return {**{f"p{percentile}": ordered[max(0, -(-percentile * len(ordered) // 100) - 1)]
+               for percentile in percentiles}, "max": ordered[-1]}
+
+
+# Solver service shared by every request thread
+# Concurrent requests for the same board, solver, heuristic, and timeout wait on a single search. Once as many
+# searches are queued or running as the queue allows, requests for new searches are turned away until one finishes
+# attr  executor - ProcessPoolExecutor running the searches, kept for the life of the service
+# attr   workers - number of worker processes
+# attr  capacity - most searches queued or running at once
+# attr   timeout - longest time a search may take [s]
+# attr  searches - dictionary mapping the key of each search queued or running to its Future
+# attr      lock - RLock guarding the searches, counts, and latencies
+# attr    counts - dictionary of request counters reported by /metrics
+# attr latencies - deque of the most recent request latencies [ms]
+# attr   started - time the service started [s]
+class SolverService:
+    def __init__(self, workers: int, capacity: int, timeout: float, preload: tuple[str, ...]):
+        # Imported here, so main.py does not pay for starting the multiprocessing machinery
+        from concurrent.futures import ProcessPoolExecutor, wait
+
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                            initargs=(preload, PRELOAD_SIZES))
+        self.workers = workers
+        self.capacity = capacity
+        self.timeout = timeout
+        self.searches = {}
+        self.lock = RLock()
+        self.counts = {"requests": 0, "searches": 0, "coalesced": 0, "rejected": 0, "invalid": 0, "failed": 0}
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.started = perf_counter()
+
+        # Start every worker now, so their tables are loaded before the first request arrives
+        wait([self.executor.submit(int) for _ in range(workers)])
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    # Answers a solve request, timing it
+    #  param request - dictionary decoded from the request body
+    # return  status - HTTP status code of the response
+    # return    body - dictionary sent back as JSON
+    def solve(self, request) -> tuple[int, dict]:
+        start = perf_counter()
+        status, body = self.run_search(request)
+
+        with self.lock:
+            self.counts["requests"] += 1
+            self.latencies.append((perf_counter() - start) * 1000)
+
+        return status, body
+
+    # Starts the search a request asks for, or joins an identical search already queued or running, and waits for it
+    #  param request - dictionary decoded from the request body
+    # return  status - HTTP status code of the response
+    # return    body - dictionary sent back as JSON
+    def run_search(self, request) -> tuple[int, dict]:
+        if (error := self.check_request(request)) is not None:
+            with self.lock:
+                self.counts["invalid"] += 1
+            return 400, {"error": error}
+
+        board = request["board"]
+        solver_name = find_name(request.get("solver", DEFAULT_SOLVER), SOLVERS)
+        heuristic_name = find_name(request.get("heuristic", DEFAULT_HEURISTIC), HEURISTICS)
+        timeout = min(self.timeout, request.get("timeout") or self.timeout)
+        key = (solver_name, heuristic_name, timeout, len(board), Puzzle(board=board).state)
+
+        with self.lock:
+            if coalesced := (future := self.searches.get(key)) is not None:
+                self.counts["coalesced"] += 1
+            elif len(self.searches) >= self.capacity:
+                self.counts["rejected"] += 1
+                return 503, {"error": "too many searches queued, retry later"}
+            else:
+                self.counts["searches"] += 1
+                future = self.searches[key] = self.executor.submit(solve_named, board, solver_name, heuristic_name,
+                                                                   timeout)
+                future.add_done_callback(partial(self.finish_search, key))
+
+        try:
+            return 200, {**future.result(), "coalesced": coalesced}
+        except Exception as error:
+            with self.lock:
+                self.counts["failed"] += 1
+            return 500, {"error": f"search failed: {error!r}"}
+
+    # Forgets a finished search, so the next request for its board starts a new one
+    #  param    key - key of the search
+    #  param future - Future of the search
+    def finish_search(self, key: tuple, future):
+        with self.lock:
+            if self.searches.get(key) is future:
+                del self.searches[key]
+
+    # Checks that a request holds a valid board and, if given, a known solver and heuristic and a positive timeout
+    #  param request - dictionary decoded from the request body
+    # return         - message describing what is wrong with the request, or None if it is valid
+    def check_request(self, request) -> str | None:
+        if not isinstance(request, dict):
+            return "request must be a JSON object"
+
+        board = request.get("board")
+        if not isinstance(board, list) or not all(isinstance(row, list) and all(type(tile) is int for tile in row)
+                                                  for row in board):
+            return "board must be an array of rows of integers"
+        if (error := check_board(board)) is not None:
+            return error
+
+        if (solver_name := find_name(request.get("solver", DEFAULT_SOLVER), SOLVERS)) is None:
+            return f"unknown solver, choose from: {', '.join(SOLVERS)}"
+        if (heuristic_name := find_name(request.get("heuristic", DEFAULT_HEURISTIC), HEURISTICS)) is None:
+            return f"unknown heuristic, choose from: {', '.join(HEURISTICS)}"
+        if heuristic_name not in (heuristics := get_heuristics(SOLVERS[solver_name])):
+            return f"{solver_name} needs a consistent heuristic, choose from: {', '.join(heuristics)}"
+
+        timeout = request.get("timeout")
+        if timeout is not None and (type(timeout) not in (int, float) or timeout <= 0):
+            return "timeout must be a positive number of seconds"
+
+        return None
+
+    # Describes whether the service is up
+    # return - dictionary sent back by /health
+    def get_health(self) -> dict:
+        with self.lock:
+            return {"status": "ok", "workers": self.workers, "searches": len(self.searches),
+                    "capacity": self.capacity, "uptime": perf_counter() - self.started}
+
+    # Collects the request counters and the latency percentiles of the most recent requests
+    # return - dictionary sent back by /metrics
+    def get_metrics(self) -> dict:
+        with self.lock:
+            return {**self.counts, "searches_in_flight": len(self.searches), "capacity": self.capacity,
+                    "latency_ms": get_percentiles(self.latencies), "latency_window": len(self.latencies),
+                    "uptime": perf_counter() - self.started}
+
+
+# Builds the request handler class of the HTTP server
+# http.server is slow to import, so it is only imported once the service is started rather than on every start of
+# main.py
+#  param service - SolverService answering the requests
+#  param verbose - indicates whether every request is logged
+# return         - BaseHTTPRequestHandler subclass answering requests with the service
+def make_handler(service: SolverService, verbose: bool):
+    from http.server import BaseHTTPRequestHandler
+
+    class SolverRequestHandler(BaseHTTPRequestHandler):
+        # Keep connections open between requests, so clients do not reconnect for every board
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if self.path == "/health":
+                self.send_json(200, service.get_health())
+            elif self.path == "/metrics":
+                self.send_json(200, service.get_metrics())
+            else:
+                self.send_json(404, {"error": f"unknown path {self.path}"})
+
+        def do_POST(self):
+            if self.path != "/solve":
+                self.send_json(404, {"error": f"unknown path {self.path}"})
+                return
+
+            try:
+                request = loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            except (JSONDecodeError, UnicodeDecodeError, ValueError):
+                self.send_json(400, {"error": "request body must be JSON"})
+                return
+
+            self.send_json(*service.solve(request))
+
+        # Sends a JSON response
+        #  param status - HTTP status code
+        #  param   body - dictionary to send as JSON
+        def send_json(self, status: int, body: dict):
+            data = dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            if status == 503:
+                self.send_header("Retry-After", "1")
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args):
+            if verbose:
+                super().log_message(format, *args)
+
+    return SolverRequestHandler
+
+
+# Runs the serve subcommand until interrupted
+#  param args - parsed command line arguments
+# return      - exit status
+def run_server(args) -> int:
+    from http.server import ThreadingHTTPServer
+
+    preload = tuple(find_name(name, HEURISTICS) or name for name in args.preload or (DEFAULT_HEURISTIC,))
+    if unknown := [name for name in preload if name not in HEURISTICS]:
+        raise SystemExit(f"ERROR: Unknown heuristic '{unknown[0]}', choose from: {', '.join(HEURISTICS)}")
+
+    service = SolverService(args.workers, args.queue or args.workers * JOBS_PER_WORKER, args.timeout, preload)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service, args.verbose))
+    print(f"Solving boards on http://{args.host}:{server.server_port} with {args.workers} workers (Ctrl+C to stop)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+    return 0
@@ -0,0 +1,269 @@
+from __future__ import annotations
+from collections import OrderedDict
+from math import inf
+from os import makedirs, path
+import sqlite3
+from threading import Lock
+
+# Local Dependencies
+from src.budget import SOLVED, Budget, SolveResult
+from src.puzzle import DOWN, LEFT, RIGHT, UP, Heuristic, Puzzle, apply_moves, get_moves, get_solver_bound
+
+# Constants
+CACHE_FILE = "./cache/solutions.sqlite3"    # SQLite file holding every cached solution
+MEMORY_CAPACITY = 4096                      # Most solutions held in memory before the least recently used is dropped
+SCHEMA_VERSION = 1                          # Version of the SQLite table, older files are migrated when opened
+
+# Mirroring a board about its main diagonal turns vertical moves into horizontal ones, and the reverse
+MIRROR_MOVES = {UP: LEFT, DOWN: RIGHT, LEFT: UP, RIGHT: DOWN}
+
+
+# Builds the tile relabelling that maps the solution board onto itself once mirrored about the main diagonal
+# The blank's solution spot lies on the diagonal, so only the numbered tiles need new labels
+#  param  size - length/width of the game board
+# return       - array where entry t is the new label of tile t
+def get_mirror_labels(size: int) -> list[int]:
+    if (labels := MIRROR_LABELS.get(size)) is None:
+        labels = [0]
+        for tile in range(1, size ** 2):
+            i, j = divmod(tile - 1, size)
+            labels.append(j * size + i + 1)
+        MIRROR_LABELS[size] = labels
+
+    return labels
+
+
+# Cache of the mirror relabelling of each board size
+MIRROR_LABELS = {}
+
+
+# Mirrors a board about its main diagonal and relabels its tiles, which keeps solution lengths unchanged
+# Applying the mirrored moves (MIRROR_MOVES) to the mirrored board solves it, so one cached entry serves both boards
+#  param puzzle - Puzzle object holding the board state
+# return        - packed board state of the mirrored board
+def mirror_state(puzzle: Puzzle) -> int:
+    size, bits = puzzle.board_size, puzzle.tile_bits
+    labels = get_mirror_labels(size)
+    tiles = puzzle.get_tiles()
+
+    state = 0
+    for i in range(size):
+        for j in range(size):
+            state |= labels[tiles[i * size + j]] << ((j * size + i) * bits)
+
+    return state
+
+
+# Reduces a board to the smaller packed state of itself and its mirror
+#  param  puzzle - Puzzle object holding the board state
+# return      key - (board size, canonical packed state) identifying the board and its mirror
+# return mirrored - indicates whether the canonical state is the mirror of the board
+def get_canonical_key(puzzle: Puzzle) -> tuple[tuple[int, int], bool]:
+    mirrored = mirror_state(puzzle)
+    if mirrored < puzzle.state:
+        return (puzzle.board_size, mirrored), True
+
+    return (puzzle.board_size, puzzle.state), False
+
+
+# Encodes a sequence of moves as a string of direction digits, mirroring each move if needed
+#  param    moves - sequence of directions to move the blank tile
+#  param mirrored - indicates whether the moves are mirrored about the main diagonal
+# return          - string holding one digit per move
+def encode_moves(moves, mirrored: bool = False) -> str:
+    return "".join(str(MIRROR_MOVES[move] if mirrored else move) for move in moves)
+
+
+# Decodes a string of direction digits back into a sequence of moves, mirroring each move if needed
+#  param    moves - string holding one digit per move
+#  param mirrored - indicates whether the moves are mirrored about the main diagonal
+# return          - array of directions to move the blank tile
+def decode_moves(moves: str, mirrored: bool = False) -> list[int]:
+    return [MIRROR_MOVES[int(move)] if mirrored else int(move) for move in moves]
+
+
+# Two layer cache of solved boards: the most recently used solutions in memory, and every solution in a SQLite file
+# Boards are keyed by their canonical packed state, so a board and its mirror share an entry. Each entry records the
+# proven bound on its solution (1 if optimal, inf if unknown), and only answers solvers that guarantee the same bound
+# or a looser one, so a solver is never answered with a solution it could not have returned itself
+# attr   file_name - path to the SQLite file, or None to keep solutions in memory only
+# attr    capacity - most solutions held in memory
+# attr     enabled - indicates whether solves read and write the cache, clear it to bypass the cache entirely
+# attr      memory - OrderedDict mapping canonical keys to (encoded moves, bound), least recently used first
+# attr  connection - SQLite connection, opened on first use
+# attr        lock - Lock serialising access, as solves may finish on other threads
+# attr        hits - number of solves answered from the cache
+# attr      misses - number of solves that had to search
+class SolutionCache:
+    def __init__(self, file_name: str | None = CACHE_FILE, capacity: int = MEMORY_CAPACITY):
+        self.file_name = file_name
+        self.capacity = capacity
+        self.enabled = True
+        self.memory = OrderedDict()
+        self.connection = None
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # Opens (and creates, if needed) the SQLite file
+    # Files written before bounds were recorded hold an optimal flag instead, which is turned into a bound of 1 or none
+    # return - SQLite connection, or None if solutions are kept in memory only
+    def connect(self) -> sqlite3.Connection | None:
+        if self.connection is None and self.file_name is not None:
+            if directory := path.dirname(self.file_name):
+                makedirs(directory, exist_ok=True)
+
+            connection = sqlite3.connect(self.file_name, check_same_thread=False)
+            with connection:
+                if connection.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                    columns = [row[1] for row in connection.execute("PRAGMA table_info(solutions)")]
+                    if "optimal" in columns:
+                        connection.execute("ALTER TABLE solutions RENAME COLUMN optimal TO bound")
+                        connection.execute("UPDATE solutions SET bound = CASE WHEN bound THEN 1.0 ELSE NULL END")
+
+                connection.execute("CREATE TABLE IF NOT EXISTS solutions (size INTEGER, state TEXT, moves TEXT, "
+                                   "bound REAL, PRIMARY KEY (size, state)) WITHOUT ROWID")
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+            self.connection = connection
+
+        return self.connection
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    # Drops every cached solution, in memory and on disk
+    def clear(self):
+        with self.lock:
+            self.memory.clear()
+            if (connection := self.connect()) is not None:
+                with connection:
+                    connection.execute("DELETE FROM solutions")
+
+    # Finds the cached entry of a canonical key, moving it to the most recently used end of the memory layer
+    #  param   key - (board size, canonical packed state)
+    # return entry - (encoded moves, bound), or None if the board has not been solved
+    def read(self, key: tuple[int, int]) -> tuple[str, float] | None:
+        if (entry := self.memory.get(key)) is not None:
+            self.memory.move_to_end(key)
+            return entry
+
+        if (connection := self.connect()) is None:
+            return None
+
+        row = connection.execute("SELECT moves, bound FROM solutions WHERE size = ? AND state = ?",
+                                 (key[0], format(key[1], 'x'))).fetchone()
+        if row is None:
+            return None
+
+        self.remember(key, entry := (row[0], inf if row[1] is None else row[1]))
+        return entry
+
+    # Adds an entry to the memory layer, dropping the least recently used entry when full
+    #  param   key - (board size, canonical packed state)
+    #  param entry - (encoded moves, bound)
+    def remember(self, key: tuple[int, int], entry: tuple[str, float]):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.capacity:
+            self.memory.popitem(last=False)
+
+    # Looks up the solution of a board
+    #  param puzzle - Puzzle object holding the board state
+    #  param  bound - loosest bound a cached solution may have (1 if only an optimal solution will do)
+    # return  moves - array of directions that solve the board, or None if no suitable solution is cached
+    # return  bound - proven bound of the cached solution, or None if no suitable solution is cached
+    def get(self, puzzle: Puzzle, bound: float = inf) -> tuple[list[int] | None, float | None]:
+        key, mirrored = get_canonical_key(puzzle)
+
+        with self.lock:
+            entry = self.read(key)
+
+        if entry is None or entry[1] > bound:
+            return None, None
+        return decode_moves(entry[0], mirrored), entry[1]
+
+    # Looks up the solution of a board as a solve would, counting the lookup as a hit or a miss
+    # Lookups are not counted, and always miss, while the cache is disabled
+    #  param puzzle - Puzzle object holding the board state
+    #  param  bound - loosest bound a cached solution may have (1 if only an optimal solution will do)
+    # return  moves - array of directions that solve the board, or None if no suitable solution is cached
+    # return  bound - proven bound of the cached solution, or None if no suitable solution is cached
+    def lookup(self, puzzle: Puzzle, bound: float = inf) -> tuple[list[int] | None, float | None]:
+        if not self.enabled:
+            return None, None
+
+        moves, bound = self.get(puzzle, bound)
+        if moves is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return moves, bound
+
+    # Saves the solution of a board, keeping the shorter of it and any solution already cached
+    # The shorter solution costs no more than the longer one, so it meets the bounds of both
+    #  param puzzle - Puzzle object holding the board state
+    #  param  moves - sequence of directions that solve the board
+    #  param  bound - proven bound on the solution (1 if it is optimal, inf if there is none)
+    def put(self, puzzle: Puzzle, moves, bound: float = inf):
+        key, mirrored = get_canonical_key(puzzle)
+        entry = (encode_moves(moves, mirrored), bound)
+
+        with self.lock:
+            if (cached := self.read(key)) is not None:
+                if len(cached[0]) <= len(moves):
+                    if cached[1] <= bound:
+                        return
+                    entry = (cached[0], bound)
+                else:
+                    entry = (entry[0], min(bound, cached[1]))
+
+            self.remember(key, entry)
+            if (connection := self.connect()) is not None:
+                with connection:
+                    connection.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?)",
+                                       (key[0], format(key[1], 'x'), entry[0],
+                                        None if entry[1] == inf else entry[1]))
+
+    # Solves a board with a solver, answering from the cache when possible and saving every new solution
+    # Takes the solver's own arguments, so it can stand in for any solver
+    #  param    solver - function solving the board, called as solver(puzzle, heuristic, budget)
+    #  param    puzzle - Puzzle object holding the initial board state
+    #  param heuristic - Heuristic object passed on to the solver
+    #  param    budget - Budget object limiting the search, defaults to no limits
+    # return           - SolveResult from the cache (with stats.cached and stats.bound set) or from the solver
+    def solve(self, solver, puzzle: Puzzle, heuristic: Heuristic = None, budget: Budget = None) -> SolveResult:
+        # Solvers with settings already applied may hold their own budget, so only pass one on when given
+        kwargs = {} if budget is None else {"budget": budget}
+        if not self.enabled:
+            return solver(puzzle, heuristic, **kwargs)
+
+        # Only a solution within the bound the solver guarantees may stand in for its own
+        bound = get_solver_bound(solver)
+        moves, cached_bound = self.lookup(puzzle, bound)
+        if moves is not None:
+            budget = budget or Budget()
+            budget.start()
+
+            # Replay the moves so the result holds the same chain of nodes a search would have returned
+            node = apply_moves(puzzle, moves, heuristic)
+            stats = budget.get_stats()
+            stats.cached = True
+            stats.bound = None if cached_bound == inf else cached_bound
+            return SolveResult(SOLVED, node, stats)
+
+        result = solver(puzzle, heuristic, **kwargs)
+        if result.is_solved():
+            # A solver may prove a tighter bound than it guarantees, e.g. ARA* once it lowers its weight
+            if result.stats.bound is not None:
+                bound = min(bound, result.stats.bound)
+            self.put(puzzle, get_moves(result.node), bound)
+
+        return result
+
+
+# Shared solution cache, used by the GUI and by repeated solves of an imported board
+SOLUTION_CACHE = SolutionCache()
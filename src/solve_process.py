@@ -0,0 +1,119 @@
+from __future__ import annotations
+from multiprocessing import Pipe, Process
+from time import perf_counter
+
+# Local Dependencies
+from src.budget import Budget, CancelToken
+from src.puzzle import Heuristic, Puzzle, get_moves
+
+# Constants
+PROGRESS_INTERVAL = 0.1     # Shortest time between progress reports sent by the solving process [s]
+STOP_TIMEOUT = 2.0          # Time a cancelled solving process is given to stop before it is killed [s]
+
+# Messages sent over the pipe between the two processes
+PROGRESS = "progress"       # Solving process -> caller: (PROGRESS, nodes expanded, best cost, seconds since the start)
+RESULT = "result"           # Solving process -> caller: (RESULT, status, moves as bytes or None)
+CANCEL = "cancel"           # Caller -> solving process: stop the search as soon as possible
+
+# Status of a solve whose process exited without sending a result
+FAILED = "failed"
+
+
+# Solves a board, run in the solving process
+# Progress is sent at most every PROGRESS_INTERVAL, from the budget's checks, which also look for a cancel message
+# The solution is sent back as the bytes of its moves rather than as a chain of Puzzle objects
+#  param connection - Connection to the caller
+#  param     solver - function used to solve the board
+#  param      state - packed initial board state
+#  param       size - length/width of the board
+#  param  heuristic - Heuristic object used by the solver
+#  param    seconds - longest time the search may take [s], or None for no limit
+def run_solve(connection, solver, state: int, size: int, heuristic: Heuristic, seconds: float | None):
+    token = CancelToken()
+    budget = Budget(token, max_seconds=seconds)
+    next_report = 0.0
+
+    def report_progress(budget: Budget):
+        nonlocal next_report
+        if (now := perf_counter()) < next_report:
+            return
+        next_report = now + PROGRESS_INTERVAL
+
+        # Any message from the caller, or the caller closing its end of the pipe, cancels the search
+        try:
+            if connection.poll():
+                token.cancel()
+            else:
+                connection.send((PROGRESS, budget.nodes, budget.best_cost, now - budget.start_time))
+        except (EOFError, OSError):
+            token.cancel()
+
+    budget.progress = report_progress
+    result = solver(Puzzle(state=state, size=size, heuristic=heuristic), heuristic, budget)
+    moves = bytes(get_moves(result.node)) if result.is_solved() else None
+
+    try:
+        connection.send((RESULT, result.status, moves))
+    except OSError:
+        pass
+    finally:
+        connection.close()
+
+
+# Solve running in a separate process, so a search holding the GIL cannot stall the caller
+# The search is not a daemon process, as parallel solvers start processes of their own
+# attr     solver - function used to solve the board
+# attr     puzzle - Puzzle object holding the initial board state
+# attr connection - Connection to the solving process
+# attr    process - Process running the search
+# attr   progress - (nodes expanded, best cost or None, seconds since the start) of the latest report, or None
+# attr     result - (status, array of moves or None) once the search has finished, else None
+class SolveProcess:
+    def __init__(self, solver, puzzle: Puzzle, heuristic: Heuristic, seconds: float | None = None):
+        self.solver = solver
+        self.puzzle = puzzle
+        self.connection, child_connection = Pipe()
+        self.process = Process(target=run_solve, args=(child_connection, solver, puzzle.state, puzzle.board_size,
+                                                       heuristic, seconds))
+        self.progress = None
+        self.result = None
+
+        self.process.start()
+        child_connection.close()
+
+    # Reads every message sent since the last call, without waiting for more
+    # return  True - if the search has finished, with its outcome held in result
+    # return False - if the search is still running
+    def poll(self) -> bool:
+        try:
+            while self.result is None and self.connection.poll():
+                kind, *message = self.connection.recv()
+                if kind == PROGRESS:
+                    self.progress = tuple(message)
+                else:
+                    status, moves = message
+                    self.result = status, None if moves is None else list(moves)
+        except (EOFError, OSError):
+            self.result = FAILED, None
+
+        if self.result is not None and not self.connection.closed:
+            self.connection.close()
+            self.process.join()
+
+        return self.result is not None
+
+    # Asks the search to stop, leaving the process to exit on its own
+    #  param timeout - time to wait for the process to exit before killing it [s], or None to not wait
+    def cancel(self, timeout: float | None = None):
+        if not self.connection.closed:
+            try:
+                self.connection.send(CANCEL)
+            except OSError:
+                pass
+            self.connection.close()
+
+        if timeout is not None:
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
@@ -0,0 +1,213 @@
+from __future__ import annotations
+from array import array
+
+# Constants
+MAX_PACKED_BITS = 64        # Largest packed state [bits] that fits in a slot (no valid state sets every bit)
+MAX_WIDE_BITS = 128         # Largest packed state [bits] that fits in a two word slot, e.g. the 125 bits of a 5x5 board
+MIN_CAPACITY = 1 << 10      # Number of slots in a new table
+MAX_LOAD = 0.75             # Fraction of slots that may be filled before the table grows
+GROWTH = 1.5                # Factor the number of slots grows by, keeping the table between half and 3/4 full
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15    # Odd 64-bit constant used to spread packed states over the table
+HASH_MASK = (1 << 64) - 1
+
+
+# Closed set of packed board states, stored in a flat array of 64-bit slots with open addressing
+# Each state costs 8 bytes per slot (plus 2 bytes when g-values are kept) instead of a Python object per state
+# attr     keys - array of slots holding each state plus one, so that zero marks an empty slot
+# attr   values - array of g-values at the same index as their state, or None if g-values are not kept
+# attr capacity - number of slots in the table
+# attr   length - number of states in the table
+# attr max_fill - number of states the table holds before it grows
+# attr  store_g - indicates whether a g-value is stored with each state
+class StateTable:
+    def __init__(self, store_g: bool = False, capacity: int = MIN_CAPACITY):
+        self.keys = None
+        self.values = None
+        self.capacity = 0
+        self.length = 0
+        self.max_fill = 0
+        self.store_g = store_g
+
+        self.allocate(max(MIN_CAPACITY, capacity))
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __contains__(self, state: int) -> bool:
+        return self.keys[self.find_slot(state)] != 0
+
+    # Allocates empty slot arrays of a given size
+    # param capacity - number of slots
+    def allocate(self, capacity: int):
+        self.keys = array('Q', bytes(8 * capacity))
+        self.values = array('H', bytes(2 * capacity)) if self.store_g else None
+        self.capacity = capacity
+        self.max_fill = int(capacity * MAX_LOAD)
+
+    # Finds the slot holding a state, or the empty slot it would be stored in
+    #  param state - integer holding a packed board state
+    # return  slot - index into the slot arrays
+    def find_slot(self, state: int) -> int:
+        keys, capacity, key = self.keys, self.capacity, state + 1
+
+        # Scale the hashed state from [0, 2^64) down to [0, capacity)
+        slot = ((state * HASH_MULTIPLIER) & HASH_MASK) * capacity >> 64
+
+        # Probe forward until the state or an empty slot is found
+        while keys[slot] and keys[slot] != key:
+            slot += 1
+            if slot == capacity:
+                slot = 0
+
+        return slot
+
+    # Adds a state to the table, or updates its g-value if it is already present
+    #  param state - integer holding a packed board state
+    #  param     g - number of moves taken to reach the state
+    # return  True - if the state was not in the table before
+    # return False - if the state was already in the table
+    def add(self, state: int, g: int = 0) -> bool:
+        slot = self.find_slot(state)
+        is_new = not self.keys[slot]
+
+        if is_new:
+            if self.length >= self.max_fill:
+                self.resize()
+                slot = self.find_slot(state)
+
+            self.keys[slot] = state + 1
+            self.length += 1
+
+        if self.values is not None:
+            self.values[slot] = g
+
+        return is_new
+
+    # Retrieves the g-value stored with a state
+    #  param   state - integer holding a packed board state
+    #  param default - value returned if the state is not in the table
+    # return         - g-value of the state, or default if not present
+    def get(self, state: int, default: int | None = None) -> int | None:
+        slot = self.find_slot(state)
+
+        if not self.keys[slot]:
+            return default
+
+        return self.values[slot] if self.values is not None else 0
+
+    # Grows the number of slots and reinserts every state
+    def resize(self):
+        keys, values = self.keys, self.values
+        self.allocate(int(self.capacity * GROWTH))
+
+        for slot, key in enumerate(keys):
+            if key:
+                new_slot = self.find_slot(key - 1)
+                self.keys[new_slot] = key
+                if values is not None:
+                    self.values[new_slot] = values[slot]
+
+    # Computes the memory used by the slot arrays
+    # return - number of bytes allocated for the table
+    def get_memory(self) -> int:
+        return self.keys.itemsize * len(self.keys) + (self.values.itemsize * len(self.values) if self.store_g else 0)
+
+
+# Closed set of packed board states too large for a 64-bit slot, stored in two flat arrays of 64-bit words
+# Each state costs 16 bytes per slot (plus 2 bytes when g-values are kept). The low word of a state is never all ones
+# (no tile label sets every bit of its field), so it is stored plus one, and zero still marks an empty slot
+# attr highs - array of slots holding the bits of each state above the low 64
+class WideStateTable(StateTable):
+    def __init__(self, store_g: bool = False, capacity: int = MIN_CAPACITY):
+        self.highs = None
+        super().__init__(store_g, capacity)
+
+    def allocate(self, capacity: int):
+        super().allocate(capacity)
+        self.highs = array('Q', bytes(8 * capacity))
+
+    def find_slot(self, state: int) -> int:
+        keys, highs, capacity = self.keys, self.highs, self.capacity
+        low, high = (state & HASH_MASK) + 1, state >> 64
+
+        # Fold both words into the hash, so states differing only in their high word are spread too
+        slot = (((low ^ high) * HASH_MULTIPLIER) & HASH_MASK) * capacity >> 64
+
+        while keys[slot] and (keys[slot] != low or highs[slot] != high):
+            slot += 1
+            if slot == capacity:
+                slot = 0
+
+        return slot
+
+    def add(self, state: int, g: int = 0) -> bool:
+        slot = self.find_slot(state)
+        is_new = not self.keys[slot]
+
+        if is_new:
+            if self.length >= self.max_fill:
+                self.resize()
+                slot = self.find_slot(state)
+
+            self.keys[slot] = (state & HASH_MASK) + 1
+            self.highs[slot] = state >> 64
+            self.length += 1
+
+        if self.values is not None:
+            self.values[slot] = g
+
+        return is_new
+
+    def resize(self):
+        keys, highs, values = self.keys, self.highs, self.values
+        self.allocate(int(self.capacity * GROWTH))
+
+        for slot, key in enumerate(keys):
+            if key:
+                state = highs[slot] << 64 | key - 1
+                new_slot = self.find_slot(state)
+                self.keys[new_slot] = key
+                self.highs[new_slot] = highs[slot]
+                if values is not None:
+                    self.values[new_slot] = values[slot]
+
+    def get_memory(self) -> int:
+        return super().get_memory() + self.highs.itemsize * len(self.highs)
+
+
+# Closed set of packed board states backed by a dictionary, for states too large for a two word slot
+# attr  states - dictionary mapping each state to its g-value
+# attr store_g - indicates whether a g-value is stored with each state (always kept, for a matching interface)
+class DictStateTable:
+    def __init__(self, store_g: bool = False):
+        self.states = {}
+        self.store_g = store_g
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def __contains__(self, state: int) -> bool:
+        return state in self.states
+
+    def add(self, state: int, g: int = 0) -> bool:
+        is_new = state not in self.states
+        self.states[state] = g
+        return is_new
+
+    def get(self, state: int, default: int | None = None) -> int | None:
+        return self.states.get(state, default)
+
+
+# Creates the closed set used to hold the board states a search has already reached
+#  param    size - length/width of the game board
+#  param store_g - indicates whether a g-value is stored with each state
+# return         - StateTable if the board's packed states fit in 64 bits (up to 4x4), WideStateTable if they fit in
+#                  128 bits (5x5), else DictStateTable, which costs a Python object per state
+def make_state_table(size: int, store_g: bool = False) -> StateTable | WideStateTable | DictStateTable:
+    bits = size ** 2 * max(1, (size ** 2 - 1).bit_length())
+    if bits <= MAX_PACKED_BITS:
+        return StateTable(store_g)
+    if bits <= MAX_WIDE_BITS:
+        return WideStateTable(store_g)
+
+    return DictStateTable(store_g)
@@ -1,12 +1,16 @@
 import matplotlib.pyplot as plt
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from os import cpu_count
 from random import seed
-from time import perf_counter_ns
+from time import perf_counter_ns, process_time_ns
 from tqdm import tqdm
 
 # Local Dependencies
-from src.input_handler import get_int_from_user
-from src.puzzle import Puzzle, solve_puzzle
+from src.input_handler import get_int_from_user, get_named_option_from_user, get_solver_settings
+from src.puzzle import SOLVERS, Puzzle, get_heuristics
+from src.result_stream import ResultStream
+from src.search_stats import COLUMNS, NS_PER_SECOND
 
 # Constants
 DATAFRAMES = "./dataframes/"            # Directory for importing/exporting .csv files
@@ -17,10 +21,25 @@ CHART_DPI = 300                         # DPI of exported plots
 MEAN_SYM = "--"                         # Symbol used for plotting mean times
 ALL_SYM = 'x'                           # Symbol used for plotting individual times
 
+# Columns of the dataframes holding every run, and every solution found by an anytime solver
+ALL_COLUMNS = ('n', "time", "cpu_time", *COLUMNS)
+ANYTIME_COLUMNS = ('n', "trial", "time", "cost", "bound")
+
 # Chart labels
 X_AXIS = "Puzzle size [n]"
 Y_AXIS = "Time [ns]"
 CHART_TITLE = "n-Puzzle Solver Algorithm Analysis\nGrid Size vs Time Required"
+STATS_TITLE = "n-Puzzle Solver Algorithm Analysis\nGrid Size vs Search Statistics"
+
+# Search statistics plotted next to the time, as (chart title, y-axis label, log scale, columns plotted)
+STATS_CHARTS = (
+    ("Time", Y_AXIS, True, ("time", "cpu_time")),
+    ("Nodes", "Nodes", True, ("expanded", "generated", "duplicates")),
+    ("Peak boards held", "Boards", True, ("max_frontier", "max_closed")),
+    ("Effective branching factor", "Branching factor", False, ("branching_factor",)),
+    ("Profiled time", Y_AXIS, True, ("move_time", "heuristic_time", "queue_time")),
+    ("Peak traced memory", "Memory [bytes]", True, ("peak_memory",)),
+)
 
 # Color mapping (hex color codes)
 COLORS = {
@@ -39,11 +58,14 @@ COLORS = {
 # attr      debug - enables debug mode when True
 # attr       user - username of the user executing the program
 # attr      users - list of power users and current user
-# attr dataframes - dictionary of dataframes for each user
+# attr dataframes - dictionary of dataframes for each user, with every solution found by an anytime solver kept apart
+# attr     stream - ResultStream the current user's runs are appended to as they finish
+# attr    workers - number of worker processes used to gather data, or None to prompt the user
 class Plotting:
-    def __init__(self, debug: bool):
+    def __init__(self, debug: bool, workers: int = None):
         self.debug = debug
-        
+        self.workers = workers
+
         # Force user to enter a non-empty string for their username
         self.user = ""
         while not self.user:
@@ -55,15 +77,13 @@ class Plotting:
 
         # Add dataframes for each power user and for the current user
         self.dataframes = {name:
-                           {"all":  pd.DataFrame(columns=['n', "time"]),
-                            "mean": pd.DataFrame(columns=['n', "time"])}
+                           {"all":  pd.DataFrame(columns=ALL_COLUMNS),
+                            "mean": pd.DataFrame(columns=ALL_COLUMNS),
+                            "anytime": pd.DataFrame(columns=ANYTIME_COLUMNS)}
                            for name in self.users
                            }
 
-    # Add the timing data of an individual run to the input dataframe
-    def add_numbers_to_dataframe(self, n: int, time: int):
-        self.dataframes[self.user]["all"].loc[-1] = [n, time]
-        self.dataframes[self.user]["all"].index += 1
+        self.stream = ResultStream(f"{DATAFRAMES}{self.user}_runs.jsonl")
 
     # Reads in dataframes for all users from .csv files in the dataframes directory
     def read_csv(self):
@@ -111,34 +131,183 @@ class Plotting:
         if self.debug:
             plt.show()
 
+    # Generates and exports a plot of the current user's mean search statistics, with the time alongside them
+    # Statistics missing from older data, or not measured because the solver was not profiled, are left blank
+    def plot_stats(self):
+        mean = self.dataframes[self.user]["mean"]
+        figure, axes = plt.subplots(2, 3, figsize=CHART_SIZE)
+        colors = list(COLORS.values())[::2]
+
+        for axis, (title, y_label, log_scale, columns) in zip(axes.flat, STATS_CHARTS):
+            for column, color in zip(columns, colors):
+                if column in mean and mean[column].notna().any():
+                    axis.plot(mean['n'].to_numpy(), mean[column].to_numpy(), MEAN_SYM, color=color, label=column)
+
+            axis.set_title(title)
+            axis.set_xlabel(X_AXIS)
+            axis.set_ylabel(y_label)
+            if axis.has_data():
+                axis.legend()
+                if log_scale:
+                    axis.set_yscale("log")
+
+        figure.suptitle(STATS_TITLE)
+        figure.tight_layout()
+
+        # Save the plot
+        output_file_name = f"{PLOTS}{self.user}_stats.png"
+        figure.savefig(output_file_name, dpi=CHART_DPI)
+        print(f"\nSearch statistics plot exported to {output_file_name}")
+
+        if self.debug:
+            plt.show()
+
     # Gathers timing data for a variable number of grid sizes and test runs
+    # Each run is appended to the current user's stream as it finishes, and runs of the same seed and configuration
+    # (solver, heuristic, and settings) already on file are skipped, so an interrupted sweep resumes where it stopped
+    # when started again with the same seed and configuration
     def get_experimental_data(self):
-        seed(input("Enter a seed:\n$ "))
+        seed_str = input("Enter a seed:\n$ ")
         min_val = get_int_from_user("Enter minimum grid width", 1)
         max_val = get_int_from_user("Enter maximum grid width", min_val)
         num_tests = get_int_from_user("Enter desired number of tests", 1)
+        solver_name, solver = get_named_option_from_user("Select a solver", SOLVERS)
+        heuristics = get_heuristics(solver)
+        solver, settings = get_solver_settings(solver)
+        heuristic_name, heuristic = get_named_option_from_user("Select a heuristic", heuristics)
+        config = {"solver": solver_name, "heuristic": heuristic_name, "settings": settings}
+
+        workers = self.workers
+        if workers is None:
+            workers = get_int_from_user(f"Enter number of worker processes ({cpu_count()} CPUs available)", 1)
+
+        completed = self.stream.get_completed(seed_str, config)
+        jobs = [(n, trial) for n in range(min_val, max_val + 1) for trial in range(num_tests)
+                if (n, trial) not in completed]
+        if skipped := (max_val - min_val + 1) * num_tests - len(jobs):
+            print(f"\nResuming seed {seed_str!r}: skipping {skipped} completed runs")
+
+        with self.stream:
+            if workers > 1:
+                self.get_parallel_data(seed_str, config, jobs, solver, heuristic, workers)
+            else:
+                self.get_serial_data(seed_str, config, jobs, solver, heuristic)
 
-        puzzle = Puzzle(size=min_val)
+        self.save_experimental_data(seed_str, config, min_val, max_val)
 
-        # Loop for each grid size
-        for n in tqdm(range(min_val, max_val + 1), desc="Computing", unit="size", colour="CYAN", mininterval=0):
-            # Loop for each test run, storing the timing data to a dataframe
-            for _ in tqdm(range(num_tests), desc=f"{n ** 2 - 1:>2} Puzzle", unit="test", colour="CYAN", mininterval=0):
-                puzzle.generate(n)
+    # Gathers timing data in this process
+    #  param  seed_str - seed shared by every job
+    #  param    config - dictionary holding the "solver", "heuristic", and "settings" names written to every row
+    #  param      jobs - array of (grid width, trial) pairs to run
+    #  param    solver - function used to solve each puzzle
+    #  param heuristic - heuristic used by the solver
+    def get_serial_data(self, seed_str: str, config: dict, jobs: list[tuple[int, int]], solver, heuristic):
+        overall, bars = make_progress_bars(jobs)
 
-                start_time = perf_counter_ns()
-                solve_puzzle(puzzle)
-                self.add_numbers_to_dataframe(n, perf_counter_ns() - start_time)
+        for n, trial in jobs:
+            self.stream.write(run_trial(seed_str, config, n, trial, solver, heuristic))
+            bars[n].update()
+            overall.update()
 
-        # Calculate the mean time for each grid size on the input dataframe
-        self.dataframes[self.user]["mean"] = self.dataframes[self.user]["all"].groupby('n')["time"].mean().reset_index()
+        for bar in (*bars.values(), overall):
+            bar.close()
+
+    # Gathers timing data across a pool of worker processes
+    # Results are streamed in the order they finish, but each puzzle is seeded from its (seed, n, trial) job, so the
+    # same seed always produces the same set of puzzles
+    #  param  seed_str - seed shared by every job
+    #  param    config - dictionary holding the "solver", "heuristic", and "settings" names written to every row
+    #  param      jobs - array of (grid width, trial) pairs to run
+    #  param    solver - function used to solve each puzzle
+    #  param heuristic - heuristic used by the solver
+    #  param   workers - number of worker processes
+    def get_parallel_data(self, seed_str: str, config: dict, jobs: list[tuple[int, int]], solver, heuristic,
+                          workers: int):
+        overall, bars = make_progress_bars(jobs)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_trial, seed_str, config, n, trial, solver, heuristic)
+                       for n, trial in jobs]
+
+            for future in as_completed(futures):
+                row = future.result()
+                self.stream.write(row)
+                bars[row['n']].update()
+                overall.update()
+
+        for bar in (*bars.values(), overall):
+            bar.close()
+
+    # Builds the current user's dataframes from the runs of a sweep in a single pass over the stream, calculates the
+    # mean times and statistics, and saves the dataframes to .csv files
+    # Only the runs of the sweep's seed and configuration within its grid widths are used, so runs of other sweeps on
+    # file under the same seed are never mixed in
+    #  param seed_str - seed of the sweep whose runs are saved
+    #  param   config - dictionary holding the "solver", "heuristic", and "settings" names of the sweep
+    #  param  min_val - minimum grid width of the sweep
+    #  param  max_val - maximum grid width of the sweep
+    def save_experimental_data(self, seed_str: str, config: dict, min_val: int, max_val: int):
+        dataframes = self.dataframes[self.user]
+        runs, solutions = [], []
+
+        for row in sorted((row for row in self.stream.get_rows(seed_str, config) if min_val <= row['n'] <= max_val),
+                          key=lambda row: (row['n'], row["trial"])):
+            runs.append([row.get(column) for column in ALL_COLUMNS])
+            solutions.extend([row['n'], row["trial"], *solution] for solution in row["solutions"])
+
+        # Counts stay integers, left blank where a statistic was not measured
+        integers = {column: "Int64" for column in ALL_COLUMNS if column != "branching_factor"}
+        dataframes["all"] = pd.DataFrame(runs, columns=ALL_COLUMNS).apply(pd.to_numeric).astype(integers)
+        dataframes["mean"] = dataframes["all"].groupby('n').mean().reset_index()
+        dataframes["anytime"] = pd.DataFrame(solutions, columns=ANYTIME_COLUMNS)
 
         # Save the input dataframes to .csv files
-        self.dataframes[self.user]["all"].to_csv(DATAFRAMES + self.user + '_all.csv', index=False)
-        self.dataframes[self.user]["mean"].to_csv(DATAFRAMES + self.user + '_mean.csv', index=False)
+        dataframes["all"].to_csv(DATAFRAMES + self.user + '_all.csv', index=False)
+        dataframes["mean"].to_csv(DATAFRAMES + self.user + '_mean.csv', index=False)
+        if not dataframes["anytime"].empty:
+            dataframes["anytime"].to_csv(DATAFRAMES + self.user + '_anytime.csv', index=False)
 
         if self.debug:
-            print_df(self.dataframes[self.user])
+            print_df(dataframes)
+
+
+# Creates the progress bars for a set of jobs, one for every grid width and one for all of them
+#  param    jobs - array of (grid width, trial) pairs to run
+# return overall - tqdm progress bar counting every job
+# return    bars - dictionary mapping each grid width to the tqdm progress bar counting its jobs
+def make_progress_bars(jobs: list[tuple[int, int]]) -> tuple[tqdm, dict[int, tqdm]]:
+    totals = {}
+    for n, _ in jobs:
+        totals[n] = totals.get(n, 0) + 1
+
+    overall = tqdm(total=len(jobs), desc="Computing", unit="test", colour="CYAN", mininterval=0)
+    bars = {n: tqdm(total=total, desc=f"{n ** 2 - 1:>2} Puzzle", unit="test", colour="CYAN", mininterval=0,
+                    position=i + 1) for i, (n, total) in enumerate(totals.items())}
+
+    return overall, bars
+
+
+# Generates and solves a single puzzle, seeding the random sequence from the job so any process can reproduce it
+#  param  seed_str - seed shared by every job
+#  param    config - dictionary holding the "solver", "heuristic", and "settings" names of the sweep
+#  param         n - length/width of the game board
+#  param     trial - index of the test run for this grid width
+#  param    solver - function used to solve the puzzle
+#  param heuristic - heuristic used by the solver
+# return       row - dictionary holding the seed, configuration, n, and trial, wall and CPU time [ns], search
+#                    statistics, and every solution an anytime solver found as (time [ns], cost, suboptimality bound)
+def run_trial(seed_str: str, config: dict, n: int, trial: int, solver, heuristic) -> dict:
+    seed(f"{seed_str}:{n}:{trial}")
+    puzzle = Puzzle(size=n, heuristic=heuristic)
+
+    start_time, start_cpu = perf_counter_ns(), process_time_ns()
+    result = solver(puzzle, heuristic)
+    time, cpu_time = perf_counter_ns() - start_time, process_time_ns() - start_cpu
+
+    return {"seed": seed_str, **config, 'n': n, "trial": trial, "time": time, "cpu_time": cpu_time,
+            **result.stats.get_row(),
+            "solutions": [(int(seconds * NS_PER_SECOND), cost, bound)
+                          for seconds, cost, bound in result.stats.solutions]}
 
 
 # Prints a dataframe with nice formatting
@@ -0,0 +1,157 @@
+from __future__ import annotations
+from json import dump, load
+from os import makedirs, replace
+
+# Local Dependencies
+from src.paths import TABLES
+from src.puzzle import HEURISTICS, MANHATTAN_DISTANCE, Heuristic
+
+# Constants
+MAX_TABLE_SIZE = 4      # Largest board size with a table that fits in memory, larger boards use Manhattan distance
+
+
+# Builds the walking distance table for a board size with a breadth first search backwards from the solution
+# Each state counts, for every row, how many of its tiles belong in each row, followed by the row holding the blank
+# Transposing the board maps columns onto rows, so the same table also scores the columns
+#  param  size - length/width of the game board
+# return table - dictionary mapping each reachable state to the number of vertical moves needed to solve it
+def build_walking_table(size: int) -> dict[tuple, int]:
+    goal = [0] * size ** 2 + [size - 1]
+    for row in range(size):
+        goal[row * size + row] = size - (row == size - 1)
+
+    table = {tuple(goal): 0}
+    level = [tuple(goal)]
+    distance = 0
+
+    while level:
+        distance += 1
+        next_level = []
+
+        # Move a tile from a row next to the blank into the blank's row, for each row the tile may belong in
+        for state in level:
+            blank = state[-1]
+            for other in blank - 1, blank + 1:
+                if not 0 <= other < size:
+                    continue
+
+                for goal_row in range(size):
+                    if state[other * size + goal_row]:
+                        new_state = list(state)
+                        new_state[other * size + goal_row] -= 1
+                        new_state[blank * size + goal_row] += 1
+                        new_state[-1] = other
+
+                        if (new_state := tuple(new_state)) not in table:
+                            table[new_state] = distance
+                            next_level.append(new_state)
+
+        level = next_level
+
+    return table
+
+
+# Builds the file name of a cached walking distance table
+#  param size - length/width of the game board
+# return      - path to the table file
+def get_walking_path(size: int) -> str:
+    return f"{TABLES}wd_{size}.json"
+
+
+# Counts, for every row (or column), how many of its tiles belong in each row (or column)
+#  param  tiles - flat row-major sequence of tile values
+#  param   size - length/width of the game board
+#  param is_row - indicates whether rows or columns are counted
+# return  state - walking distance state of the board along the requested axis
+def get_walking_state(tiles, size: int, is_row: bool) -> list[int]:
+    state = [0] * (size ** 2 + 1)
+
+    for k in range(size ** 2):
+        line = k // size if is_row else k % size
+        if tile := tiles[k]:
+            state[line * size + ((tile - 1) // size if is_row else (tile - 1) % size)] += 1
+        else:
+            state[-1] = line
+
+    return state
+
+
+# Walking distance heuristic, summing the vertical moves needed to bring every tile to its row and the horizontal
+# moves needed to bring every tile to its column, where tiles in the same row (or column) are interchangeable
+# Walking distance never underestimates Manhattan distance, which is used instead on boards too large for a table
+# attr   tables - dictionary mapping board sizes to their walking distance tables
+# attr use_disk - indicates whether tables are cached in the tables directory between runs
+class WalkingDistance(Heuristic):
+    name = "Walking Distance"
+    needs_tiles = True
+
+    def __init__(self, use_disk: bool = True):
+        self.tables = {}
+        self.use_disk = use_disk
+
+    # Worker processes receive an instance without tables, and load them from the disk cache instead
+    def __getstate__(self) -> dict:
+        return {"tables": {}, "use_disk": self.use_disk}
+
+    # Builds (or loads) the walking distance table for a board size
+    #  param  size - length/width of the game board
+    # return table - dictionary mapping each reachable state to the number of moves needed to solve it
+    def get_table(self, size: int) -> dict[tuple, int]:
+        if (table := self.tables.get(size)) is not None:
+            return table
+
+        try:
+            if not self.use_disk:
+                return self.rebuild_table(size)
+            with open(get_walking_path(size)) as in_file:
+                table = self.tables[size] = {tuple(entry[:-1]): entry[-1] for entry in load(in_file)}
+        except FileNotFoundError:
+            table = self.rebuild_table(size)
+
+        return table
+
+    # Builds the walking distance table for a board size, replacing any cached copy
+    #  param  size - length/width of the game board
+    # return table - dictionary mapping each reachable state to the number of moves needed to solve it
+    def rebuild_table(self, size: int) -> dict[tuple, int]:
+        table = self.tables[size] = build_walking_table(size)
+
+        if self.use_disk:
+            makedirs(TABLES, exist_ok=True)
+            file_name = get_walking_path(size)
+            with open(f"{file_name}.tmp", 'w') as out_file:
+                dump([[*state, distance] for state, distance in table.items()], out_file)
+            replace(f"{file_name}.tmp", file_name)
+
+        return table
+
+    def evaluate(self, tiles, size: int) -> int:
+        if size > MAX_TABLE_SIZE:
+            return MANHATTAN_DISTANCE.evaluate(tiles, size)
+
+        table = self.get_table(size)
+        return table[tuple(get_walking_state(tiles, size, True))] + table[tuple(get_walking_state(tiles, size, False))]
+
+    def update(self, h: int, tiles, size: int, tile: int, src: int, dst: int) -> int:
+        if size > MAX_TABLE_SIZE:
+            return MANHATTAN_DISTANCE.update(h, tiles, size, tile, src, dst)
+
+        table = self.get_table(size)
+
+        # A vertical slide only changes the row counts, and a horizontal slide only changes the column counts
+        is_row = abs(src - dst) == size
+        state = get_walking_state(tiles, size, is_row)
+        before = table[tuple(state)]
+
+        src_line, dst_line = (src // size, dst // size) if is_row else (src % size, dst % size)
+        goal_line = (tile - 1) // size if is_row else (tile - 1) % size
+        state[src_line * size + goal_line] -= 1
+        state[dst_line * size + goal_line] += 1
+        state[-1] = src_line
+
+        return h - before + table[tuple(state)]
+
+
+# Shared walking distance instance, available to the solvers alongside the built-in heuristics
+WALKING_DISTANCE = WalkingDistance()
+HEURISTICS[WALKING_DISTANCE.name] = WALKING_DISTANCE
@@ -0,0 +1,90 @@
+from io import StringIO
+from json import dumps, loads
+
+# Local Dependencies
+from src.batch import INVALID, MOVE_LETTERS, make_record, read_jobs, solve_board, solve_jobs
+from src.input_handler import check_board, read_boards
+from src.puzzle import LINEAR_CONFLICT, Puzzle, apply_moves, solve_puzzle_ida
+
+# Constants
+BOARDS = """# Two valid boards and two invalid ones
+1 2 3
+4 5 6
+7 0 8
+
+# Comment lines inside a board are skipped
+1 2 3
+# 4 5 6
+4 0 6
+7 5 8
+
+
+1 2 3
+4 5
+7 8 0
+
+1 1 3
+4 5 6
+7 8 0
+"""
+
+
+# Boards are split on blank lines, numbered by the line they start on, and checked as they are read
+def test_read_boards():
+    boards = list(read_boards(StringIO(BOARDS)))
+
+    assert [start for start, _, _ in boards] == [2, 7, 13, 17]
+    assert boards[0][1:] == ([[1, 2, 3], [4, 5, 6], [7, 0, 8]], None)
+    assert boards[1][1:] == ([[1, 2, 3], [4, 0, 6], [7, 5, 8]], None)
+    assert boards[2][1] is None and "rows" in boards[2][2]
+    assert boards[3][1] is None and "exactly once" in boards[3][2]
+
+
+# Files with no trailing blank line still yield their last board, and empty files yield none
+def test_read_boards_edges():
+    assert list(read_boards(StringIO(""))) == []
+    assert list(read_boards(StringIO("\n# only a comment\n\n"))) == []
+    assert list(read_boards(StringIO("1 0\n2 3"))) == [(1, [[1, 0], [2, 3]], None)]
+
+
+# Boards are checked to be square and to hold each tile once
+def test_check_board():
+    assert check_board([[1, 2], [3, 0]]) is None
+    assert check_board([]) is not None
+    assert check_board([[1, 2], [3]]) is not None
+    assert check_board([[1, 2], [3, 3]]) is not None
+
+
+# Directories are read file by file, and every board is reported with its file, index, and line
+def test_read_jobs(tmp_path):
+    (tmp_path / "a.txt").write_text(BOARDS)
+    (tmp_path / "b.txt").write_text("1 2\n0 3\n")
+
+    jobs = list(read_jobs([str(tmp_path)]))
+    assert [(source.rsplit("/", 1)[-1], index, line) for source, index, line, _, _ in jobs] == \
+           [("a.txt", 0, 2), ("a.txt", 1, 7), ("a.txt", 2, 13), ("a.txt", 3, 17), ("b.txt", 0, 1)]
+
+
+# Solved boards are recorded with moves that solve them, and invalid boards with their error
+def test_solve_jobs():
+    jobs = [("<test>", index, *board) for index, board in enumerate(read_boards(StringIO(BOARDS)))]
+    records = list(solve_jobs(jobs, solve_puzzle_ida, LINEAR_CONFLICT, None, 1))
+
+    assert [record["status"] for record in records] == ["solved", "solved", INVALID, INVALID]
+    assert [record["length"] for record in records[:2]] == [1, 2]
+    assert records[2]["error"]
+
+    letters = {letter: move for move, letter in MOVE_LETTERS.items()}
+    for record, (_, _, _, board, _) in zip(records[:2], jobs):
+        node = apply_moves(Puzzle(board=board), [letters[move] for move in record["moves"]])
+        assert node.is_solution()
+
+
+# Records of invalid boards hold the error and no solution
+def test_make_record():
+    record = make_record("file", 3, 10, None, "bad board", None)
+    assert record == {"source": "file", "index": 3, "line": 10, "status": INVALID, "error": "bad board"}
+
+    solution = solve_board([[1, 2], [0, 3]], solve_puzzle_ida, LINEAR_CONFLICT, None)
+    assert (solution["status"], solution["length"]) == ("solved", 1)
+    assert loads(dumps(make_record("file", 0, 1, [[1, 2], [0, 3]], None, solution)))["size"] == 2
@@ -0,0 +1,57 @@
+import pytest
+
+# Local Dependencies
+from benchmarks.corpus import convert_korf_tiles, get_corpora, load_corpus, load_korf_file
+from src.puzzle import Puzzle
+
+# Constants
+TILES = "14 13 15 7 11 12 9 5 6 0 2 1 4 8 10 3"     # Tiles of a board in Korf's convention
+
+
+# Writes an instance file holding the given lines
+#  param tmp_path - directory to write the file in
+#  param    lines - lines of the file
+# return          - path to the file
+def write_korf_file(tmp_path, *lines: str) -> str:
+    file_name = tmp_path / "korf.txt"
+    file_name.write_text("\n".join(lines) + "\n")
+    return str(file_name)
+
+
+# Lines may hold the tiles alone, or with the instance number before them and/or the optimal length after them
+def test_load_korf_file(tmp_path):
+    instances = load_korf_file(write_korf_file(tmp_path, "# comment", "", TILES, f"7 {TILES}", f"{TILES} 57",
+                                               f"9 {TILES} 57"))
+
+    assert [(instance["id"], instance["optimal"]) for instance in instances] == \
+           [("korf-001", None), ("korf-007", None), ("korf-003", 57), ("korf-009", 57)]
+    assert all(instance["board"] == convert_korf_tiles([int(tile) for tile in TILES.split()])
+               for instance in instances)
+
+
+# Malformed lines raise ValueError naming the file and line
+@pytest.mark.parametrize("line", [
+    "1 2 3",
+    TILES.replace("14", "13", 1),
+    f"{TILES.replace('14', '13', 1)} 57",
+    f"1 {TILES} 57 0",
+    TILES.replace("14", "x"),
+])
+def test_load_korf_file_malformed(tmp_path, line):
+    with pytest.raises(ValueError, match=r"korf\.txt:2:"):
+        load_korf_file(write_korf_file(tmp_path, TILES, line))
+
+
+# Converting from Korf's convention maps his solution board onto this program's, and keeps boards solvable
+def test_convert_korf_tiles():
+    assert Puzzle(board=convert_korf_tiles(list(range(16)))).is_solution()
+    assert Puzzle(board=convert_korf_tiles([int(tile) for tile in TILES.split()])).is_solvable()
+
+
+# Every shipped board is solvable, has a proven optimal length, and is no longer than its scramble
+@pytest.mark.parametrize("name", sorted(get_corpora()))
+def test_shipped_corpus(name):
+    for instance in load_corpus(get_corpora()[name]):
+        assert Puzzle(board=instance["board"]).is_solvable(), instance["id"]
+        assert instance["optimal"] is not None, instance["id"]
+        assert instance["optimal"] <= instance.get("scramble", instance["optimal"]), instance["id"]
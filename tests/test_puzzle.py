@@ -0,0 +1,111 @@
+from json import loads
+from random import Random
+
+import pytest
+
+# Local Dependencies
+from benchmarks.corpus import get_corpora, scramble_board
+from src.budget import UNSOLVABLE, Budget
+from src.plugins import load_plugins
+from src.puzzle import (HEURISTICS, OPTIMAL_SOLVERS, SOLVERS, LINEAR_CONFLICT, PackedTiles, Puzzle, apply_moves,
+                        get_heuristics, get_moves, get_neighbors, pack_board, unpack_state)
+
+load_plugins()
+
+# Constants
+SEED = 15                   # Seed of the random boards and walks, so every run tests the same boards
+WALK_LENGTH = 60            # Number of moves in each random walk the heuristics are checked along
+SOLVE_SECONDS = 60          # Longest time a solver may take on a single corpus board [s]
+
+# 3x3 corpus boards, each with its optimal solution length
+CORPUS_3X3 = [loads(line) for line in open(get_corpora()["3x3"]) if line.strip()]
+
+
+# Packing a board and unpacking it again gives back the same board, for every supported tile width
+@pytest.mark.parametrize("size", [2, 3, 4, 5, 6])
+def test_pack_round_trip(size):
+    rng = Random(SEED)
+    for _ in range(20):
+        tiles = list(range(size ** 2))
+        rng.shuffle(tiles)
+        board = [tiles[i * size:(i + 1) * size] for i in range(size)]
+
+        state = pack_board(board)
+        assert unpack_state(state, size) == board
+        assert Puzzle(board=board).state == state
+        assert Puzzle(state=state, size=size).board == board
+
+
+# The packed tile view reads the same tiles as the board, and finds each tile like list.index()
+def test_packed_tiles():
+    board = [[5, 1, 3], [4, 0, 2], [7, 8, 6]]
+    puzzle = Puzzle(board=board)
+    tiles = PackedTiles(puzzle.state, 3, puzzle.tile_bits)
+    flat = [tile for row in board for tile in row]
+
+    assert list(tiles) == flat == puzzle.get_tiles()
+    assert all(tiles.index(tile) == flat.index(tile) for tile in flat)
+    with pytest.raises(IndexError):
+        tiles[9]
+
+
+# Every slide moves the packed state and the blank the same way as sliding the tiles of the unpacked board
+def test_make_child_matches_board():
+    puzzle = Puzzle(board=scramble_board(4, 30, Random(SEED)))
+
+    for direction in (1, 2, 3, 4):
+        if (child := puzzle.make_child(direction)) is None:
+            continue
+
+        i, j = puzzle.blank_pos
+        k, m = child.blank_pos
+        board = [row[:] for row in puzzle.board]
+        board[i][j], board[k][m] = board[k][m], 0
+        assert child.board == board
+        assert child.inversions == Puzzle(board=board).inversions
+
+
+# The incremental update() of every heuristic agrees with a full evaluate() after every slide of a random walk
+@pytest.mark.parametrize("name", sorted(HEURISTICS))
+@pytest.mark.parametrize("size", [3, 4])
+def test_update_matches_evaluate(name, size):
+    heuristic = HEURISTICS[name]
+    rng = Random(SEED)
+    tiles = [*range(1, size ** 2), 0]
+    blank = size ** 2 - 1
+    h = heuristic.evaluate(tiles, size)
+
+    for _ in range(WALK_LENGTH):
+        _, src = rng.choice(get_neighbors(size)[blank])
+        tile = tiles[src]
+        h = heuristic.update(h, tiles, size, tile, src, blank)
+
+        tiles[blank], tiles[src] = tile, 0
+        blank = src
+        assert h == heuristic.evaluate(tiles, size)
+
+
+# Solvers replay to the solution board, and the optimal solvers all find solutions of the known optimal length
+@pytest.mark.parametrize("name", sorted(SOLVERS))
+def test_solvers_agree_on_3x3_corpus(name):
+    solver = SOLVERS[name]
+    heuristic = LINEAR_CONFLICT if LINEAR_CONFLICT.name in get_heuristics(solver) else None
+
+    for instance in CORPUS_3X3:
+        puzzle = Puzzle(board=instance["board"], heuristic=LINEAR_CONFLICT)
+        result = solver(puzzle, heuristic, Budget(max_seconds=SOLVE_SECONDS))
+        assert result.is_solved(), instance["id"]
+
+        moves = get_moves(result.node)
+        assert apply_moves(puzzle, moves).is_solution(), instance["id"]
+        if solver in OPTIMAL_SOLVERS:
+            assert len(moves) == instance["optimal"], instance["id"]
+        else:
+            assert len(moves) >= instance["optimal"], instance["id"]
+
+
+# Unsolvable boards are reported as such rather than searched forever
+def test_unsolvable_board():
+    puzzle = Puzzle(board=[[2, 1, 3], [4, 5, 6], [7, 8, 0]])
+    assert not puzzle.is_solvable()
+    assert SOLVERS["IDA*"](puzzle, LINEAR_CONFLICT).status == UNSOLVABLE
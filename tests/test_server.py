@@ -0,0 +1,94 @@
+from threading import Thread
+
+import pytest
+
+# Local Dependencies
+from src.client import ServiceError, SolverClient
+from src.plugins import load_plugins
+from src.puzzle import Puzzle, apply_moves
+from src.server import SolverService, get_percentiles, make_handler
+
+load_plugins()
+
+# Constants
+BOARD = [[1, 2, 3], [4, 0, 6], [7, 5, 8]]       # Board solved by two moves
+MOVES = {'U': 1, 'D': 2, 'L': 3, 'R': 4}        # Direction of each move letter in a solution
+
+
+# Runs a service on a free local port for the tests of this module
+# return - (service, port) of the running service
+@pytest.fixture(scope="module")
+def server():
+    from http.server import ThreadingHTTPServer
+
+    service = SolverService(1, 4, 30.0, ("Linear Conflict",))
+    http_server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(service, False))
+    thread = Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+
+    yield service, http_server.server_port
+
+    http_server.shutdown()
+    http_server.server_close()
+    service.close()
+
+
+# Solve requests are answered with moves that solve the board
+def test_solve(server):
+    _, port = server
+    with SolverClient(port=port) as client:
+        result = client.solve(BOARD, solver="IDA*", heuristic="Linear Conflict")
+
+    assert result["status"] == "solved" and result["length"] == 2
+    assert not result["coalesced"]
+    assert apply_moves(Puzzle(board=BOARD), [MOVES[move] for move in result["moves"]]).is_solution()
+
+
+# Invalid requests are answered with 400 and a message, without starting a search
+@pytest.mark.parametrize("request_body", [
+    {"board": [[1, 2], [3]]},
+    {"board": "1 2 3 0"},
+    {"board": BOARD, "solver": "No Such Solver"},
+    {"board": BOARD, "heuristic": "No Such Heuristic"},
+    {"board": BOARD, "solver": "Bidirectional A*", "heuristic": "Pattern Database"},
+    {"board": BOARD, "timeout": -1},
+])
+def test_invalid_requests(server, request_body):
+    _, port = server
+    with SolverClient(port=port) as client, pytest.raises(ServiceError) as error:
+        client.request("POST", "/solve", request_body)
+
+    assert error.value.status == 400
+
+
+# Unknown paths are answered with 404, and health and metrics report on the service
+def test_health_and_metrics(server):
+    service, port = server
+    with SolverClient(port=port) as client:
+        with pytest.raises(ServiceError) as error:
+            client.request("GET", "/nowhere")
+        assert error.value.status == 404
+
+        assert client.health()["status"] == "ok"
+        client.solve(BOARD)
+        metrics = client.metrics()
+
+    assert metrics["requests"] >= 1 and metrics["searches"] >= 1
+    assert metrics["latency_ms"]["p50"] is not None
+
+
+# Searches beyond the queue capacity are turned away with 503
+def test_capacity():
+    service = SolverService(1, 0, 30.0, ())
+    try:
+        assert service.solve({"board": BOARD})[0] == 503
+        assert service.get_metrics()["rejected"] == 1
+    finally:
+        service.close()
+
+
+# Percentiles are the nearest rank of the sorted values, and are None before any request
+def test_get_percentiles():
+    assert get_percentiles([]) == {"p50": None, "p90": None, "p99": None, "max": None}
+    assert get_percentiles(range(100, 0, -1)) == {"p50": 50, "p90": 90, "p99": 99, "max": 100}
+    assert get_percentiles([7]) == {"p50": 7, "p90": 7, "p99": 7, "max": 7}
@@ -0,0 +1,100 @@
+from math import inf
+from random import Random
+
+import pytest
+
+# Local Dependencies
+from benchmarks.corpus import scramble_board
+from src.puzzle import DOWN, LEFT, LINEAR_CONFLICT, RIGHT, UP, Puzzle, apply_moves, get_moves, solve_puzzle_ida
+from src.solution_cache import (MIRROR_MOVES, SolutionCache, decode_moves, encode_moves, get_canonical_key,
+                                mirror_state)
+
+# Constants
+BOARD = [[1, 2, 3], [4, 0, 6], [7, 5, 8]]       # Board solved by two moves, down then right
+
+
+# Mirroring a move twice gives back the move, and encoding then decoding moves, mirrored or not, gives them back
+def test_mirror_moves_round_trip():
+    moves = [UP, LEFT, DOWN, DOWN, RIGHT, UP]
+    assert all(MIRROR_MOVES[MIRROR_MOVES[move]] == move for move in MIRROR_MOVES)
+    assert decode_moves(encode_moves(moves)) == moves
+    assert decode_moves(encode_moves(moves, True), True) == moves
+    assert decode_moves(encode_moves(moves, True)) == [MIRROR_MOVES[move] for move in moves]
+
+
+# Mirroring twice gives back the board, and the solution board is its own mirror
+@pytest.mark.parametrize("size", [2, 3, 4, 5])
+def test_mirror_state(size):
+    solution = Puzzle(board=scramble_board(size, 0, Random()))
+    assert mirror_state(solution) == solution.state
+
+    puzzle = Puzzle(board=scramble_board(size, 40, Random(size)))
+    mirrored = Puzzle(state=mirror_state(puzzle), size=size)
+    assert mirror_state(mirrored) == puzzle.state
+    assert mirrored.is_solvable()
+
+
+# A board and its mirror share one entry, and the moves cached for one solve the other
+def test_canonical_key_shared():
+    puzzle = Puzzle(board=BOARD)
+    mirror = Puzzle(state=mirror_state(puzzle), size=3)
+    key, mirrored = get_canonical_key(puzzle)
+    mirror_key, mirror_mirrored = get_canonical_key(mirror)
+
+    assert key == mirror_key
+    assert mirrored != mirror_mirrored
+
+    cache = SolutionCache(None)
+    cache.put(puzzle, get_moves(solve_puzzle_ida(puzzle, LINEAR_CONFLICT).node), 1)
+    moves, bound = cache.get(mirror)
+    assert bound == 1
+    assert len(moves) == 2
+    assert apply_moves(mirror, moves).is_solution()
+
+
+# Entries only answer lookups that accept their bound, and keep the shorter solution and the tighter bound
+def test_bounds():
+    puzzle = Puzzle(board=BOARD)
+    cache = SolutionCache(None)
+    long_moves = [LEFT, RIGHT, DOWN, RIGHT]
+    short_moves = [DOWN, RIGHT]
+
+    cache.put(puzzle, long_moves)
+    assert cache.get(puzzle, 1) == (None, None)
+    assert cache.get(puzzle) == (long_moves, inf)
+
+    cache.put(puzzle, short_moves, 1.5)
+    assert cache.get(puzzle, 2) == (short_moves, 1.5)
+
+    # A longer solution with a tighter bound only tightens the bound of the shorter one
+    cache.put(puzzle, long_moves, 1)
+    assert cache.get(puzzle, 1) == (short_moves, 1)
+
+
+# Solutions are kept in the SQLite file across instances, and the bound of each survives the round trip
+def test_persistence(tmp_path):
+    file_name = str(tmp_path / "solutions.sqlite3")
+    puzzle = Puzzle(board=BOARD)
+
+    cache = SolutionCache(file_name)
+    cache.put(puzzle, [DOWN, RIGHT], 1)
+    cache.close()
+
+    cache = SolutionCache(file_name)
+    assert cache.get(puzzle, 1) == ([DOWN, RIGHT], 1)
+    cache.close()
+
+
+# Solves answered from the cache hold the same solution the solver found, and are counted as hits
+def test_solve_hits():
+    puzzle = Puzzle(board=BOARD, heuristic=LINEAR_CONFLICT)
+    cache = SolutionCache(None)
+
+    first = cache.solve(solve_puzzle_ida, puzzle, LINEAR_CONFLICT)
+    second = cache.solve(solve_puzzle_ida, puzzle, LINEAR_CONFLICT)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert second.stats.cached
+    assert get_moves(second.node) == get_moves(first.node)
+
+    cache.enabled = False
+    assert not cache.solve(solve_puzzle_ida, puzzle, LINEAR_CONFLICT).stats.cached
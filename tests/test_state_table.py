@@ -0,0 +1,76 @@
+from random import Random
+
+import pytest
+
+# Local Dependencies
+from src.puzzle import Puzzle
+from src.state_table import DictStateTable, StateTable, WideStateTable, make_state_table
+
+# Constants
+SEED = 15                   # Seed of the random boards, so every run tests the same boards
+STATES = 5000               # Number of random boards added to each table, enough to make it grow several times
+
+
+# Draws distinct random packed board states
+#  param size - length/width of the game board
+# return      - array of packed board states
+def get_states(size: int) -> list[int]:
+    rng = Random(SEED)
+    states = set()
+    while len(states) < STATES:
+        tiles = list(range(size ** 2))
+        rng.shuffle(tiles)
+        states.add(Puzzle(board=[tiles[i * size:(i + 1) * size] for i in range(size)]).state)
+
+    return list(states)
+
+
+# Each board size gets the most compact table its packed states fit in
+def test_make_state_table():
+    assert type(make_state_table(3)) is StateTable
+    assert type(make_state_table(4)) is StateTable
+    assert type(make_state_table(5)) is WideStateTable
+    assert type(make_state_table(6)) is DictStateTable
+
+
+# Tables hold every state added, with its latest g-value, through every resize
+@pytest.mark.parametrize("size", [3, 4, 5, 6])
+def test_add_and_get(size):
+    table = make_state_table(size, store_g=True)
+    states = get_states(size)
+
+    for g, state in enumerate(states):
+        assert table.add(state, g % 100)
+    assert len(table) == len(states)
+
+    # Adding a state again only updates its g-value
+    assert not table.add(states[0], 7)
+    assert len(table) == len(states)
+    assert table.get(states[0]) == 7
+
+    assert all(state in table for state in states)
+    assert all(table.get(state) == g % 100 for g, state in enumerate(states[1:], 1))
+
+    missing = next(state for state in range(len(states) + 1) if state not in set(states))
+    assert missing not in table
+    assert table.get(missing, "missing") == "missing"
+
+
+# The all-zero state, which is stored as one, is kept apart from an empty slot
+def test_zero_state():
+    table = StateTable()
+    assert 0 not in table
+    assert table.add(0)
+    assert 0 in table and len(table) == 1
+
+
+# Wide states that differ only above their low 64 bits are kept apart
+def test_wide_high_words():
+    table = WideStateTable(store_g=True)
+    low = 12345
+    for high in range(1, 2000):
+        table.add(high << 64 | low, high % 100)
+
+    assert len(table) == 1999
+    assert low not in table
+    assert all(table.get(high << 64 | low) == high % 100 for high in range(1, 2000))